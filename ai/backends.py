@@ -0,0 +1,467 @@
+"""Pluggable text-generation backends for report generation.
+
+A backend turns a prompt into the raw response text, synchronously
+(`generate`) or on the running event loop (`agenerate`), either whole or
+as a stream of text chunks (`stream` / `astream`):
+
+- `GeminiBackend`: Google Gemini through `google.generativeai` (default).
+- `OpenAIBackend`: any OpenAI-compatible chat-completions endpoint
+  (OpenAI, Azure, vLLM, Ollama, ...) through the `openai` package.
+- `StubBackend`: local and deterministic, returning canned or templated
+  JSON after an optional artificial latency, for offline runs, tests and
+  load tests.
+
+``LCO_LLM_BACKEND`` selects the backend report generation uses (``gemini``,
+``openai``, ``stub`` or ``package.module:attribute``). SDKs are only
+imported when a backend is first used.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+import weakref
+
+GEMINI_MODEL_NAME = "gemini-2.5-flash"
+# the SDK release whose internals `GeminiProvider.async_model` was checked against
+GENAI_TESTED_VERSION = "0.8.5"
+DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+
+
+# ----------------------------------------------------------
+# 1. Interface
+# ----------------------------------------------------------
+class Backend:
+    """Base class of the text-generation backends.
+
+    `model_name` is part of the routine cache key, so responses of
+    different backends/models are never mixed up. Backends reading an API
+    key from the environment name it in `api_key_env`; `configure`
+    receives the key chosen by `ai.complete_report` (GUI setting first,
+    then that variable).
+    """
+
+    name = "backend"
+    label = "model"
+    model_name = "unknown"
+    api_key_env = None
+
+    def configure(self, api_key):
+        """Use `api_key` for the next calls (no-op unless overridden)."""
+
+    def generate(self, prompt):
+        raise NotImplementedError
+
+    async def aclose(self):
+        """Release the clients bound to the running event loop (no-op unless
+        overridden); call it before the loop ends, e.g. at the end of the
+        coroutine passed to `asyncio.run`."""
+
+    async def agenerate(self, prompt):
+        """Async `generate`; the default runs it in a worker thread."""
+        return await asyncio.to_thread(self.generate, prompt)
+
+    def stream(self, prompt):
+        """Yield the response text in chunks; the default yields it whole."""
+        yield self.generate(prompt)
+
+    async def astream(self, prompt):
+        """Async `stream`; the default yields the `agenerate` result whole."""
+        yield await self.agenerate(prompt)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(model_name={self.model_name!r})"
+
+
+# ----------------------------------------------------------
+# 2. Gemini
+# ----------------------------------------------------------
+class GeminiProvider:
+    """Lazy access to the Gemini SDK.
+
+    Nothing is imported or built until a report needs the model: the first
+    use loads `.env`, imports `google.generativeai`, configures the API key
+    and constructs the model. `configure` is a no-op for the key already in
+    use, and models are reused until the key changes.
+    """
+
+    def __init__(self, model_name=GEMINI_MODEL_NAME):
+        self.model_name = model_name
+        self._lock = threading.RLock()
+        self._env_loaded = False
+        self._genai = None
+        self._genai_client = None
+        self._configured = False
+        self._api_key = None
+        self._model = None
+        # per event loop: a model with its own async gRPC client (see async_model)
+        self._async_models = weakref.WeakKeyDictionary()
+
+    def load_env(self):
+        """Load `.env` into the environment (once)."""
+        if not self._env_loaded:
+            load_env()
+            self._env_loaded = True
+
+    def sdk(self):
+        if self._genai is None:
+            with self._lock:
+                if self._genai is None:
+                    import google.generativeai as genai
+                    from google.generativeai import client
+                    self._genai_client = client
+                    self._genai = genai
+        return self._genai
+
+    @property
+    def api_key(self):
+        return self._api_key
+
+    def configure(self, api_key):
+        """Point the SDK at `api_key`, unless it already is."""
+        with self._lock:
+            if self._configured and api_key == self._api_key:
+                return
+            self.sdk().configure(api_key=api_key)
+            self._configured = True
+            self._api_key = api_key
+            # models keep the client they were first called with
+            self._model = None
+            self._async_models = weakref.WeakKeyDictionary()
+
+    def _ensure_configured(self):
+        if not self._configured:
+            self.load_env()
+            self.configure(os.getenv("GEMINI_API_KEY"))
+
+    def model(self):
+        """The shared model for synchronous calls."""
+        with self._lock:
+            self._ensure_configured()
+            if self._model is None:
+                self._model = self.sdk().GenerativeModel(self.model_name)
+            return self._model
+
+    def async_model(self):
+        """The model for `generate_content_async` calls on the running loop.
+
+        By default every model uses the SDK's process-wide async gRPC
+        client, which is bound to the loop that created it (and only
+        replaced by `genai.configure`). The GUI runs each report in a new
+        `asyncio.run` loop, so each loop gets a model with its own client.
+        `aclose` closes it; a loop that ends without it drops the model
+        with the loop, and gRPC closes the channel when it is collected.
+
+        The SDK has no public way to do this: the client comes from its
+        client manager and is set on the model's ``_async_client``.
+        `_new_async_client` checks that both still exist (tested with
+        google-generativeai `GENAI_TESTED_VERSION`).
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._ensure_configured()
+            model = self._async_models.get(loop)
+            if model is None:
+                model = self.sdk().GenerativeModel(self.model_name)
+                if not hasattr(model, "_async_client"):
+                    raise self._unsupported_sdk("GenerativeModel._async_client")
+                model._async_client = self._new_async_client()
+                self._async_models[loop] = model
+            return model
+
+    def _new_async_client(self):
+        """A fresh `GenerativeServiceAsyncClient` with the configured key and
+        default metadata, created on (and bound to) the running loop."""
+        self.sdk()
+        manager = getattr(self._genai_client, "_client_manager", None)
+        if not callable(getattr(manager, "make_client", None)):
+            raise self._unsupported_sdk("client._client_manager.make_client")
+        return manager.make_client("generative_async")
+
+    def _unsupported_sdk(self, attribute):
+        version = getattr(self._genai, "__version__", "unknown")
+        return RuntimeError(
+            f"google-generativeai {version} has no {attribute}, which the per-loop "
+            f"async clients rely on (tested with {GENAI_TESTED_VERSION}); "
+            "install the version pinned in requirements.txt")
+
+    async def aclose(self):
+        """Close the running loop's async client, if it has one."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            model = self._async_models.pop(loop, None)
+        if model is not None:
+            await model._async_client.transport.close()
+
+
+_gemini = GeminiProvider()
+
+
+def get_gemini_provider():
+    """The process-wide `GeminiProvider`."""
+    return _gemini
+
+
+class GeminiBackend(Backend):
+    """Google Gemini, through a (by default shared) `GeminiProvider`."""
+
+    name = "gemini"
+    label = "Gemini"
+    api_key_env = "GEMINI_API_KEY"
+
+    def __init__(self, provider=None):
+        self.provider = provider or _gemini
+
+    @property
+    def model_name(self):
+        return self.provider.model_name
+
+    def configure(self, api_key):
+        self.provider.configure(api_key)
+
+    def generate(self, prompt):
+        return self.provider.model().generate_content(prompt).text
+
+    async def agenerate(self, prompt):
+        response = await self.provider.async_model().generate_content_async(prompt)
+        return response.text
+
+    async def aclose(self):
+        await self.provider.aclose()
+
+    def stream(self, prompt):
+        for chunk in self.provider.model().generate_content(prompt, stream=True):
+            yield chunk.text
+
+    async def astream(self, prompt):
+        response = await self.provider.async_model().generate_content_async(
+            prompt, stream=True)
+        async for chunk in response:
+            yield chunk.text
+
+
+# ----------------------------------------------------------
+# 3. OpenAI-compatible
+# ----------------------------------------------------------
+class OpenAIBackend(Backend):
+    """Chat-completions backend for any OpenAI-compatible server.
+
+    ``LCO_OPENAI_MODEL`` (default ``gpt-4o-mini``) and ``LCO_OPENAI_BASE_URL``
+    (default: the ``openai`` package's, i.e. ``OPENAI_BASE_URL`` or the
+    OpenAI API) configure it; the key comes from ``OPENAI_API_KEY``.
+    """
+
+    name = "openai"
+    label = "OpenAI"
+    api_key_env = "OPENAI_API_KEY"
+
+    def __init__(self, model_name=None, base_url=None, api_key=None):
+        self.model_name = model_name or os.getenv("LCO_OPENAI_MODEL") or DEFAULT_OPENAI_MODEL
+        self.base_url = base_url or os.getenv("LCO_OPENAI_BASE_URL") or None
+        self._api_key = api_key
+        self._lock = threading.Lock()
+        self._client = None
+        # httpx async clients must not be shared between event loops
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def configure(self, api_key):
+        with self._lock:
+            if api_key != self._api_key:
+                self._api_key = api_key
+                self._client = None
+                self._async_clients = weakref.WeakKeyDictionary()
+
+    def _client_kwargs(self):
+        if self._api_key is None:
+            load_env()
+        return {"api_key": self._api_key or os.getenv("OPENAI_API_KEY"),
+                "base_url": self.base_url}
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                import openai
+                self._client = openai.OpenAI(**self._client_kwargs())
+            return self._client
+
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import openai
+                client = self._async_clients[loop] = openai.AsyncOpenAI(**self._client_kwargs())
+            return client
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def _messages(self, prompt):
+        return [{"role": "user", "content": prompt}]
+
+    def generate(self, prompt):
+        response = self.client().chat.completions.create(
+            model=self.model_name, messages=self._messages(prompt))
+        return response.choices[0].message.content or ""
+
+    async def agenerate(self, prompt):
+        response = await self.async_client().chat.completions.create(
+            model=self.model_name, messages=self._messages(prompt))
+        return response.choices[0].message.content or ""
+
+    def stream(self, prompt):
+        for chunk in self.client().chat.completions.create(
+                model=self.model_name, messages=self._messages(prompt), stream=True):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream(self, prompt):
+        response = await self.async_client().chat.completions.create(
+            model=self.model_name, messages=self._messages(prompt), stream=True)
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+# ----------------------------------------------------------
+# 4. Local stub
+# ----------------------------------------------------------
+STUB_ROUTINE_TEMPLATE = json.dumps({
+    "Morning": {"Diet": "07:00 - Warm breakfast ({tag})", "Lifestyle": "07:30 - Walk",
+                "Wear_Clothing": "Layered clothing", "Exercise": "08:00 - Stretching"},
+    "Midday": {"Diet": "12:30 - Balanced lunch", "Lifestyle": "13:00 - Short rest",
+               "Optional": "15:00 - Herbal tea"},
+    "Evening": {"Diet": "18:30 - Light dinner", "Lifestyle": "21:00 - Wind down",
+                "Exercise": "19:30 - Gentle yoga"},
+    "Weekly_Addition": "One long nature walk",
+})
+
+
+class StubBackend(Backend):
+    """Offline, deterministic backend.
+
+    Returns `template` with ``{tag}`` replaced by a short hash of the
+    prompt (the default template is a well-formed daily routine), after
+    sleeping `latency` seconds (``LCO_STUB_LATENCY``). ``LCO_STUB_RESPONSE``
+    names a file holding a custom template. Streams are cut into
+    `chunk_size` pieces with the latency spread between them. `calls`
+    counts requests.
+    """
+
+    name = "stub"
+    label = "stub"
+
+    def __init__(self, template=None, latency=None, model_name="stub", chunk_size=64):
+        if template is None:
+            path = os.getenv("LCO_STUB_RESPONSE")
+            if path:
+                with open(path, "r", encoding="utf-8") as f:
+                    template = f.read()
+        self.template = template if template is not None else STUB_ROUTINE_TEMPLATE
+        if latency is None:
+            try:
+                latency = float(os.getenv("LCO_STUB_LATENCY", "0"))
+            except ValueError:
+                latency = 0.0
+        self.latency = max(latency, 0.0)
+        self.model_name = model_name
+        self.chunk_size = max(int(chunk_size), 1)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt):
+        with self._lock:
+            self.calls += 1
+        tag = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        return self.template.replace("{tag}", tag)
+
+    def generate(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def agenerate(self, prompt):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
+
+    def _chunks(self, prompt):
+        text = self._respond(prompt)
+        chunks = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        return chunks, self.latency / max(len(chunks), 1)
+
+    def stream(self, prompt):
+        chunks, delay = self._chunks(prompt)
+        for chunk in chunks:
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    async def astream(self, prompt):
+        chunks, delay = self._chunks(prompt)
+        for chunk in chunks:
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+# ----------------------------------------------------------
+# 5. Selection
+# ----------------------------------------------------------
+BACKENDS = {"gemini": GeminiBackend, "openai": OpenAIBackend, "stub": StubBackend}
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def load_env():
+    """Load `.env` into the environment, once per process."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def load_backend(spec):
+    """Build a backend from a name in `BACKENDS` or ``module:attribute``
+    (a `Backend` instance or subclass)."""
+    if spec in BACKENDS:
+        return BACKENDS[spec]()
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not attr:
+        raise ValueError(
+            f"unknown backend {spec!r}; use one of {', '.join(BACKENDS)} "
+            "or 'module:attribute'")
+    backend = getattr(importlib.import_module(module_name), attr)
+    if isinstance(backend, type) and issubclass(backend, Backend):
+        backend = backend()
+    if not isinstance(backend, Backend):
+        raise ValueError(f"{spec!r} is not a Backend")
+    return backend
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """The process-wide backend chosen by ``LCO_LLM_BACKEND`` (default
+    ``gemini``), built on first use."""
+    global _default_backend
+    spec = os.getenv("LCO_LLM_BACKEND", "").strip() or "gemini"
+    with _default_backend_lock:
+        if _default_backend is None or _default_backend[0] != spec:
+            _default_backend = (spec, load_backend(spec))
+        return _default_backend[1]
+
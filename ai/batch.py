@@ -0,0 +1,346 @@
+"""Headless batch report generation.
+
+Reads one client per line from a JSONL or CSV file and produces the same
+report the GUI does, without importing PyQt:
+
+1. Inputs: either the element/quality values (``fire``, ``earth``,
+   ``air``, ``water``, ``cardinal``, ``fixed``, ``mutable``) or a
+   ``pdf`` column with a Kepler PDF path (relative to the input file),
+   plus the personal details (``name``, ``date_of_birth``, ...).
+2. `generate_complete_output_async` for every client, with at most
+   ``--concurrency`` model requests in flight.
+3. Jinja render and PDF/DOCX export on a process pool (``-j``).
+
+Every finished client is appended to ``manifest.jsonl`` in the output
+directory, so an interrupted run picks up where it stopped. A
+``summary.json`` with per-stage timings and failures is written at the end.
+
+Usage:
+    python -m ai.batch clients.jsonl --out reports/ -j 4 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from ai.complete_report import (MAX_CONCURRENT_REQUESTS, close_backend_clients,
+                                generate_complete_output_async)
+from ui.utils.report_context import build_report_context
+from ui.utils.report_renderer import render_report_html, write_report_docx, write_report_pdf
+
+PERSONAL_FIELDS = ("name", "date_of_birth", "time_of_birth", "place_of_birth",
+                   "phone", "email")
+VALUE_FIELDS = ("fire", "earth", "air", "water", "cardinal", "fixed", "mutable")
+OUTPUT_FORMATS = ("pdf", "docx", "html")
+MANIFEST_NAME = "manifest.jsonl"
+SUMMARY_NAME = "summary.json"
+
+
+# ----------------------------------------------------------
+# 1. Input
+# ----------------------------------------------------------
+def read_clients(path):
+    """Return the client rows of a CSV (by extension) or JSONL file."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            return [dict(row) for row in csv.DictReader(f)]
+        rows = []
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}")
+            if not isinstance(row, dict):
+                raise ValueError(f"{path}:{line_no}: expected a JSON object")
+            rows.append(row)
+        return rows
+
+
+def client_id(row, index):
+    """Stable id of a client row: its ``id`` column, else position + name."""
+    cid = str(row.get("id") or "").strip()
+    if not cid:
+        name = re.sub(r"\W+", "-", str(row.get("name") or "")).strip("-").lower()
+        cid = f"{index:05d}-{name}" if name else f"{index:05d}"
+    return cid
+
+
+def _safe_filename(cid):
+    return re.sub(r"[^\w.-]+", "_", cid)
+
+
+def client_inputs(row, base_dir="."):
+    """Return ``(personal, user_input)`` for a client row.
+
+    A ``pdf`` column is run through `process_kepler_pdf`; otherwise every
+    value in `VALUE_FIELDS` must be present (case-insensitive keys).
+    """
+    lowered = {str(k).lower(): v for k, v in row.items()}
+    personal = {field: str(lowered.get(field) or "") for field in PERSONAL_FIELDS}
+
+    pdf = lowered.get("pdf")
+    if pdf:
+        from calc.element_calculator import process_kepler_pdf
+        path = pdf if os.path.isabs(pdf) else os.path.join(base_dir, pdf)
+        _, _, elem_pcts, _, qual_pcts = process_kepler_pdf(path)
+        values = {k.lower(): v for k, v in {**elem_pcts, **qual_pcts}.items()}
+    else:
+        missing = [f for f in VALUE_FIELDS if lowered.get(f) in (None, "")]
+        if missing:
+            raise ValueError(f"missing value(s): {', '.join(missing)} (or a 'pdf' column)")
+        values = lowered
+    return personal, {field: float(values.get(field) or 0) for field in VALUE_FIELDS}
+
+
+# ----------------------------------------------------------
+# 2. Rendering (runs inside the process pool)
+# ----------------------------------------------------------
+def render_outputs(context, out_dir, cid, formats=("pdf", "docx")):
+    """Render a report context and write the requested formats.
+
+    Each format is rendered and written on its own, so one that fails (a
+    PDF that WeasyPrint cannot lay out, say) does not stop the others.
+
+    Returns ``{"files": {format: path}, "errors": {format: message},
+    "render_s": ..., "export_s": ...}``.
+    """
+    base = os.path.join(out_dir, _safe_filename(cid))
+    files = {}
+    errors = {}
+    timings = {"render_s": 0.0, "export_s": 0.0}
+
+    def render(func, *args, **kwargs):
+        t = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings["render_s"] += time.perf_counter() - t
+
+    def export(func, *args):
+        t = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            timings["export_s"] += time.perf_counter() - t
+
+    def write_html(path):
+        with open(path, "w", encoding="utf-8") as f:
+            # HTML files stay self-contained
+            f.write(render(render_report_html, context))
+        return path
+
+    def write_pdf(path):
+        # the PDF gets its images from the asset cache
+        html = render(render_report_html, context, assets="fetch", inline_css=False)
+        return export(write_report_pdf, html, path)
+
+    writers = {
+        "html": write_html,
+        "pdf": write_pdf,
+        "docx": lambda path: export(write_report_docx, context, path),
+    }
+    for fmt in formats:
+        try:
+            files[fmt] = writers[fmt](f"{base}.{fmt}")
+        except Exception as e:
+            errors[fmt] = f"{type(e).__name__}: {e}"
+    return {"files": files, "errors": errors, **timings}
+
+
+# ----------------------------------------------------------
+# 3. Manifest (resume support)
+# ----------------------------------------------------------
+def load_manifest(out_dir):
+    """Ids of clients already completed in `out_dir`."""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["id"])
+            except (ValueError, KeyError, TypeError):
+                continue  # e.g. a line cut short by an interrupted run
+    return done
+
+
+def _append_manifest(out_dir, entry):
+    with open(os.path.join(out_dir, MANIFEST_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+# ----------------------------------------------------------
+# 4. Pipeline
+# ----------------------------------------------------------
+def _routine_error(report):
+    routine = report.get("Daily_Routine")
+    if isinstance(routine, dict) and (routine.get("__error") or routine.get("__parse_error")):
+        return routine.get("error_message") or "daily routine could not be parsed"
+    return None
+
+
+async def run_batch(rows, out_dir, base_dir=".", api_key=None, jobs=None,
+                    max_concurrency=None, formats=("pdf", "docx"), resume=True, log=None):
+    """Generate reports for `rows` into `out_dir` and return the summary.
+
+    Clients listed in the manifest are skipped when `resume` is set. A
+    client whose generation or export fails is recorded in the summary
+    (and left out of the manifest, so the next run retries it).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    done = load_manifest(out_dir) if resume else set()
+    semaphore = asyncio.Semaphore(max_concurrency or MAX_CONCURRENT_REQUESTS)
+    jobs = jobs or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    loop = asyncio.get_running_loop()
+
+    async def in_pool(func, *args):
+        if executor is None:
+            return func(*args)
+        return await loop.run_in_executor(executor, func, *args)
+
+    async def one(index, row):
+        cid = client_id(row, index)
+        if cid in done:
+            return {"id": cid, "status": "skipped"}
+        stages = {}
+        start = time.perf_counter()
+        try:
+            t = time.perf_counter()
+            personal, user_input = await in_pool(client_inputs, row, base_dir)
+            stages["inputs_s"] = time.perf_counter() - t
+
+            t = time.perf_counter()
+            report = await generate_complete_output_async(user_input, api_key, semaphore)
+            stages["generate_s"] = time.perf_counter() - t
+            if report.get("__error"):
+                raise RuntimeError(report.get("error_message") or "report generation failed")
+            error = _routine_error(report)
+            if error:
+                raise RuntimeError(f"daily routine: {error}")
+
+            context = build_report_context(
+                report, personal, *(user_input[f] for f in VALUE_FIELDS))
+            outputs = await in_pool(render_outputs, context, out_dir, cid, tuple(formats))
+            stages["render_s"] = outputs["render_s"]
+            stages["export_s"] = outputs["export_s"]
+        except Exception as e:
+            if log:
+                log(f"FAILED {cid}: {type(e).__name__}: {e}")
+            return {"id": cid, "status": "failed", "error_type": type(e).__name__,
+                    "error": str(e), "files": {}, "format_errors": {}, "stages": stages}
+
+        if outputs["errors"]:
+            # keep the formats that were written, but leave the client out of
+            # the manifest so the next run tries again
+            error = "; ".join(f"{fmt}: {msg}" for fmt, msg in outputs["errors"].items())
+            if log:
+                log(f"FAILED {cid}: {error}")
+            return {"id": cid, "status": "failed", "error_type": "ExportError",
+                    "error": f"export failed ({error})", "files": outputs["files"],
+                    "format_errors": outputs["errors"], "stages": stages}
+
+        record = {"id": cid, "status": "ok", "files": outputs["files"],
+                  "elapsed_s": time.perf_counter() - start, "stages": stages}
+        _append_manifest(out_dir, {
+            "id": cid, "files": outputs["files"],
+            "completed_at": datetime.now(timezone.utc).isoformat(timespec="seconds")})
+        if log:
+            log(f"ok     {cid}")
+        return record
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(one(i, row) for i, row in enumerate(rows, start=1)))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        await close_backend_clients()
+
+    summary = _summarize(results, time.perf_counter() - started)
+    with open(os.path.join(out_dir, SUMMARY_NAME), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def _summarize(results, elapsed):
+    ok = [r for r in results if r["status"] == "ok"]
+    stage_totals = {}
+    for r in ok:
+        for stage, seconds in r["stages"].items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+    return {
+        "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "total": len(results),
+        "succeeded": len(ok),
+        "failed": sum(r["status"] == "failed" for r in results),
+        "skipped": sum(r["status"] == "skipped" for r in results),
+        "elapsed_s": elapsed,
+        "stage_mean_s": {k: v / len(ok) for k, v in stage_totals.items()},
+        "failures": [{k: r[k] for k in ("id", "error_type", "error", "format_errors", "files")}
+                     for r in results if r["status"] == "failed"],
+        "clients": [{k: r[k] for k in ("id", "files", "elapsed_s", "stages")} for r in ok],
+    }
+
+
+# ----------------------------------------------------------
+# 5. Command line interface
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ai.batch",
+        description="Generate client reports from a JSONL or CSV file without the GUI.")
+    parser.add_argument("clients", help="JSONL or CSV file, one client per line")
+    parser.add_argument("--out", default="reports", help="output directory (default: reports)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="render/export worker processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="concurrent model requests "
+                             f"(default: LCO_MAX_CONCURRENT_REQUESTS={MAX_CONCURRENT_REQUESTS})")
+    parser.add_argument("--formats", default="pdf,docx",
+                        help="comma-separated outputs: pdf, docx, html (default: pdf,docx)")
+    parser.add_argument("--backend", default=None,
+                        help="model backend: gemini, openai, stub or module:attribute "
+                             "(default: LCO_LLM_BACKEND, else gemini)")
+    parser.add_argument("--api-key", default=None,
+                        help="Gemini API key (default: GEMINI_API_KEY from the environment/"
+                             ".env); other backends read their own variable, e.g. "
+                             "OPENAI_API_KEY")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="regenerate clients already listed in the manifest")
+    args = parser.parse_args(argv)
+
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = set(formats) - set(OUTPUT_FORMATS)
+    if unknown or not formats:
+        parser.error(f"--formats must be a subset of {', '.join(OUTPUT_FORMATS)}")
+
+    if args.backend:
+        os.environ["LCO_LLM_BACKEND"] = args.backend
+    rows = read_clients(args.clients)
+    base_dir = os.path.dirname(os.path.abspath(args.clients))
+    summary = asyncio.run(run_batch(
+        rows, args.out, base_dir=base_dir, api_key=args.api_key, jobs=args.jobs,
+        max_concurrency=args.concurrency, formats=formats,
+        resume=not args.no_resume, log=print))
+
+    print(f"{summary['total']} client(s): {summary['succeeded']} ok, "
+          f"{summary['failed']} failed, {summary['skipped']} skipped "
+          f"in {summary['elapsed_s']:.2f}s (summary: "
+          f"{os.path.join(args.out, SUMMARY_NAME)})", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Versioned content pack holding the report prompts and fixed descriptions.
+
+The element prompts sent to the model, the daily-routine system prompt and
+the fixed element/modality descriptions live in ``ai/content/pack.json``
+instead of Python string literals, so content can be updated without a code
+change. The pack is a JSON object::
+
+    {"format": 1, "version": "2026.10.0",
+     "prompts": {"fire_low": "...", ..., "routine_system": "..."},
+     "descriptions": {"fire_low_fixed": {...}, ..., "cardinal_description": {...}}}
+
+Nothing is read at import time: the pack is memory-mapped and parsed the
+first time report generation needs it, then shared by every caller. A
+gzip-compressed pack (``pack.json.gz``, or any file starting with the gzip
+magic bytes) is decompressed straight from the mapping. ``LCO_CONTENT_PACK``
+points at a different pack file.
+
+Usage:
+    python -m ai.content_pack check [PATH]
+    python -m ai.content_pack compress [PATH]
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import sys
+import threading
+
+PACK_FORMAT = 1
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "content")
+DEFAULT_PACK_PATH = os.path.join(CONTENT_DIR, "pack.json")
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+# ----------------------------------------------------------
+# 1. Pack
+# ----------------------------------------------------------
+class ContentPack:
+    """Parsed content pack. `prompts` maps names to text and `descriptions`
+    maps names to the parsed description objects."""
+
+    def __init__(self, path, version, prompts, descriptions):
+        self.path = path
+        self.version = version
+        self.prompts = prompts
+        self.descriptions = descriptions
+
+    def __repr__(self):
+        return f"ContentPack(version={self.version!r}, path={self.path!r})"
+
+    def prompt(self, name):
+        try:
+            return self.prompts[name]
+        except KeyError:
+            raise KeyError(f"content pack {self.version} has no prompt {name!r}") from None
+
+    def description(self, name):
+        try:
+            return self.descriptions[name]
+        except KeyError:
+            raise KeyError(
+                f"content pack {self.version} has no description {name!r}") from None
+
+
+def _read_pack_bytes(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if mapped[:2] != _GZIP_MAGIC:
+                return mapped[:]
+            try:
+                with gzip.GzipFile(fileobj=mapped) as gz:
+                    return gz.read()
+            except (OSError, EOFError) as e:
+                raise ValueError(f"content pack {path!r} is not a valid gzip file: {e}") from e
+
+
+def load_content_pack(path):
+    """Read and validate the pack at `path`.
+
+    Raises:
+        ValueError: the file is not a valid pack of a supported format.
+    """
+    raw = _read_pack_bytes(path)
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise ValueError(f"content pack {path!r} is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"content pack {path!r} must be a JSON object")
+    if data.get("format") != PACK_FORMAT:
+        raise ValueError(
+            f"content pack {path!r} has format {data.get('format')!r}; "
+            f"this version reads format {PACK_FORMAT}")
+    prompts = data.get("prompts")
+    descriptions = data.get("descriptions")
+    if not isinstance(prompts, dict) or not all(isinstance(v, str) for v in prompts.values()):
+        raise ValueError(f"content pack {path!r}: 'prompts' must map names to strings")
+    if not isinstance(descriptions, dict):
+        raise ValueError(f"content pack {path!r}: 'descriptions' must be an object")
+    for name, value in descriptions.items():
+        if not isinstance(value, dict):
+            raise ValueError(
+                f"content pack {path!r}: description {name!r} must be a JSON object")
+    return ContentPack(path, str(data.get("version") or "unversioned"), prompts, descriptions)
+
+
+# ----------------------------------------------------------
+# 2. Default pack
+# ----------------------------------------------------------
+def content_pack_path():
+    """``LCO_CONTENT_PACK`` if set, else the bundled pack (``pack.json``,
+    or ``pack.json.gz`` when only the compressed one is shipped)."""
+    override = os.getenv("LCO_CONTENT_PACK", "").strip()
+    if override:
+        return os.path.abspath(os.path.expanduser(override))
+    if not os.path.exists(DEFAULT_PACK_PATH) and os.path.exists(DEFAULT_PACK_PATH + ".gz"):
+        return DEFAULT_PACK_PATH + ".gz"
+    return DEFAULT_PACK_PATH
+
+
+_default_pack = None
+_default_pack_lock = threading.Lock()
+
+
+def get_content_pack():
+    """Return the process-wide pack, loading it on first use (and again
+    when ``LCO_CONTENT_PACK`` points somewhere else)."""
+    global _default_pack
+    path = content_pack_path()
+    pack = _default_pack
+    if pack is not None and pack.path == path:
+        return pack
+    with _default_pack_lock:
+        if _default_pack is None or _default_pack.path != path:
+            _default_pack = load_content_pack(path)
+        return _default_pack
+
+
+def reset_content_pack():
+    """Forget the loaded pack so the next access re-reads it from disk."""
+    global _default_pack
+    with _default_pack_lock:
+        _default_pack = None
+
+
+# ----------------------------------------------------------
+# 3. Command line interface
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ai.content_pack",
+        description="Validate or compress a report content pack.")
+    parser.add_argument("command", choices=("check", "compress"))
+    parser.add_argument("path", nargs="?", default=None,
+                        help="pack file (default: LCO_CONTENT_PACK or the bundled pack)")
+    args = parser.parse_args(argv)
+
+    path = args.path or content_pack_path()
+    try:
+        pack = load_content_pack(path)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.command == "check":
+        print(f"{path}: version {pack.version}, {len(pack.prompts)} prompt(s), "
+              f"{len(pack.descriptions)} description(s)")
+        return 0
+
+    if path.endswith(".gz"):
+        print(f"{path} is already compressed")
+        return 0
+    target = path + ".gz"
+    raw = _read_pack_bytes(path)
+    with gzip.open(target, "wb", compresslevel=9) as f:
+        f.write(raw)
+    print(f"{target}: {len(raw)} -> {os.path.getsize(target)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Incremental parsing of a streamed JSON object.
+
+`StreamingObjectParser` is fed the model output chunk by chunk and reports
+each top-level member of the root object (``"Morning": {...}``) as soon as
+its value is complete, so callers can show partial results while the rest
+is still being generated. Text around the object (Markdown code fences,
+stray prose) is ignored.
+
+When the stream stops early, `repair` turns what arrived into the largest
+valid object it can: an unterminated string value is closed, a dangling
+key, ``:`` or partial literal is dropped, and open arrays/objects are
+closed.
+"""
+
+import json
+
+_CLOSERS = {"{": "}", "[": "]"}
+_LITERAL_CHARS = frozenset("0123456789+-.eEtruefalsn")
+
+
+class StreamingObjectParser:
+    """Character-level scanner over the root JSON object of a stream.
+
+    `feed` returns the ``(key, value)`` pairs completed by a chunk; `done`
+    is set once the root object is closed, after which `value()` returns
+    it. The scan is linear in the total input.
+    """
+
+    def __init__(self):
+        self._buf = []          # characters of the root object seen so far
+        self._stack = []        # open containers, '{' or '['
+        self._expect = []       # per open object: 'key', ':', 'value' or ','
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._in_literal = False
+        self._member_key = None
+        self._member_start = None
+        self._safe = (0, ())    # (length, stack) of the last valid prefix point
+        self.done = False
+        self.members = {}
+
+    # -- scanning ---------------------------------------------------------
+    def feed(self, chunk):
+        """Consume `chunk`; return the top-level members it completed."""
+        completed = []
+        for ch in chunk:
+            if self.done:
+                break
+            if not self._buf:
+                if ch == "{":
+                    self._buf.append(ch)
+                    self._open(ch)
+                continue
+            self._buf.append(ch)
+            if self._in_string:
+                self._string_char(ch, completed)
+            else:
+                self._structural_char(ch, completed)
+        return completed
+
+    def _mark_safe(self, length=None):
+        self._safe = (len(self._buf) if length is None else length, tuple(self._stack))
+
+    def _open(self, ch):
+        self._stack.append(ch)
+        self._expect.append("key" if ch == "{" else "value")
+        self._mark_safe()
+
+    def _value_done(self, completed, end):
+        """A value ending at buffer index `end` (exclusive) just completed."""
+        if self._stack and self._stack[-1] == "{":
+            self._expect[-1] = ","
+        self._mark_safe(end)
+        if len(self._stack) == 1 and self._member_start is not None:
+            value = json.loads("".join(self._buf[self._member_start:end]))
+            self.members[self._member_key] = value
+            completed.append((self._member_key, value))
+            self._member_start = None
+
+    def _string_char(self, ch, completed):
+        if self._escape:
+            self._escape = False
+        elif ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._string_is_key:
+                if len(self._stack) == 1:
+                    start = self._key_start
+                    self._member_key = json.loads("".join(self._buf[start:]))
+                self._expect[-1] = ":"
+            else:
+                self._value_done(completed, len(self._buf))
+
+    def _structural_char(self, ch, completed):
+        if self._in_literal and ch not in _LITERAL_CHARS:
+            self._in_literal = False
+            self._value_done(completed, len(self._buf) - 1)
+        if ch in " \t\r\n" or self._in_literal:
+            return
+        expect = self._expect[-1] if self._expect else None
+        if ch == '"':
+            self._in_string = True
+            self._string_is_key = expect == "key"
+            if self._string_is_key:
+                self._key_start = len(self._buf) - 1
+            elif len(self._stack) == 1:
+                self._member_start = len(self._buf) - 1
+        elif ch == ":":
+            self._expect[-1] = "value"
+        elif ch == ",":
+            self._expect[-1] = "key" if self._stack[-1] == "{" else "value"
+        elif ch in "{[":
+            if len(self._stack) == 1:
+                self._member_start = len(self._buf) - 1
+            self._open(ch)
+        elif ch in "}]":
+            self._stack.pop()
+            self._expect.pop()
+            if not self._stack:
+                self.done = True
+                self._mark_safe()
+            else:
+                self._value_done(completed, len(self._buf))
+        else:
+            self._in_literal = True
+            if len(self._stack) == 1:
+                self._member_start = len(self._buf) - 1
+
+    # -- results ----------------------------------------------------------
+    def value(self):
+        """The complete root object (only once `done`)."""
+        if not self.done:
+            raise ValueError("the JSON object is not complete yet")
+        return json.loads("".join(self._buf))
+
+    def repair(self):
+        """Best-effort object from a truncated stream, or ``None`` when not
+        even the root object was opened."""
+        if not self._buf:
+            return None
+        if self.done:
+            return self.value()
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            text = "".join(self._buf)
+            if self._escape:
+                text = text[:-1]
+            candidates.append(text + '"' + _closers(self._stack))
+        if self._in_literal:
+            candidates.append("".join(self._buf) + _closers(self._stack))
+        length, stack = self._safe
+        candidates.append("".join(self._buf[:length]).rstrip().rstrip(",") + _closers(stack))
+        for text in candidates:
+            try:
+                return json.loads(text)
+            except ValueError:
+                continue
+        return None
+
+
+def _closers(stack):
+    return "".join(_CLOSERS[ch] for ch in reversed(stack))
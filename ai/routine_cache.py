@@ -0,0 +1,210 @@
+"""Persistent cache for generated daily routines.
+
+The daily-routine prompt built by `ai.complete_report` depends only on
+whether each element is empty, low, high or balanced, so only a handful of
+distinct prompts exist. Parsed routines are stored in a small SQLite
+database keyed by the SHA-256 of ``model + prompt``; a hit skips the model
+call entirely.
+
+A key can hold several variants of its routine (see `ai.warm_routines`,
+which pre-generates them); lookups pick one at random so clients with the
+same statuses do not all get byte-identical text. Entries expire after a
+TTL and the table is bounded: once it holds more than `max_entries`
+variants the least recently used ones are evicted.
+
+The database lives next to the extraction cache (``LCO_CACHE_DIR``, see
+`calc.pdf_cache`). ``LCO_ROUTINE_CACHE_TTL`` (seconds) and
+``LCO_ROUTINE_CACHE_SIZE`` (entries) override the defaults, and
+``LCO_DISABLE_CACHE=1`` bypasses it.
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from ai.settings import env_number
+from calc.pdf_cache import default_cache_dir
+
+CACHE_FILENAME = "routine_cache.sqlite3"
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 1024
+
+# Bumped whenever the table layout changes; older caches are dropped.
+SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS routines (
+    key TEXT NOT NULL,
+    variant INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (key, variant)
+);
+CREATE INDEX IF NOT EXISTS routines_last_used ON routines (last_used);
+"""
+
+
+def routine_key(model, prompt):
+    """Cache key for a prompt sent to `model`."""
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class RoutineCache:
+    """SQLite-backed store of parsed routines with TTL and LRU eviction.
+
+    Like `calc.pdf_cache.ExtractionCache`, each thread gets its own
+    connection, so one instance can be shared by the GUI and its workers.
+    `hits` / `misses` count lookups made through this instance.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None, rng=None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), CACHE_FILENAME)
+        self.path = path
+        self.ttl = ttl if ttl is not None else env_number(
+            "LCO_ROUTINE_CACHE_TTL", DEFAULT_TTL, float)
+        self.max_entries = max_entries if max_entries is not None else env_number(
+            "LCO_ROUTINE_CACHE_SIZE", DEFAULT_MAX_ENTRIES, int)
+        self.hits = 0
+        self.misses = 0
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                with conn:
+                    conn.execute("DROP TABLE IF EXISTS routines")
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection (other threads keep theirs)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _fresh_variants(self, conn, key, now):
+        """``(variant, payload)`` rows for `key`, dropping expired ones."""
+        rows = conn.execute(
+            "SELECT variant, payload, created_at FROM routines WHERE key = ?",
+            (key,)).fetchall()
+        cutoff = now - self.ttl if self.ttl else None
+        fresh = [(v, p) for v, p, created in rows if cutoff is None or created >= cutoff]
+        if len(fresh) < len(rows):
+            with conn:
+                conn.execute(
+                    "DELETE FROM routines WHERE key = ? AND created_at < ?",
+                    (key, cutoff))
+        return fresh
+
+    def get(self, model, prompt):
+        """Return a cached routine (parsed JSON) or ``None``; with several
+        variants stored, one is picked at random."""
+        key = routine_key(model, prompt)
+        conn = self._connect()
+        now = time.time()
+        rows = self._fresh_variants(conn, key, now)
+        if not rows:
+            self._count(False)
+            return None
+        variant, payload = rows[0] if len(rows) == 1 else self._rng.choice(rows)
+        with conn:
+            conn.execute(
+                "UPDATE routines SET last_used = ?, hits = hits + 1 "
+                "WHERE key = ? AND variant = ?", (now, key, variant))
+        self._count(True)
+        return json.loads(payload)
+
+    def variants(self, model, prompt):
+        """Sorted numbers of the unexpired variants stored for a prompt."""
+        conn = self._connect()
+        return sorted(v for v, _ in self._fresh_variants(
+            conn, routine_key(model, prompt), time.time()))
+
+    def variant_count(self, model, prompt):
+        """Number of unexpired variants stored for a prompt."""
+        return len(self.variants(model, prompt))
+
+    def put(self, model, prompt, routine, variant=0):
+        """Store a parsed routine as `variant` of its key, evicting the least
+        recently used entries beyond `max_entries`."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO routines "
+                "(key, variant, model, payload, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (routine_key(model, prompt), variant, model,
+                 json.dumps(routine, ensure_ascii=False), now, now))
+            if self.max_entries and self.max_entries > 0:
+                conn.execute(
+                    "DELETE FROM routines WHERE rowid NOT IN ("
+                    "SELECT rowid FROM routines ORDER BY last_used DESC LIMIT ?)",
+                    (self.max_entries,))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM routines")
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Hit-rate counters for this instance plus the stored totals."""
+        entries, stored_hits = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM routines").fetchone()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "stored_hits": stored_hits,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_routine_cache():
+    """Return the process-wide routine cache, or ``None`` when caching is
+    disabled or the cache directory is not usable."""
+    global _default_cache
+    if os.getenv("LCO_DISABLE_CACHE", "").strip() not in ("", "0"):
+        return None
+    path = os.path.join(default_cache_dir(), CACHE_FILENAME)
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            try:
+                _default_cache = RoutineCache(path)
+            except (OSError, sqlite3.Error):
+                _default_cache = None
+        return _default_cache
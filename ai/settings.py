@@ -0,0 +1,15 @@
+"""Numeric settings read from the environment (``LCO_*`` variables).
+
+A malformed value falls back to the default instead of failing the import
+of the module that reads it.
+"""
+
+import os
+
+
+def env_number(name, default, cast=int):
+    """``cast(os.getenv(name))``, or `default` when unset or malformed."""
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
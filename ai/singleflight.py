@@ -0,0 +1,113 @@
+"""Single-flight deduplication of identical in-flight calls.
+
+When several callers ask for the same key at the same time, only the first
+(the leader) runs the call; the others wait for its result instead of
+repeating the work. Once the call finishes the key is forgotten, so later
+callers start a new call (results are cached elsewhere, e.g. in
+`ai.routine_cache`).
+
+The shared state is a `concurrent.futures.Future`, so callers can be
+threads, coroutines on one event loop, or coroutines on different loops
+(the GUI runs each report on its own loop in a worker thread), in any mix.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+
+
+def _leader_cancelled(future):
+    if not future.done():
+        return False
+    return future.cancelled() or isinstance(future.exception(), asyncio.CancelledError)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key.
+
+    `copy_result`, if given, is applied to the result handed to each
+    coalesced caller so they never share a mutable object with the leader.
+    `stats()` reports how many calls ran (``leaders``) and how many were
+    served from another caller's flight (``coalesced``).
+    """
+
+    def __init__(self, copy_result=None):
+        self._copy = copy_result
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        """Return ``(future, is_leader)`` for `key`."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = concurrent.futures.Future()
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key, future, result=None, exc=None):
+        with self._lock:
+            self._calls.pop(key, None)
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+    def _shared(self, result):
+        return self._copy(result) if self._copy is not None else result
+
+    def do(self, key, func):
+        """Return ``func()``, or the result of an identical call in flight."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = func()
+                except BaseException as exc:
+                    self._finish(key, future, exc=exc)
+                    raise
+                self._finish(key, future, result)
+                return result
+            try:
+                return self._shared(future.result())
+            except (asyncio.CancelledError, concurrent.futures.CancelledError):
+                if not _leader_cancelled(future):
+                    raise
+                # the leader was cancelled; run the call ourselves
+
+    async def ado(self, key, coro_func):
+        """Async `do`: await ``coro_func()`` or the identical call in flight."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = await coro_func()
+                except BaseException as exc:
+                    self._finish(key, future, exc=exc)
+                    raise
+                self._finish(key, future, result)
+                return result
+            try:
+                # shield: a cancelled follower must not cancel the shared future
+                return self._shared(await asyncio.shield(asyncio.wrap_future(future)))
+            except asyncio.CancelledError:
+                if not _leader_cancelled(future):
+                    raise  # this caller itself was cancelled
+                # the leader was cancelled; run the call ourselves
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced,
+                    "in_flight": len(self._calls)}
+
+    def reset_stats(self):
+        with self._lock:
+            self.leaders = self.coalesced = 0
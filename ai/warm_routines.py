@@ -0,0 +1,210 @@
+"""Pre-generate daily routines for every element-status combination.
+
+The daily-routine prompt only depends on whether each of fire, earth, air
+and water is empty, low, balanced or high, so the whole prompt space can
+be generated ahead of time. This job enumerates every combination, calls
+the model for each distinct prompt with bounded concurrency, validates the
+JSON and stores it in the routine cache (`ai.routine_cache`), so report
+generation never has to wait on the network.
+
+Several variants can be stored per prompt (``--variants``); report
+generation picks one at random so clients do not all get identical text.
+
+The model call is pluggable: ``--backend`` takes any `ai.backends` name
+(``gemini``, ``openai``, ``stub``) or ``package.module:function``, a
+callable taking the prompt and returning the raw response text.
+``--backend stub`` is a local, deterministic stand-in, handy for tests and
+dry runs. Routines are cached under the backend's model name, so the ones
+generated with a backend are used when reports run on that backend.
+
+Usage:
+    python -m ai.warm_routines --variants 3 -j 4
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ai import backends
+from ai.complete_report import ROUTINE_SECTIONS, build_routine_prompt, clean_json_output
+from ai.routine_cache import RoutineCache, get_default_routine_cache
+
+ELEMENT_KEYS = ("fire", "earth", "air", "water")
+# Representative value for each status, as classified by
+# `ai.complete_report._element_status` (0 means no placements at all).
+STATUS_VALUES = {"Empty": 0, "Low": 10, "Balanced": 25, "High": 40}
+
+
+# ----------------------------------------------------------
+# 1. Prompt space
+# ----------------------------------------------------------
+def status_combinations():
+    """Yield one ``user_input`` dict per fire/earth/air/water status
+    combination (4^4 of them)."""
+    for statuses in itertools.product(STATUS_VALUES, repeat=len(ELEMENT_KEYS)):
+        yield {key: STATUS_VALUES[s] for key, s in zip(ELEMENT_KEYS, statuses)}
+
+
+def distinct_prompts():
+    """Map each distinct routine prompt to the first combination producing it.
+
+    Empty and balanced elements contribute nothing to the prompt, so fewer
+    than 4^4 prompts actually exist.
+    """
+    prompts = {}
+    for user_input in status_combinations():
+        prompts.setdefault(build_routine_prompt(user_input), user_input)
+    return prompts
+
+
+# ----------------------------------------------------------
+# 2. Backends
+# ----------------------------------------------------------
+def stub_backend(prompt):
+    """Deterministic offline stand-in returning a well-formed routine."""
+    return backends.StubBackend(backends.STUB_ROUTINE_TEMPLATE, latency=0).generate(prompt)
+
+
+def load_backend(spec):
+    """Resolve a backend with `ai.backends.load_backend`; a ``module:function``
+    that is not a `Backend` is returned as a plain callable."""
+    try:
+        return backends.load_backend(spec)
+    except ValueError:
+        module_name, sep, attr = spec.partition(":")
+        if not sep or not attr:
+            raise
+    backend = getattr(importlib.import_module(module_name), attr)
+    if not callable(backend):
+        raise ValueError(f"{spec!r} is neither a Backend nor a callable")
+    return backend
+
+
+# ----------------------------------------------------------
+# 3. Generation
+# ----------------------------------------------------------
+def parse_routine(text):
+    """Parse and validate a raw model response.
+
+    Raises:
+        ValueError: the response is not JSON or lacks a routine section.
+    """
+    routine = json.loads(clean_json_output(text))
+    if not isinstance(routine, dict):
+        raise ValueError("routine must be a JSON object")
+    missing = [s for s in ROUTINE_SECTIONS if not isinstance(routine.get(s), dict)]
+    if missing:
+        raise ValueError(f"routine is missing section(s): {', '.join(missing)}")
+    return routine
+
+
+def generate_variant(backend, prompt, retries=3, backoff=1.0):
+    """Call `backend` until it returns a valid routine (or retries run out)."""
+    generate = backend.generate if isinstance(backend, backends.Backend) else backend
+    last_exc = None
+    for attempt in range(retries):
+        try:
+            return parse_routine(generate(prompt))
+        except Exception as exc:
+            last_exc = exc
+            if attempt + 1 < retries:
+                time.sleep(backoff * (attempt + 1))
+    raise last_exc
+
+
+def warm_routines(backend, model, cache, variants=1, max_workers=4, force=False,
+                  retries=3, backoff=1.0, log=None):
+    """Fill `cache` with `variants` routines for every distinct prompt.
+
+    Variants already stored (and unexpired) are kept unless `force` is
+    set. At most `max_workers` model calls run at once.
+
+    Returns:
+        dict: ``generated``, ``skipped`` and ``failed`` variant counts plus
+        ``prompts``, the number of distinct prompts.
+    """
+    prompts = distinct_prompts()
+    jobs = []
+    skipped = 0
+    for prompt in prompts:
+        have = set() if force else set(cache.variants(model, prompt))
+        missing = [v for v in range(variants) if v not in have]
+        skipped += variants - len(missing)
+        jobs.extend((prompt, v) for v in missing)
+
+    generated = failed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(generate_variant, backend, prompt, retries, backoff):
+                   (prompt, variant) for prompt, variant in jobs}
+        for future in as_completed(futures):
+            prompt, variant = futures[future]
+            statuses = prompts[prompt]
+            try:
+                cache.put(model, prompt, future.result(), variant=variant)
+            except Exception as exc:
+                failed += 1
+                if log:
+                    log(f"FAILED {statuses} variant {variant}: {exc}")
+                continue
+            generated += 1
+            if log:
+                log(f"ok     {statuses} variant {variant}")
+    return {"prompts": len(prompts), "generated": generated,
+            "skipped": skipped, "failed": failed}
+
+
+# ----------------------------------------------------------
+# 4. Command line interface
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ai.warm_routines",
+        description="Pre-generate daily routines for every element-status "
+                    "combination and store them in the routine cache.")
+    parser.add_argument("--backend", default="gemini",
+                        help=f"{', '.join(backends.BACKENDS)} or module:function "
+                             "(default: gemini)")
+    parser.add_argument("--model", default=None,
+                        help="model name used in the cache key "
+                             "(default: the backend's model)")
+    parser.add_argument("--variants", type=int, default=1,
+                        help="routines to store per prompt (default: 1)")
+    parser.add_argument("-j", "--jobs", type=int, default=4,
+                        help="concurrent model calls (default: 4)")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate variants that are already cached")
+    parser.add_argument("--cache", default=None,
+                        help="routine cache database (default: LCO_CACHE_DIR)")
+    args = parser.parse_args(argv)
+
+    if args.variants < 1 or args.jobs < 1:
+        parser.error("--variants and --jobs must be at least 1")
+    backend = load_backend(args.backend)
+    model = args.model
+    if model is None:
+        model = (backend.model_name if isinstance(backend, backends.Backend)
+                 else backends.GEMINI_MODEL_NAME)
+    cache = RoutineCache(args.cache) if args.cache else get_default_routine_cache()
+    if cache is None:
+        parser.error("the routine cache is disabled (LCO_DISABLE_CACHE)")
+    # the cache must be able to hold everything we are about to generate
+    if cache.max_entries:
+        cache.max_entries = max(cache.max_entries, len(distinct_prompts()) * args.variants)
+
+    start = time.perf_counter()
+    summary = warm_routines(backend, model, cache, variants=args.variants,
+                            max_workers=args.jobs, force=args.force,
+                            retries=args.retries, log=print)
+    print(f"{summary['prompts']} prompt(s): {summary['generated']} generated, "
+          f"{summary['skipped']} already cached, {summary['failed']} failed "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
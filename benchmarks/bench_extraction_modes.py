@@ -0,0 +1,69 @@
+"""Compare the "text" and "layout" extraction modes on docs/kepler.pdf.
+
+Times extraction and parsing separately (the on-disk cache is bypassed)
+and prints the planets each mode reads, and where they disagree.
+
+On docs/kepler.pdf the two modes disagree on six of the eight placements
+(Moon, Asc, Mercury, Mars, Jupiter, Saturn). Layout mode reads all of them
+correctly; the text-mode fallback gets those six wrong.
+
+Usage:
+    python benchmarks/bench_extraction_modes.py [pdf_path] [-n 50]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from calc.element_calculator import (  # noqa: E402
+    extract_page3_text,
+    extract_page3_words,
+    parse_planet_positions_layout,
+    parse_planet_positions_robust,
+    process_kepler_pdf,
+)
+
+
+def best_ms(fn, number):
+    """Best-of-5 mean wall time per call in milliseconds."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdf", nargs="?", default=os.path.join(ROOT, "docs", "kepler.pdf"))
+    parser.add_argument("-n", "--number", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    text = extract_page3_text(args.pdf)
+    words = extract_page3_words(args.pdf)
+
+    rows = [
+        ("text", "extract", best_ms(lambda: extract_page3_text(args.pdf), args.number)),
+        ("text", "parse", best_ms(lambda: parse_planet_positions_robust(text), args.number)),
+        ("text", "end-to-end", best_ms(
+            lambda: process_kepler_pdf(args.pdf, use_cache=False, mode="text"), args.number)),
+        ("layout", "extract", best_ms(lambda: extract_page3_words(args.pdf), args.number)),
+        ("layout", "parse", best_ms(lambda: parse_planet_positions_layout(words), args.number)),
+        ("layout", "end-to-end", best_ms(
+            lambda: process_kepler_pdf(args.pdf, use_cache=False, mode="layout"), args.number)),
+    ]
+
+    print(f"{'mode':8} {'stage':12} {'ms/call':>10}")
+    for mode, stage, ms in rows:
+        print(f"{mode:8} {stage:12} {ms:10.3f}")
+
+    text_planets = parse_planet_positions_robust(text)
+    layout_planets = parse_planet_positions_layout(words)
+    print("\ntext   :", text_planets)
+    print("layout :", layout_planets)
+    differ = [p for p in layout_planets if text_planets.get(p) != layout_planets[p]]
+    print(f"differ : {len(differ)} ({', '.join(differ) or 'none'})")
+
+
+if __name__ == "__main__":
+    main()
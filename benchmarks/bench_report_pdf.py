@@ -0,0 +1,78 @@
+"""Benchmark: report PDF size and WeasyPrint time, before/after print images.
+
+"before" is the original export (source images inlined as base64);
+"after" is the current one (print-resolution derivatives served through
+`asset_url_fetcher`, see `ui.utils.report_assets`). The image payload
+table needs only Pillow; the PDF table needs a working WeasyPrint.
+
+Usage:
+    python benchmarks/bench_report_pdf.py [-n 3]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_report_render import sample_context  # noqa: E402
+
+from ui.utils import report_assets as ra  # noqa: E402
+from ui.utils.report_renderer import render_report_html, write_report_pdf  # noqa: E402
+
+
+def best_s(fn, number):
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["LCO_CACHE_DIR"] = tmp
+        ctx = sample_context()
+
+        print(f"{'image':16} {'source KB':>10} {'print KB':>10}")
+        for filename in ra.REPORT_IMAGES.values():
+            source = ra.find_image(filename)
+            if source is None:
+                print(f"{filename:16} {'missing':>10}")
+                continue
+            start = time.perf_counter()
+            built = ra.derivatives.get(source)
+            build_ms = (time.perf_counter() - start) * 1e3
+            print(f"{filename:16} {source.stat().st_size / 1024:10.0f} "
+                  f"{built.stat().st_size / 1024:10.0f}   ({built.suffix}, built in {build_ms:.0f} ms)")
+
+        try:
+            import weasyprint  # noqa: F401
+        except Exception as e:  # ImportError or missing system libraries
+            print(f"\nWeasyPrint unavailable ({e.__class__.__name__}); skipping PDF timings")
+            return
+
+        def export(print_dpi, assets):
+            os.environ["LCO_PRINT_DPI"] = print_dpi
+            ra.derivatives.clear()
+            pdf_path = os.path.join(tmp, f"report-{assets}.pdf")
+            html = render_report_html(ctx, assets=assets, inline_css=assets == "inline")
+            return lambda: write_report_pdf(html, pdf_path)
+
+        print(f"\n{'export':8} {'PDF KB':>9} {'seconds':>9}")
+        for name, dpi, assets in (("before", "0", "inline"), ("after", "300", "fetch")):
+            run = export(dpi, assets)
+            seconds = best_s(run, args.number)
+            size = os.path.getsize(os.path.join(tmp, f"report-{assets}.pdf")) / 1024
+            print(f"{name:8} {size:9.0f} {seconds:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: report.html compile and render, cold and warm.
+
+"per export" is the original behaviour (a new Environment, so report.html
+is parsed and compiled on every export); "bytecode" is a new process with
+the on-disk template cache filled; "shared" is every later export in the
+same process (`ui.utils.report_renderer.report_template`). The second
+table compares the image modes of `render_report_html` (see
+`ui.utils.report_assets`).
+
+Usage:
+    python benchmarks/bench_report_render.py [-n 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape  # noqa: E402
+
+from ui.utils import report_renderer as rr  # noqa: E402
+from ui.utils.report_assets import ASSET_MODES  # noqa: E402
+
+VALUES = {"fire": 40, "earth": 20, "air": 15, "water": 25,
+          "cardinal": 3, "fixed": 3, "mutable": 2}
+PERSONAL = {"name": "Bench", "date_of_birth": "1990-01-01", "time_of_birth": "12:00",
+            "place_of_birth": "Testville"}
+
+
+def sample_context():
+    """A full report context, generated offline on the stub backend."""
+    os.environ["LCO_LLM_BACKEND"] = "stub"
+    from ai.complete_report import generate_complete_output
+    from ui.utils.report_context import build_report_context
+    report = generate_complete_output(VALUES)
+    return build_report_context(report, PERSONAL, *(VALUES[k] for k in
+                                ("fire", "earth", "air", "water", "cardinal", "fixed", "mutable")))
+
+
+def per_export_template():
+    env = Environment(loader=FileSystemLoader(str(rr.TEMPLATE_DIR)),
+                      autoescape=select_autoescape(['html', 'xml']))
+    return env.get_template(rr.TEMPLATE_NAME)
+
+
+def bytecode_template():
+    rr.reset_report_environment()
+    return rr.report_template()
+
+
+def best_ms(fn, number):
+    times = []
+    for _ in range(number):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["LCO_CACHE_DIR"] = cache_dir
+        os.environ.pop("LCO_DEV", None)
+        ctx = sample_context()
+        rr.report_template()  # fill the bytecode cache
+        shared = rr.report_template()
+
+        cases = [
+            ("per export", per_export_template),
+            ("bytecode", bytecode_template),
+            ("shared", rr.report_template),
+        ]
+        print(f"{'template':12} {'load ms':>9} {'load+render ms':>15}")
+        for name, load in cases:
+            load_ms = best_ms(load, args.number)
+            total_ms = best_ms(lambda: load().render(**ctx), args.number)
+            print(f"{name:12} {load_ms:9.2f} {total_ms:15.2f}")
+        assert per_export_template().render(**ctx) == shared.render(**ctx)
+
+        print(f"\n{'images':12} {'render ms':>9} {'HTML KB':>9}")
+        for mode in ASSET_MODES:
+            render_ms = best_ms(lambda: rr.render_report_html(ctx, assets=mode), args.number)
+            size = len(rr.render_report_html(ctx, assets=mode)) / 1024
+            print(f"{mode:12} {render_ms:9.2f} {size:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Microbenchmark: sign metadata lookups and per-chart scoring.
+
+"before" is the original implementation (lists and dicts rebuilt on every
+call, list membership tests), reproduced here for comparison; "after" is
+the current calc.element_calculator.
+
+Usage:
+    python benchmarks/bench_sign_lookups.py [-n 20000]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from calc import element_calculator as ec  # noqa: E402
+
+CHART = {"Sun": "Leo", "Moon": "Cancer", "Asc": "Libra", "Mercury": "Virgo",
+         "Venus": "Leo", "Mars": "Gemini", "Jupiter": "Pisces", "Saturn": "Capricorn"}
+
+
+# ---- original implementation -------------------------------------------
+def legacy_get_ruler_of_asc(sign):
+    rulers = {"Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury", "Cancer": "Moon",
+              "Leo": "Sun", "Virgo": "Mercury", "Libra": "Venus", "Scorpio": "Mars",
+              "Sagittarius": "Jupiter", "Capricorn": "Saturn", "Aquarius": "Saturn",
+              "Pisces": "Jupiter"}
+    return rulers.get(sign, None)
+
+
+def legacy_get_element(sign):
+    fire = ["Aries", "Leo", "Sagittarius"]
+    water = ["Cancer", "Scorpio", "Pisces"]
+    earth = ["Taurus", "Virgo", "Capricorn"]
+    air = ["Gemini", "Libra", "Aquarius"]
+    if sign in fire:
+        return "Fire"
+    if sign in water:
+        return "Water"
+    if sign in earth:
+        return "Earth"
+    if sign in air:
+        return "Air"
+    return None
+
+
+def legacy_get_quality(sign):
+    cardinal = ["Aries", "Cancer", "Libra", "Capricorn"]
+    fixed = ["Taurus", "Leo", "Scorpio", "Aquarius"]
+    mutable = ["Gemini", "Virgo", "Sagittarius", "Pisces"]
+    if sign in cardinal:
+        return "Cardinal"
+    if sign in fixed:
+        return "Fixed"
+    if sign in mutable:
+        return "Mutable"
+    return None
+
+
+def legacy_calculate_qualities(planets):
+    qualities = {"Cardinal": 0, "Fixed": 0, "Mutable": 0}
+    cardinal = ["Aries", "Cancer", "Libra", "Capricorn"]
+    fixed = ["Taurus", "Leo", "Scorpio", "Aquarius"]
+    mutable = ["Gemini", "Virgo", "Sagittarius", "Pisces"]
+    for planet in ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]:
+        sign = planets.get(planet)
+        if not sign:
+            continue
+        if sign in cardinal:
+            qualities["Cardinal"] += 1
+        elif sign in fixed:
+            qualities["Fixed"] += 1
+        elif sign in mutable:
+            qualities["Mutable"] += 1
+    total = sum(qualities.values())
+    percentages = {q: round((v / total) * 100, 2) if total else 0 for q, v in qualities.items()}
+    return qualities, percentages
+
+
+def legacy_calculate_elements(planets):
+    element_scores = {"Fire": 0, "Water": 0, "Earth": 0, "Air": 0}
+    planet_points = {"Sun": 4, "Moon": 4, "Asc": 4, "Mercury": 3, "Venus": 3,
+                     "Mars": 3, "Jupiter": 2, "Saturn": 2}
+    for planet, sign in planets.items():
+        if sign:
+            element = legacy_get_element(sign)
+            if element:
+                element_scores[element] += planet_points.get(planet, 0)
+    asc_sign = planets.get("Asc")
+    if asc_sign:
+        ruler_sign = planets.get(legacy_get_ruler_of_asc(asc_sign))
+        if ruler_sign:
+            ruler_element = legacy_get_element(ruler_sign)
+            if ruler_element:
+                element_scores[ruler_element] += 2
+    total_points = sum(element_scores.values())
+    element_percentages = {el: round((score / total_points) * 100, 2) if total_points > 0 else 0
+                           for el, score in element_scores.items()}
+    quality_scores, quality_percentages = legacy_calculate_qualities(planets)
+    return element_scores, element_percentages, quality_scores, quality_percentages
+
+
+# ---- harness -------------------------------------------------------------
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def all_signs(fn):
+    def run():
+        for sign in ec.ZODIAC_SIGNS:
+            fn(sign)
+    return run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    assert legacy_calculate_elements(CHART) == ec.calculate_elements(CHART)
+
+    cases = [
+        ("get_element x12", all_signs(legacy_get_element), all_signs(ec.get_element)),
+        ("get_quality x12", all_signs(legacy_get_quality), all_signs(ec.get_quality)),
+        ("get_ruler_of_asc x12", all_signs(legacy_get_ruler_of_asc),
+         all_signs(ec.get_ruler_of_asc)),
+        ("calculate_elements", lambda: legacy_calculate_elements(CHART),
+         lambda: ec.calculate_elements(CHART)),
+    ]
+    print(f"{'case':24} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for name, before, after in cases:
+        b = per_call_us(before, args.number)
+        a = per_call_us(after, args.number)
+        print(f"{name:24} {b:10.3f} {a:10.3f} {b / a:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
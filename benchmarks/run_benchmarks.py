@@ -0,0 +1,256 @@
+"""Benchmark suite for the calc pipeline.
+
+Times the pipeline stages over synthetic corpora (see
+`benchmarks/synthetic.py`) at several sizes and stores the results as JSON
+so regressions can be compared between commits:
+
+- ``extract``     `extract_page3_text` over N PDFs
+- ``parse``       `parse_planet_positions_robust` over N page-3 texts
+- ``calculate``   `calculate_elements` over N charts (score cache cleared
+                  before every repeat, so each chart is scored once)
+- ``end_to_end``  `process_kepler_pdf(use_cache=False)` over N PDFs
+
+Writing thousands of PDFs is slower than reading them, so at most
+``--distinct-pdfs`` files are generated and cycled through; nothing is
+cached between calls, so every call still opens and parses a PDF.
+
+Usage:
+    python benchmarks/run_benchmarks.py run [--sizes 1,100,10000] [-o out.json]
+    python benchmarks/run_benchmarks.py compare baseline.json current.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_pdf_corpus, page3_text, random_charts  # noqa: E402
+from calc.element_calculator import (  # noqa: E402
+    calculate_elements,
+    clear_score_cache,
+    extract_page3_text,
+    parse_planet_positions_robust,
+    process_kepler_pdf,
+)
+
+DEFAULT_SIZES = (1, 100, 10000)
+BENCHMARKS = ("extract", "parse", "calculate", "end_to_end")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+# ----------------------------------------------------------
+# 1. Timing
+# ----------------------------------------------------------
+def time_batch(func, items, repeat, setup=None):
+    """Run `func` over `items` `repeat` times; return per-run seconds."""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def _record(name, n, runs):
+    best = min(runs)
+    return {
+        "benchmark": name,
+        "n": n,
+        "repeat": len(runs),
+        "best_s": best,
+        "mean_s": sum(runs) / len(runs),
+        "per_item_us": best / n * 1e6,
+    }
+
+
+# ----------------------------------------------------------
+# 2. Suite
+# ----------------------------------------------------------
+def run_suite(sizes=DEFAULT_SIZES, benchmarks=BENCHMARKS, repeat=3, seed=0,
+              noise=0.2, filler_lines=20, distinct_pdfs=500, workdir=None, log=None):
+    """Run the benchmarks at every size and return the results document."""
+    sizes = sorted(set(sizes))
+    charts = random_charts(max(sizes), seed)
+    rng = random.Random(seed)
+    texts = [page3_text(chart, rng, noise=noise, filler_lines=filler_lines)
+             for chart in charts]
+
+    pdfs = []
+    needs_pdfs = {"extract", "end_to_end"} & set(benchmarks)
+    tmp = None
+    if needs_pdfs:
+        if workdir is None:
+            tmp = tempfile.TemporaryDirectory(prefix="lco-bench-")
+            workdir = tmp.name
+        pdfs = make_pdf_corpus(workdir, charts[:min(max(sizes), distinct_pdfs)],
+                               seed=seed, filler_lines=filler_lines)
+
+    results = {}
+    try:
+        for name in benchmarks:
+            for n in sizes:
+                if name == "extract":
+                    runs = time_batch(extract_page3_text, _cycle(pdfs, n), repeat)
+                elif name == "parse":
+                    runs = time_batch(parse_planet_positions_robust, texts[:n], repeat)
+                elif name == "calculate":
+                    runs = time_batch(calculate_elements, charts[:n], repeat,
+                                      setup=clear_score_cache)
+                elif name == "end_to_end":
+                    runs = time_batch(lambda p: process_kepler_pdf(p, use_cache=False),
+                                      _cycle(pdfs, n), repeat)
+                else:
+                    raise ValueError(f"unknown benchmark {name!r}")
+                results[f"{name}/{n}"] = _record(name, n, runs)
+                if log:
+                    log(_format_row(results[f"{name}/{n}"]))
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    return {
+        "meta": _metadata(seed=seed, noise=noise, filler_lines=filler_lines,
+                          repeat=repeat, distinct_pdfs=distinct_pdfs),
+        "results": results,
+    }
+
+
+def _cycle(items, n):
+    return list(itertools.islice(itertools.cycle(items), n))
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _metadata(**params):
+    try:
+        import pymupdf
+        pymupdf_version = pymupdf.VersionBind
+    except Exception:
+        pymupdf_version = None
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pymupdf": pymupdf_version,
+        "params": params,
+    }
+
+
+# ----------------------------------------------------------
+# 3. Comparison
+# ----------------------------------------------------------
+def compare(baseline, current, threshold=1.10):
+    """Compare two results documents.
+
+    Returns ``(rows, regressions)``: one ``(key, base_s, current_s, ratio)``
+    row per benchmark present in both, and the keys whose best time grew
+    by more than `threshold` (a ratio, 1.10 = 10% slower).
+    """
+    rows = []
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = cur["best_s"] / base["best_s"] if base["best_s"] else float("inf")
+        rows.append((key, base["best_s"], cur["best_s"], ratio))
+        if ratio > threshold:
+            regressions.append(key)
+    return rows, regressions
+
+
+def _format_row(record):
+    return (f"{record['benchmark']:12} {record['n']:>7} "
+            f"{record['best_s'] * 1000:12.3f} ms {record['per_item_us']:12.2f} us/item")
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ----------------------------------------------------------
+# 4. Command line interface
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the suite and write a JSON results file")
+    run.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                     help="comma-separated chart counts (default: 1,100,10000)")
+    run.add_argument("--bench", default=",".join(BENCHMARKS),
+                     help="comma-separated benchmarks to run")
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--noise", type=float, default=0.2,
+                     help="chance of a filler line after each table line (0..1)")
+    run.add_argument("--filler-lines", type=int, default=20,
+                     help="prose lines appended to every page 3")
+    run.add_argument("--distinct-pdfs", type=int, default=500)
+    run.add_argument("-o", "--output", default=None,
+                     help="results file (default: benchmarks/results/<commit>.json)")
+    run.add_argument("--compare", default=None, metavar="BASELINE",
+                     help="compare against a previous results file when done")
+    run.add_argument("--threshold", type=float, default=1.10)
+
+    cmp_ = sub.add_parser("compare", help="compare two results files")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    cmp_.add_argument("--threshold", type=float, default=1.10,
+                      help="slowdown ratio counted as a regression (default: 1.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        sizes = [int(s) for s in args.sizes.split(",") if s]
+        benchmarks = [b for b in args.bench.split(",") if b]
+        unknown = set(benchmarks) - set(BENCHMARKS)
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        print(f"{'benchmark':12} {'n':>7} {'best':>15} {'per item':>20}")
+        current = run_suite(sizes, benchmarks, repeat=args.repeat, seed=args.seed,
+                            noise=args.noise, filler_lines=args.filler_lines,
+                            distinct_pdfs=args.distinct_pdfs, log=print)
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"{(current['meta']['commit'] or 'unknown')[:12]}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults written to {output}")
+        if not args.compare:
+            return 0
+        baseline = _load(args.compare)
+    else:
+        baseline, current = _load(args.baseline), _load(args.current)
+
+    rows, regressions = compare(baseline, current, args.threshold)
+    print(f"\n{'benchmark':20} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, base_s, cur_s, ratio in rows:
+        flag = "  REGRESSION" if key in regressions else ""
+        print(f"{key:20} {base_s * 1000:12.3f} {cur_s * 1000:12.3f} {ratio:7.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
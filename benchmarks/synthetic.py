@@ -0,0 +1,136 @@
+"""Synthetic Kepler charts, page-3 text and PDFs for the benchmarks.
+
+Everything is driven by a seeded `random.Random`, so a given seed always
+produces the same corpus and timings stay comparable between commits.
+
+- `random_chart` draws a sign for every chart point.
+- `page3_text` renders a chart the way PyMuPDF flattens a Kepler page 3:
+  an intro paragraph, the positions table (including the outer planets
+  and MC, which the parser must skip) and a footer. ``layout="kepler"``
+  puts every token on its own line like docs/kepler.pdf, ``"rows"`` keeps
+  one table row per line. `noise` (0..1) is the chance of a filler line
+  after each table line; `filler_lines` appends interpretation prose to
+  make the page longer.
+- `write_pdf` / `make_pdf_corpus` lay the rows out on page 3 of small
+  PDFs with PyMuPDF.
+"""
+
+import os
+import random
+
+from calc.element_calculator import PLANET_NAMES, ZODIAC_SIGNS
+
+# Table order and labels as printed by Kepler (the parser reads "Asc.")
+TABLE_POINTS = ("Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn",
+                "Uranus", "Neptune", "Pluto", "Asc.", "MC")
+
+INTRO = (
+    "Your birth chart interpretation is based on the positions of",
+    "the planets at the time of your birth.  For the benefit of",
+    "students of astrology, these positions, along with other",
+    "technical information, are listed below:",
+)
+FOOTER = (
+    "Tropical Zodiac   Daylight Savings Time observed.",
+    "GMT: 07:38:00     Time Zone: 7 hours West.",
+    "Lat. and Long. of birth: 51 N 03      114 W 05",
+)
+
+# Filler vocabulary: no word contains a sign name or starts like a chart
+# point, so filler never changes what the parser reads.
+_FILLER_WORDS = (
+    "the", "chart", "shows", "a", "strong", "need", "for", "balance", "and",
+    "steady", "routine", "with", "time", "to", "rest", "energy", "focus",
+    "habits", "daily", "practice", "of", "calm", "work", "family", "ideas",
+    "people", "often", "feel", "drawn", "toward", "new", "goals", "this",
+)
+_FORBIDDEN = tuple(z.lower() for z in ZODIAC_SIGNS) + tuple(
+    p.lower() for p in PLANET_NAMES)
+assert not any(bad in word for word in _FILLER_WORDS for bad in _FORBIDDEN)
+
+
+def random_chart(rng):
+    """Return a planets dict (`PLANET_NAMES` keys) with random signs."""
+    return {planet: rng.choice(ZODIAC_SIGNS) for planet in PLANET_NAMES}
+
+
+def random_charts(n, seed=0):
+    rng = random.Random(seed)
+    return [random_chart(rng) for _ in range(n)]
+
+
+def _filler_line(rng):
+    words = [rng.choice(_FILLER_WORDS) for _ in range(rng.randint(6, 12))]
+    return " ".join(words).capitalize() + "."
+
+
+def table_rows(chart, rng):
+    """Positions-table rows as ``(label, degrees, sign)`` tuples."""
+    rows = []
+    for label in TABLE_POINTS:
+        sign = chart.get(label.rstrip(".")) or rng.choice(ZODIAC_SIGNS)
+        degrees = f"{rng.randint(0, 29):2d} deg. {rng.randint(0, 59):02d} min. of"
+        rows.append((label, degrees, sign))
+    return rows
+
+
+def page3_text(chart, rng=None, noise=0.0, filler_lines=0, layout="kepler"):
+    """Render `chart` as PyMuPDF-style page-3 text.
+
+    Args:
+        rng: `random.Random` for degrees, outer planets and filler.
+        noise: Probability (0..1) of a filler line after each table line.
+        filler_lines: Lines of interpretation prose appended to the page.
+        layout: ``"kepler"`` (one token per line) or ``"rows"``.
+    """
+    if layout not in ("kepler", "rows"):
+        raise ValueError(f"unknown layout {layout!r}")
+    rng = rng or random.Random(0)
+    lines = list(INTRO)
+    for label, degrees, sign in table_rows(chart, rng):
+        if layout == "rows":
+            table = [f"{label} position is {degrees} {sign}"]
+        else:
+            table = [label, "position", "is"] + degrees.split() + [sign]
+        for line in table:
+            lines.append(line)
+            if noise and rng.random() < noise:
+                lines.append(_filler_line(rng))
+    lines.extend(FOOTER)
+    lines.extend(_filler_line(rng) for _ in range(filler_lines))
+    return "\n".join(lines) + "\n"
+
+
+def write_pdf(path, chart, rng=None, pages=3, filler_lines=0):
+    """Write a small Kepler-like PDF with the table for `chart` on page 3."""
+    import pymupdf  # PyMuPDF
+
+    rng = rng or random.Random(0)
+    doc = pymupdf.open()
+    try:
+        for i in range(pages):
+            page = doc.new_page()
+            if i != 2:
+                page.insert_text((72, 72), f"Interpretation text, page {i + 1}")
+                continue
+            lines = list(INTRO)
+            lines += [f"{label}  position is  {degrees}  {sign}"
+                      for label, degrees, sign in table_rows(chart, rng)]
+            lines += FOOTER
+            lines += [_filler_line(rng) for _ in range(filler_lines)]
+            # one insert_text call per page: per-line calls dominate
+            # generation time for large corpora
+            page.insert_text((72, 72), "\n".join(lines), fontsize=9)
+        doc.save(path)
+    finally:
+        doc.close()
+    return path
+
+
+def make_pdf_corpus(directory, charts, seed=0, filler_lines=0):
+    """Write one PDF per chart into `directory`; return the paths."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    return [write_pdf(os.path.join(directory, f"chart_{i:05d}.pdf"), chart, rng,
+                      filler_lines=filler_lines)
+            for i, chart in enumerate(charts)]
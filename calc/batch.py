@@ -0,0 +1,187 @@
+"""Batch processing of Kepler-style PDFs.
+
+Fans page-3 extraction + `process_text` out across a process pool and
+streams one result record per file as soon as that file finishes. A file
+that fails to open or parse produces an error record instead of aborting
+the batch. Page-3 text goes through the persistent extraction cache, so
+re-running a batch over the same exports skips PyMuPDF entirely.
+
+Usage:
+    python -m calc.batch docs/ "exports/**/*.pdf" -j 8 -o results.jsonl
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from calc.element_calculator import EXTRACTION_MODES, process_kepler_pdf
+
+
+# ----------------------------------------------------------
+# 1. Input discovery
+# ----------------------------------------------------------
+def expand_inputs(inputs, recursive=False):
+    """Expand files, directories and glob patterns into a list of PDF paths.
+
+    Directories contribute their ``*.pdf`` files (``**/*.pdf`` when
+    `recursive` is set). Order is preserved and duplicates are dropped.
+    """
+    paths = []
+    seen = set()
+
+    def add(path):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            paths.append(path)
+
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, "**", "*.pdf") if recursive \
+                else os.path.join(item, "*.pdf")
+            for path in sorted(glob.glob(pattern, recursive=recursive)):
+                add(path)
+        elif glob.has_magic(item):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    add(path)
+        else:
+            # plain file (missing files are reported as per-file errors)
+            add(item)
+    return paths
+
+
+# ----------------------------------------------------------
+# 2. Per-file worker (runs inside the pool)
+# ----------------------------------------------------------
+def process_one(pdf_path, mode="text"):
+    """Process a single PDF and return a JSON-serialisable result record.
+
+    `mode` is the `process_kepler_pdf` extraction mode.
+
+    Never raises: failures are reported with ``"ok": False`` so a single
+    bad export cannot abort the batch.
+    """
+    start = time.perf_counter()
+    try:
+        planets, scores, percentages, q_scores, q_percentages = \
+            process_kepler_pdf(pdf_path, mode=mode)
+    except Exception as e:
+        return {
+            "path": pdf_path,
+            "ok": False,
+            "error_type": type(e).__name__,
+            "error": str(e),
+            "elapsed": round(time.perf_counter() - start, 6),
+        }
+    return {
+        "path": pdf_path,
+        "ok": True,
+        "planets": planets,
+        "element_scores": scores,
+        "element_percentages": percentages,
+        "quality_scores": q_scores,
+        "quality_percentages": q_percentages,
+        "elapsed": round(time.perf_counter() - start, 6),
+    }
+
+
+# ----------------------------------------------------------
+# 3. Streaming batch API
+# ----------------------------------------------------------
+def iter_process_pdfs(pdf_paths, max_workers=None, max_pending=None, mode="text"):
+    """Process many PDFs in parallel, yielding result records as they finish.
+
+    Args:
+        pdf_paths: Iterable of PDF paths. It is consumed lazily, so very
+            large inputs are never fully materialised.
+        max_workers: Pool size (defaults to ``os.cpu_count()``). With
+            ``max_workers=1`` the files are processed in-process, which is
+            handy for debugging.
+        max_pending: Upper bound on submitted-but-unfinished files
+            (defaults to ``4 * max_workers``) to keep memory bounded.
+        mode: Extraction mode passed to `process_kepler_pdf`.
+
+    Yields:
+        dict: result records from `process_one`, in completion order.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        for path in pdf_paths:
+            yield process_one(path, mode)
+        return
+
+    max_pending = max_pending or 4 * max_workers
+    paths = iter(pdf_paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    path = next(paths)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(pool.submit(process_one, path, mode))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def process_kepler_pdfs(pdf_paths, max_workers=None, mode="text"):
+    """Process many PDFs and return all result records (completion order)."""
+    return list(iter_process_pdfs(pdf_paths, max_workers=max_workers, mode=mode))
+
+
+# ----------------------------------------------------------
+# 4. Command line interface
+# ----------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m calc.batch",
+        description="Extract planet positions and element/quality scores "
+                    "from many Kepler PDFs. Writes one JSON object per file.")
+    parser.add_argument("inputs", nargs="+",
+                        help="PDF files, directories or glob patterns")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL output file (default: stdout)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="search directories recursively")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default="text",
+                        help="page-3 extraction mode (default: text)")
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs, recursive=args.recursive)
+    out = sys.stdout if args.output == "-" else open(
+        args.output, "w", encoding="utf-8")
+
+    ok = failed = 0
+    start = time.perf_counter()
+    try:
+        for record in iter_process_pdfs(paths, max_workers=args.jobs, mode=args.mode):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if record["ok"]:
+                ok += 1
+            else:
+                failed += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Processed {ok + failed} file(s): {ok} ok, {failed} failed "
+          f"in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
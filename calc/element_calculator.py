@@ -6,28 +6,119 @@ the module does not require PyMuPDF; the package is imported lazily only
 when `extract_page3_text` is invoked.
 """
 
+import json
+import os
+import re
+from bisect import bisect_left
+from enum import IntEnum
+from functools import lru_cache
+
+# Chart points read from the positions table, in output order
+PLANET_NAMES = ("Sun", "Moon", "Asc", "Mercury", "Venus", "Mars", "Jupiter", "Saturn")
+
+ELEMENTS = ("Fire", "Water", "Earth", "Air")
+QUALITIES = ("Cardinal", "Fixed", "Mutable")
+
+
+class Sign(IntEnum):
+    """The 12 zodiac signs. Values index ZODIAC_SIGNS and the SIGN_* tables."""
+    ARIES = 0
+    TAURUS = 1
+    GEMINI = 2
+    CANCER = 3
+    LEO = 4
+    VIRGO = 5
+    LIBRA = 6
+    SCORPIO = 7
+    SAGITTARIUS = 8
+    CAPRICORN = 9
+    AQUARIUS = 10
+    PISCES = 11
+
+
+# ----------------------------------------------------------
+# Sign metadata (immutable, built once at import)
+# ----------------------------------------------------------
+ZODIAC_SIGNS = tuple(sign.name.title() for sign in Sign)
+SIGN_ELEMENTS = ("Fire", "Earth", "Air", "Water") * 3
+SIGN_QUALITIES = ("Cardinal", "Fixed", "Mutable") * 4
+SIGN_RULERS = (
+    "Mars", "Venus", "Mercury", "Moon", "Sun", "Mercury",
+    "Venus", "Mars", "Jupiter", "Saturn", "Saturn", "Jupiter",
+)
+
+# The same tables as indexes into ELEMENTS / QUALITIES / PLANET_NAMES, for
+# the scoring kernels.
+SIGN_ELEMENT = tuple(ELEMENTS.index(e) for e in SIGN_ELEMENTS)
+SIGN_QUALITY = tuple(QUALITIES.index(q) for q in SIGN_QUALITIES)
+SIGN_RULER = tuple(PLANET_NAMES.index(p) for p in SIGN_RULERS)
+
+# Scoring weights, indexed like PLANET_NAMES. Elements use weighted points
+# (Asc included) plus a bonus for the Ascendant's ruler; qualities count
+# the 7 traditional planets only.
+POINT_WEIGHTS = (4, 4, 4, 3, 3, 3, 2, 2)
+RULER_BONUS = 2
+ASC_INDEX = PLANET_NAMES.index("Asc")
+QUALITY_PLANETS = tuple(i for i, p in enumerate(PLANET_NAMES) if p != "Asc")
+
+# PERCENT_TABLE[total][score] == round(score / total * 100, 2); scores
+# are small integers, so percentages are table hits instead of round().
+MAX_SCORE_TOTAL = sum(POINT_WEIGHTS) + RULER_BONUS
+PERCENT_TABLE = ((0,) * (MAX_SCORE_TOTAL + 1),) + tuple(
+    tuple(round((score / total) * 100, 2) for score in range(MAX_SCORE_TOTAL + 1))
+    for total in range(1, MAX_SCORE_TOTAL + 1))
+
+# Name-keyed views: every sign lookup is a single dict hit
+_SIGN_INDEX = {z: int(sign) for z, sign in zip(ZODIAC_SIGNS, Sign)}
+_ELEMENT_OF = dict(zip(ZODIAC_SIGNS, SIGN_ELEMENTS))
+_QUALITY_OF = dict(zip(ZODIAC_SIGNS, SIGN_QUALITIES))
+_RULER_OF = dict(zip(ZODIAC_SIGNS, SIGN_RULERS))
+
+# Tokenizer tables for parse_planet_positions_robust (matched on lowercased
+# lines). Planet names are prefix-free, so a plain alternation anchored at
+# the line start finds the only candidate. Most lines mention no sign, so a
+# plain alternation screens them first; the lookahead variant then reports
+# overlapping mentions (e.g. "ariescorpio") too.
+_PLANET_BY_LOWER = {p.lower(): p for p in PLANET_NAMES}
+_SIGN_BY_LOWER = {z.lower(): z for z in ZODIAC_SIGNS}
+_SIGN_ORDER = {z.lower(): i for i, z in enumerate(ZODIAC_SIGNS)}
+_PLANET_RE = re.compile("|".join(re.escape(p) for p in _PLANET_BY_LOWER))
+_SIGN_ANY_RE = re.compile("|".join(re.escape(z) for z in _SIGN_BY_LOWER))
+_SIGN_RE = re.compile("(?=(" + _SIGN_ANY_RE.pattern + "))")
+
+
 # ----------------------------------------------------------
 # 1. Read Text from PDF (Only Page 3)
 # ----------------------------------------------------------
 
 
 def extract_page3_text(pdf_path):
+    """Return the text of page 3, opening only that page.
+
+    The document handle is always closed, including when the PDF has
+    fewer than 3 pages.
+    """
     try:
         import pymupdf  # PyMuPDF
     except Exception as e:
         raise RuntimeError(
             "PyMuPDF (fitz) is required for PDF extraction: " + str(e))
 
-    doc = pymupdf.open(pdf_path)
+    with pymupdf.open(pdf_path) as doc:
+        # Page index starts at 0 → page 3 = index 2
+        if doc.page_count < 3:
+            raise ValueError("PDF does not contain page 3.")
+        return doc.load_page(2).get_text()
 
-    # Page index starts at 0 → page 3 = index 2
-    try:
-        text = doc[2].get_text()
-    except IndexError:
-        raise ValueError("PDF does not contain page 3.")
 
-    doc.close()
-    return text
+def cached_extract_page3_text(pdf_path, cache=None):
+    """`extract_page3_text` backed by the persistent extraction cache.
+
+    The cache is keyed by the PDF content hash, so a chart that was
+    already extracted once is served without touching PyMuPDF.
+    """
+    from calc.pdf_cache import cached_extract
+    return cached_extract(pdf_path, "page3", extract_page3_text, cache=cache)
 
 
 def parse_planet_positions(text):
@@ -45,87 +136,135 @@ def parse_planet_positions_robust(text):
 
     Strategy:
     - Split text into lines and trim whitespace.
-    - Find indexes where planet names appear (case-insensitive).
-    - For each planet, scan the next few lines for a known zodiac name.
-    - If not found in nearby lines, assign from a global sequence match
-      by scanning all zodiac occurrences and mapping by nearest planet index.
+    - Find the first line starting with each planet name (case-insensitive).
+    - For each planet, take the first zodiac name found on that line or
+      the next 5 lines.
+    - If not found in nearby lines, take the zodiac name on the nearest
+      line (by index distance) that mentions one.
+
+    The text is tokenized in a single pass: one precompiled alternation
+    regex for planets and one for signs record the first line of each
+    planet and a sorted index of lines mentioning a sign. Both lookups
+    above are then a `bisect` on that index, so the cost is O(lines)
+    regardless of how many pages the dump spans.
     """
-    planets = {
-        "Sun": None,
-        "Moon": None,
-        "Asc": None,
-        "Mercury": None,
-        "Venus": None,
-        "Mars": None,
-        "Jupiter": None,
-        "Saturn": None
-    }
-
-    zodiac_names = [
-        "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
-        "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
-    ]
-
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    # Build map of line index -> text lower
-    lower_lines = [ln.lower() for ln in lines]
-
-    # Find planet header positions
-    planet_positions = {}
-    for i, ln in enumerate(lower_lines):
-        for planet in list(planets.keys()):
-            if ln.startswith(planet.lower()):
-                planet_positions.setdefault(planet, []).append(i)
-
-    # Find all zodiac occurrences with indices
-    zodiac_positions = []
-    for i, ln in enumerate(lines):
-        for z in zodiac_names:
-            if z.lower() in ln.lower():
-                zodiac_positions.append((i, z))
-
-    # For each planet, try to find zodiac in subsequent lines (within window)
-    for planet in planets.keys():
+    first_line = {}   # planet -> index of the first line starting with it
+    sign_lines = []   # sorted indexes of lines that mention a sign
+    line_signs = []   # first sign (in zodiac order) for each of sign_lines
+
+    i = 0
+    for raw in text.splitlines():
+        ln = raw.strip()
+        if not ln:
+            continue
+        low = ln.lower()
+        m = _PLANET_RE.match(low)
+        if m and _PLANET_BY_LOWER[m.group()] not in first_line:
+            first_line[_PLANET_BY_LOWER[m.group()]] = i
+        m = _SIGN_ANY_RE.search(low)
+        if m:
+            signs = _SIGN_RE.findall(low, m.start())
+            sign_lines.append(i)
+            line_signs.append(min(signs, key=_SIGN_ORDER.__getitem__))
+        i += 1
+
+    planets = {}
+    for planet in PLANET_NAMES:
         found = None
-        pos_list = planet_positions.get(planet, [])
-        if pos_list:
-            # use the first occurrence
-            p_idx = pos_list[0]
-            for offset in range(0, 6):
-                idx = p_idx + offset
-                if idx < len(lines):
-                    for z in zodiac_names:
-                        if z.lower() in lines[idx].lower():
-                            found = z
-                            break
-                if found:
-                    break
-        # fallback: find nearest zodiac by index distance
-        if not found and zodiac_positions and pos_list:
-            p_idx = pos_list[0]
-            closest = min(zodiac_positions, key=lambda t: abs(t[0] - p_idx))
-            found = closest[1]
-
-        # final fallback: if still not found, try a global sequential assignment
-        planets[planet] = found
-
-    # If no explicit Asc entry but there is a line 'Asc.' or 'Asc', try to detect
-    if not planets.get('Asc'):
-        for i, ln in enumerate(lines):
-            if ln.lower().startswith('asc') or ln.lower().startswith('asc.'):
-                # try to pick zodiac from following lines
-                for offset in range(1, 5):
-                    idx = i + offset
-                    if idx < len(lines):
-                        for z in zodiac_names:
-                            if z.lower() in lines[idx].lower():
-                                planets['Asc'] = z
-                                break
-                    if planets['Asc']:
-                        break
-                if planets['Asc']:
-                    break
+        p_idx = first_line.get(planet)
+        if p_idx is not None and sign_lines:
+            j = bisect_left(sign_lines, p_idx)
+            if j < len(sign_lines) and sign_lines[j] - p_idx < 6:
+                # a sign within the planet's line or the next 5 lines
+                found = line_signs[j]
+            else:
+                # fallback: nearest sign line; ties go to the earlier line
+                before = j - 1 if j > 0 else None
+                after = j if j < len(sign_lines) else None
+                if after is None or (before is not None and
+                                     p_idx - sign_lines[before] <= sign_lines[after] - p_idx):
+                    found = line_signs[before]
+                else:
+                    found = line_signs[after]
+        planets[planet] = _SIGN_BY_LOWER[found] if found else None
+
+    return planets
+
+
+# ----------------------------------------------------------
+# 2b. Layout mode: read the positions table from word geometry
+# ----------------------------------------------------------
+def extract_page3_words(pdf_path):
+    """Return the words on page 3 as ``(x0, y0, x1, y1, text)`` tuples.
+
+    Uses PyMuPDF's ``get_text("words")`` so the table structure (rows and
+    columns) survives, unlike the flattened `extract_page3_text` output.
+    """
+    try:
+        import pymupdf  # PyMuPDF
+    except Exception as e:
+        raise RuntimeError(
+            "PyMuPDF (fitz) is required for PDF extraction: " + str(e))
+
+    with pymupdf.open(pdf_path) as doc:
+        if doc.page_count < 3:
+            raise ValueError("PDF does not contain page 3.")
+        return [tuple(w[:5]) for w in doc.load_page(2).get_text("words")]
+
+
+def cached_extract_page3_words(pdf_path, cache=None):
+    """`extract_page3_words` backed by the persistent extraction cache."""
+    from calc.pdf_cache import cached_extract
+
+    def extract(path):
+        return json.dumps(extract_page3_words(path))
+
+    payload = cached_extract(pdf_path, "page3-words", extract, cache=cache)
+    return [tuple(w) for w in json.loads(payload)]
 
+
+def cluster_rows(words, tolerance=None):
+    """Group words into table rows by the vertical centre of their boxes.
+
+    Words whose centres are within `tolerance` points of the row's first
+    word share a row (default: 40% of the median word height). Rows are
+    returned top to bottom, each sorted left to right.
+    """
+    if not words:
+        return []
+    if tolerance is None:
+        heights = sorted(w[3] - w[1] for w in words)
+        tolerance = 0.4 * heights[len(heights) // 2]
+
+    rows = []
+    row_y = None
+    for w in sorted(words, key=lambda w: ((w[1] + w[3]) / 2, w[0])):
+        yc = (w[1] + w[3]) / 2
+        if row_y is None or yc - row_y > tolerance:
+            rows.append([])
+            row_y = yc
+        rows[-1].append(w)
+    return [sorted(row, key=lambda w: w[0]) for row in rows]
+
+
+def parse_planet_positions_layout(words):
+    """Parse planet positions from page-3 word geometry.
+
+    A row belongs to the positions table when its first column is a planet
+    name ("Asc." included); the sign is read from the first cell of that
+    row holding a zodiac name. There is no nearest-line guessing: a planet
+    whose row has no sign stays ``None``.
+    """
+    planets = dict.fromkeys(PLANET_NAMES)
+    for row in cluster_rows(words):
+        name = _PLANET_BY_LOWER.get(row[0][4].strip(".:").lower())
+        if name is None or planets[name] is not None:
+            continue
+        for w in row[1:]:
+            sign = _SIGN_BY_LOWER.get(w[4].strip(".,:;").lower())
+            if sign:
+                planets[name] = sign
+                break
     return planets
 
 
@@ -133,59 +272,176 @@ def parse_planet_positions_robust(text):
 # 3. Determine Ruler of Ascendant
 # ----------------------------------------------------------
 def get_ruler_of_asc(sign):
-    rulers = {
-        "Aries": "Mars",
-        "Taurus": "Venus",
-        "Gemini": "Mercury",
-        "Cancer": "Moon",
-        "Leo": "Sun",
-        "Virgo": "Mercury",
-        "Libra": "Venus",
-        "Scorpio": "Mars",
-        "Sagittarius": "Jupiter",
-        "Capricorn": "Saturn",
-        "Aquarius": "Saturn",
-        "Pisces": "Jupiter",
-    }
-    return rulers.get(sign, None)
+    return _RULER_OF.get(sign)
 
 
 # ----------------------------------------------------------
 # 4. Determine the element of a zodiac sign
 # ----------------------------------------------------------
 def get_element(sign):
-    fire = ["Aries", "Leo", "Sagittarius"]
-    water = ["Cancer", "Scorpio", "Pisces"]
-    earth = ["Taurus", "Virgo", "Capricorn"]
-    air = ["Gemini", "Libra", "Aquarius"]
-
-    if sign in fire:
-        return "Fire"
-    if sign in water:
-        return "Water"
-    if sign in earth:
-        return "Earth"
-    if sign in air:
-        return "Air"
-    return None
+    return _ELEMENT_OF.get(sign)
 
 
 def get_quality(sign):
-    cardinal = ["Aries", "Cancer", "Libra", "Capricorn"]
-    fixed = ["Taurus", "Leo", "Scorpio", "Aquarius"]
-    mutable = ["Gemini", "Virgo", "Sagittarius", "Pisces"]
+    return _QUALITY_OF.get(sign)
 
-    if sign in cardinal:
-        return "Cardinal"
-    if sign in fixed:
-        return "Fixed"
-    if sign in mutable:
-        return "Mutable"
-    return None
+
+def sign_from_name(name):
+    """Return the `Sign` for a sign name such as "Leo", or ``None``."""
+    index = _SIGN_INDEX.get(name)
+    return None if index is None else Sign(index)
 
 
 # ----------------------------------------------------------
-# 4b. Calculate qualities (modalities) - Count-based method
+# 4b. Chart scoring kernel (shared with calc.vectorized)
+# ----------------------------------------------------------
+def encode_placements(planets):
+    """Encode a planets dict as a tuple of sign indexes in PLANET_NAMES
+    order (-1 for a missing or unrecognised sign)."""
+    return tuple(_SIGN_INDEX.get(planets.get(name), -1) for name in PLANET_NAMES)
+
+
+def score_placements(row):
+    """Score one encoded chart (see `encode_placements`).
+
+    Returns ``(element_scores, quality_scores)`` as lists aligned with
+    ELEMENTS and QUALITIES. Elements use the weighted point system plus
+    the ruler-of-Ascendant bonus; qualities count the 7 traditional
+    planets only. `calc.vectorized.score_charts` is the batch version.
+    """
+    element_scores = [0, 0, 0, 0]
+    for weight, sign in zip(POINT_WEIGHTS, row):
+        if sign >= 0:
+            element_scores[SIGN_ELEMENT[sign]] += weight
+
+    asc_sign = row[ASC_INDEX]
+    if asc_sign >= 0:
+        ruler_sign = row[SIGN_RULER[asc_sign]]
+        if ruler_sign >= 0:
+            element_scores[SIGN_ELEMENT[ruler_sign]] += RULER_BONUS
+
+    quality_scores = [0, 0, 0]
+    for i in QUALITY_PLANETS:
+        sign = row[i]
+        if sign >= 0:
+            quality_scores[SIGN_QUALITY[sign]] += 1
+
+    return element_scores, quality_scores
+
+
+def _percentages(names, scores):
+    # a chart without points reports int 0 for every name
+    return dict(zip(names, map(PERCENT_TABLE[sum(scores)].__getitem__, scores)))
+
+
+# ----------------------------------------------------------
+# 4c. Memoized chart scoring
+# ----------------------------------------------------------
+def placements_of(planets):
+    """Return the 8-tuple of signs (PLANET_NAMES order) for a planets dict."""
+    return tuple(planets.get(name) for name in PLANET_NAMES)
+
+
+def _score_uncached(placements):
+    row = tuple(_SIGN_INDEX.get(sign, -1) for sign in placements)
+    element_scores, quality_scores = score_placements(row)
+    return (dict(zip(ELEMENTS, element_scores)),
+            _percentages(ELEMENTS, element_scores),
+            dict(zip(QUALITIES, quality_scores)),
+            _percentages(QUALITIES, quality_scores))
+
+
+DEFAULT_SCORE_CACHE_SIZE = 4096
+
+
+def _score_cache_size():
+    """``LCO_SCORE_CACHE_SIZE``, or the default when unset or malformed."""
+    try:
+        return max(0, int(os.getenv("LCO_SCORE_CACHE_SIZE", DEFAULT_SCORE_CACHE_SIZE)))
+    except ValueError:
+        return DEFAULT_SCORE_CACHE_SIZE
+
+
+_score_cached = lru_cache(maxsize=_score_cache_size())(_score_uncached)
+_precomputed_scores = {}
+_precomputed_hits = 0
+
+
+def score_chart(placements):
+    """Score a chart given as an 8-tuple of signs in PLANET_NAMES order.
+
+    Results are memoized (LRU, see `configure_score_cache`) and can be
+    preloaded with `preload_scores`, so re-scoring a chart already seen
+    costs a hash lookup. Returns fresh ``(element_scores,
+    element_percentages, quality_scores, quality_percentages)`` dicts that
+    callers may modify freely.
+    """
+    global _precomputed_hits
+    result = _precomputed_scores.get(placements)
+    if result is not None:
+        _precomputed_hits += 1
+    else:
+        result = _score_cached(placements)
+    return tuple(dict(d) for d in result)
+
+
+def configure_score_cache(maxsize):
+    """Resize (and clear) the `score_chart` LRU cache. ``None`` = unbounded."""
+    global _score_cached
+    _score_cached = lru_cache(maxsize=maxsize)(_score_uncached)
+
+
+def preload_scores(placements, clear=False):
+    """Precompute scores for a set of common charts (8-tuples of signs).
+
+    Preloaded charts are served from a plain dict that is never evicted,
+    e.g. the charts of an existing client base before a large batch. With
+    numpy installed the set is scored in one `calc.vectorized` pass.
+    Returns the number of preloaded charts.
+    """
+    global _precomputed_scores
+    placements = list(dict.fromkeys(tuple(p) for p in placements))
+    table = {} if clear else dict(_precomputed_scores)
+    try:
+        from calc.vectorized import chart_dicts, score_charts
+    except ImportError:
+        for key in placements:
+            table[key] = _score_uncached(key)
+    else:
+        import numpy as np
+        rows = np.array([[_SIGN_INDEX.get(sign, -1) for sign in key] for key in placements],
+                        dtype=np.int8).reshape(-1, len(PLANET_NAMES))
+        result = score_charts(rows)
+        for i, key in enumerate(placements):
+            table[key] = chart_dicts(result, i)
+    # swap in atomically so concurrent readers never see a partial table
+    _precomputed_scores = table
+    return len(table)
+
+
+def score_cache_info():
+    """Hit/miss counters for monitoring the `score_chart` caches."""
+    info = _score_cached.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "currsize": info.currsize,
+        "maxsize": info.maxsize,
+        "precomputed_hits": _precomputed_hits,
+        "precomputed_size": len(_precomputed_scores),
+    }
+
+
+def clear_score_cache():
+    """Drop memoized and preloaded scores and reset the counters."""
+    global _precomputed_scores, _precomputed_hits
+    _score_cached.cache_clear()
+    _precomputed_scores = {}
+    _precomputed_hits = 0
+
+
+# ----------------------------------------------------------
+# 4d. Calculate qualities (modalities) - Count-based method
 # ----------------------------------------------------------
 def calculate_qualities(planets):
     """Calculate quality distribution using simple count method.
@@ -201,37 +457,7 @@ def calculate_qualities(planets):
             - qualities: Count of planets in each quality
             - percentages: Percentage distribution (rounded to 2 decimals)
     """
-    qualities = {
-        "Cardinal": 0,
-        "Fixed": 0,
-        "Mutable": 0
-    }
-
-    cardinal = ["Aries", "Cancer", "Libra", "Capricorn"]
-    fixed = ["Taurus", "Leo", "Scorpio", "Aquarius"]
-    mutable = ["Gemini", "Virgo", "Sagittarius", "Pisces"]
-
-    # Only these planets count: Sun, Moon, Mercury, Venus, Mars, Jupiter, Saturn
-    quality_planets = ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]
-
-    for planet in quality_planets:
-        sign = planets.get(planet)
-        if not sign:
-            continue
-        if sign in cardinal:
-            qualities["Cardinal"] += 1
-        elif sign in fixed:
-            qualities["Fixed"] += 1
-        elif sign in mutable:
-            qualities["Mutable"] += 1
-
-    total = sum(qualities.values())
-
-    percentages = {
-        q: round((v / total) * 100, 2) if total else 0
-        for q, v in qualities.items()
-    }
-
+    _, _, qualities, percentages = score_chart(placements_of(planets))
     return qualities, percentages
 
 
@@ -247,55 +473,45 @@ def calculate_elements(planets):
     Returns:
         tuple: (element_scores, element_percentages, quality_scores, quality_percentages)
     """
-    element_scores = {"Fire": 0, "Water": 0, "Earth": 0, "Air": 0}
-
-    planet_points = {
-        "Sun": 4,
-        "Moon": 4,
-        "Asc": 4,
-        "Mercury": 3,
-        "Venus": 3,
-        "Mars": 3,
-        "Jupiter": 2,
-        "Saturn": 2
-    }
-
-    # Add points for planets and ascendant (ELEMENTS ONLY)
-    for planet, sign in planets.items():
-        if sign:
-            element = get_element(sign)
-            if element:
-                element_scores[element] += planet_points.get(planet, 0)
-
-    # Handle Ruler of Ascendant (extra 2 points for ELEMENTS ONLY)
-    asc_sign = planets.get("Asc")
-    if asc_sign:
-        ruler = get_ruler_of_asc(asc_sign)
-        ruler_sign = planets.get(ruler)
-        if ruler_sign:
-            ruler_element = get_element(ruler_sign)
-            if ruler_element:
-                element_scores[ruler_element] += 2   # +2 points
-
-    # Convert elements to percentages
-    total_points = sum(element_scores.values())
-    element_percentages = {
-        el: round((score / total_points) * 100, 2) if total_points > 0 else 0
-        for el, score in element_scores.items()
-    }
-
-    # Use calculate_qualities() for quality calculation (count-based, 7 planets only)
-    quality_scores, quality_percentages = calculate_qualities(planets)
-
-    return element_scores, element_percentages, quality_scores, quality_percentages
+    return score_chart(placements_of(planets))
 
 
 # ----------------------------------------------------------
 # 6. Combine everything
 # ----------------------------------------------------------
-def process_kepler_pdf(pdf_path):
-    text = extract_page3_text(pdf_path)
-    return process_text(text)
+EXTRACTION_MODES = ("text", "layout", "detect")
+
+
+def process_kepler_pdf(pdf_path, use_cache=True, mode="text"):
+    """Extract page 3 of a Kepler PDF and compute element scores.
+
+    `mode` selects the extraction strategy: ``"text"`` parses the flattened
+    page text with `parse_planet_positions_robust`; ``"layout"`` reads the
+    positions table from word coordinates with
+    `parse_planet_positions_layout`; ``"detect"`` parses the text of
+    whichever page holds the positions table (see `calc.page_detect`),
+    for export templates that do not put it on page 3.
+    """
+    if mode == "text":
+        if use_cache:
+            text = cached_extract_page3_text(pdf_path)
+        else:
+            text = extract_page3_text(pdf_path)
+        return process_text(text)
+    if mode == "layout":
+        if use_cache:
+            words = cached_extract_page3_words(pdf_path)
+        else:
+            words = extract_page3_words(pdf_path)
+        return process_words(words)
+    if mode == "detect":
+        from calc.page_detect import cached_detect_positions_page, detect_positions_page
+        if use_cache:
+            detected = cached_detect_positions_page(pdf_path)
+        else:
+            detected = detect_positions_page(pdf_path)
+        return process_text(detected.text)
+    raise ValueError(f"Unknown extraction mode {mode!r}; expected one of {EXTRACTION_MODES}")
 
 
 def process_text(text):
@@ -308,6 +524,13 @@ def process_text(text):
     return planets, scores, percentages, q_scores, q_percentages
 
 
+def process_words(words):
+    """Layout-mode counterpart of `process_text` (words from page 3)."""
+    planets = parse_planet_positions_layout(words)
+    scores, percentages, q_scores, q_percentages = calculate_elements(planets)
+    return planets, scores, percentages, q_scores, q_percentages
+
+
 # ----------------------------------------------------------
 # 7. Example Usage
 # ----------------------------------------------------------
@@ -0,0 +1,147 @@
+"""Streaming ingestion of concatenated page-3 text dumps.
+
+Some upstream systems deliver one large text file holding many charts'
+page-3 text, separated by a delimiter (form feed by default), instead of
+one PDF per client. `iter_charts` reads such a stream in fixed-size chunks
+and parses one record at a time, so memory stays bounded by the largest
+record no matter how big the dump is.
+
+Usage:
+    python -m calc.ingest dump.txt --delimiter '\\n=====\\n' -o results.jsonl
+"""
+
+import argparse
+import codecs
+import json
+import re
+import sys
+import time
+
+from calc.element_calculator import process_text
+
+DEFAULT_DELIMITER = "\f"
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_MAX_RECORD_CHARS = 1 << 22
+
+
+def iter_records(stream, delimiter=DEFAULT_DELIMITER, chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_record_chars=DEFAULT_MAX_RECORD_CHARS):
+    """Split a text stream into records on `delimiter`, lazily.
+
+    Only the record being assembled is held in memory. Blank records
+    (e.g. after a trailing delimiter) are skipped.
+
+    Raises:
+        ValueError: a record grows beyond `max_record_chars`, which
+            usually means the delimiter is wrong.
+    """
+    if not delimiter:
+        raise ValueError("delimiter must not be empty")
+
+    buf = ""
+    search_from = 0
+    count = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            raise TypeError("iter_records expects a text stream; open the file in text mode")
+        buf += chunk
+        # records are sliced from `start`; the consumed prefix is dropped once
+        # per chunk rather than copying the rest of the buffer per record
+        start = 0
+        while True:
+            idx = buf.find(delimiter, search_from)
+            if idx < 0:
+                break
+            record = buf[start:idx]
+            start = search_from = idx + len(delimiter)
+            if record.strip():
+                count += 1
+                yield record
+        buf = buf[start:]
+        # the delimiter may straddle the next chunk boundary
+        search_from = max(0, len(buf) - len(delimiter) + 1)
+        if len(buf) > max_record_chars:
+            raise ValueError(
+                f"record {count + 1} exceeds {max_record_chars} characters "
+                f"without a delimiter {delimiter!r}")
+    if buf.strip():
+        yield buf
+
+
+def iter_charts(stream, delimiter=DEFAULT_DELIMITER, id_pattern=None,
+                chunk_size=DEFAULT_CHUNK_SIZE, max_record_chars=DEFAULT_MAX_RECORD_CHARS):
+    """Parse every chart in a concatenated text dump, one record at a time.
+
+    Args:
+        stream: Text stream (file object opened in text mode).
+        delimiter: String separating records.
+        id_pattern: Optional regex; its first group (or whole match) in a
+            record becomes the record id. Records without a match, or all
+            records when no pattern is given, use their 1-based position.
+
+    Yields:
+        (record_id, planets, scores, percentages, q_scores, q_percentages)
+    """
+    id_re = re.compile(id_pattern) if isinstance(id_pattern, str) else id_pattern
+    for index, record in enumerate(
+            iter_records(stream, delimiter, chunk_size, max_record_chars), start=1):
+        record_id = index
+        if id_re is not None:
+            m = id_re.search(record)
+            if m:
+                record_id = (m.group(1) if m.groups() else m.group(0)).strip()
+        planets, scores, percentages, q_scores, q_percentages = process_text(record)
+        yield record_id, planets, scores, percentages, q_scores, q_percentages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m calc.ingest",
+        description="Score every chart in a concatenated page-3 text dump. "
+                    "Writes one JSON object per record.")
+    parser.add_argument("dump", help="text dump file ('-' for stdin)")
+    parser.add_argument("-d", "--delimiter", default="\\f",
+                        help="record delimiter; backslash escapes allowed (default: \\f)")
+    parser.add_argument("--id-pattern", default=None,
+                        help="regex whose first group is used as the record id")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    delimiter = codecs.decode(args.delimiter, "unicode_escape")
+    src = sys.stdin if args.dump == "-" else open(
+        args.dump, "r", encoding=args.encoding, errors="replace")
+    out = sys.stdout if args.output == "-" else open(
+        args.output, "w", encoding="utf-8")
+
+    count = 0
+    start = time.perf_counter()
+    try:
+        for record_id, planets, scores, percentages, q_scores, q_percentages in iter_charts(
+                src, delimiter=delimiter, id_pattern=args.id_pattern):
+            out.write(json.dumps({
+                "record_id": record_id,
+                "planets": planets,
+                "element_scores": scores,
+                "element_percentages": percentages,
+                "quality_scores": q_scores,
+                "quality_percentages": q_percentages,
+            }, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Processed {count} record(s) in {time.perf_counter() - start:.2f}s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
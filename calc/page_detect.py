@@ -0,0 +1,150 @@
+"""Locate the planet-positions page in Kepler PDFs.
+
+`extract_page3_text` assumes the positions table is on page 3. Some export
+templates move it, so this module finds it instead:
+
+1. Page 3 is checked first. If it mentions every anchor (the planet names
+   and "Asc") and its text parses into a full chart, the rest of the
+   document is never touched.
+2. Otherwise every page is scanned with `page.search_for` for the anchors,
+   stopping early once a page cannot reach `min_anchors`. Full `get_text`
+   runs only on the candidate pages that pass.
+3. Candidates are parsed and the page yielding the most placements wins
+   (ties: more anchors, then the earlier page).
+
+For large reports with many candidates the text extraction is spread over
+worker processes, each opening its own document handle. PyMuPDF does not
+support sharing documents (or running) across threads, so a process pool
+is used rather than a thread pool.
+
+Results are cached per document content hash (see `calc.pdf_cache`), so
+detection runs once per file.
+"""
+
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from calc.element_calculator import PLANET_NAMES, parse_planet_positions_robust
+
+DetectedPage = namedtuple("DetectedPage", ["page_index", "text"])
+
+DEFAULT_ANCHORS = PLANET_NAMES
+PREFERRED_PAGE = 2  # page 3, where the standard template puts the table
+
+
+def _open(pdf_path):
+    try:
+        import pymupdf  # PyMuPDF
+    except Exception as e:
+        raise RuntimeError(
+            "PyMuPDF (fitz) is required for PDF extraction: " + str(e))
+    return pymupdf.open(pdf_path)
+
+
+def _count_anchors(page, textpage, anchors, min_anchors):
+    """Number of anchors found on `page` (0 once `min_anchors` is out of reach)."""
+    hits = 0
+    for i, anchor in enumerate(anchors):
+        if page.search_for(anchor, textpage=textpage):
+            hits += 1
+        elif hits + len(anchors) - i - 1 < min_anchors:
+            return 0
+    return hits
+
+
+def _placements(text):
+    return sum(1 for sign in parse_planet_positions_robust(text).values() if sign)
+
+
+def _extract_pages(pdf_path, page_indexes):
+    """Worker: text of the given pages, with a document opened per process."""
+    with _open(pdf_path) as doc:
+        return {i: doc.load_page(i).get_text() for i in page_indexes}
+
+
+def _extract_parallel(pdf_path, page_indexes, max_workers):
+    chunks = [page_indexes[i::max_workers] for i in range(max_workers)]
+    texts = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for part in pool.map(_extract_pages, [pdf_path] * len(chunks), chunks):
+            texts.update(part)
+    return texts
+
+
+def detect_positions_page(pdf_path, anchors=DEFAULT_ANCHORS, min_anchors=6,
+                          max_workers=None, parallel_threshold=8):
+    """Find the page holding the planet-positions table.
+
+    Args:
+        anchors: Strings whose presence marks a candidate page
+            (case-insensitive).
+        min_anchors: Anchors a page needs to become a candidate.
+        max_workers: Worker processes for candidate extraction (defaults
+            to the CPU count; 1 disables parallelism).
+        parallel_threshold: Minimum number of candidates before worker
+            processes are worth starting.
+
+    Returns:
+        DetectedPage: ``(page_index, text)`` with a 0-based page index.
+
+    Raises:
+        ValueError: no page qualifies as the positions page.
+    """
+    anchors = tuple(anchors)
+    min_anchors = min(min_anchors, len(anchors))
+    with _open(pdf_path) as doc:
+        order = list(range(doc.page_count))
+        if PREFERRED_PAGE < doc.page_count:
+            order.remove(PREFERRED_PAGE)
+            order.insert(0, PREFERRED_PAGE)
+
+        candidates = {}  # page index -> anchor hits
+        texts = {}
+        for i in order:
+            page = doc.load_page(i)
+            textpage = page.get_textpage()
+            hits = _count_anchors(page, textpage, anchors, min_anchors)
+            if hits < min_anchors:
+                continue
+            candidates[i] = hits
+            if i == PREFERRED_PAGE and hits == len(anchors):
+                # fast path: standard template, the textpage is already built
+                text = page.get_text(textpage=textpage)
+                if _placements(text) == len(PLANET_NAMES):
+                    return DetectedPage(i, text)
+                texts[i] = text
+
+        if not candidates:
+            raise ValueError("No page with planet positions found in PDF.")
+
+        pending = [i for i in sorted(candidates) if i not in texts]
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(pending) >= parallel_threshold:
+            texts.update(_extract_parallel(pdf_path, pending, min(workers, len(pending))))
+        else:
+            for i in pending:
+                texts[i] = doc.load_page(i).get_text()
+
+    best = max(candidates, key=lambda i: (_placements(texts[i]), candidates[i], -i))
+    return DetectedPage(best, texts[best])
+
+
+def cached_detect_positions_page(pdf_path, cache=None, **options):
+    """`detect_positions_page` backed by the persistent extraction cache,
+    so detection runs once per document (keyed by content hash)."""
+    from calc.pdf_cache import cached_extract
+
+    kind = "positions-page"
+    # only the options that can change the answer are part of the key
+    shaping = {k: list(options[k]) if k == "anchors" else options[k]
+               for k in ("anchors", "min_anchors") if k in options}
+    if shaping:
+        kind += ":" + json.dumps(shaping, sort_keys=True)
+
+    def extract(path):
+        return json.dumps(detect_positions_page(path, **options)._asdict())
+
+    payload = json.loads(cached_extract(pdf_path, kind, extract, cache=cache))
+    return DetectedPage(payload["page_index"], payload["text"])
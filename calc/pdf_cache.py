@@ -0,0 +1,192 @@
+"""Persistent cache for text extracted from Kepler PDFs.
+
+Extraction results are stored in a small SQLite database and keyed by the
+SHA-256 of the PDF *content*, so re-uploading the same chart (even from a
+different path) or re-running a batch never has to open the PDF with
+PyMuPDF again.
+
+Hashing every file on every lookup would still read it from disk, so a
+second table remembers ``path -> (size, mtime, sha256)``. When size and
+mtime are unchanged the stored digest is trusted and the file is not read
+at all.
+
+The cache location defaults to ``~/.cache/lco`` (``%LOCALAPPDATA%\\lco`` on
+Windows) and can be changed with the ``LCO_CACHE_DIR`` environment
+variable. Set ``LCO_DISABLE_CACHE=1`` to bypass it entirely.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_FILENAME = "extract_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS extracts (
+    digest TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (digest, kind)
+);
+"""
+
+
+def default_cache_dir():
+    """Return the directory used for on-disk caches."""
+    env_dir = os.getenv("LCO_CACHE_DIR")
+    if env_dir:
+        return env_dir
+    if os.name == "nt" and os.getenv("LOCALAPPDATA"):
+        return os.path.join(os.getenv("LOCALAPPDATA"), "lco")
+    return os.path.join(os.path.expanduser("~"), ".cache", "lco")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's content, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """SQLite-backed store of extraction payloads keyed by PDF content hash.
+
+    Payloads are text, stored per ``(digest, kind)`` so several kinds of
+    extraction (e.g. ``"page3"``) can be cached for the same document.
+    Each thread gets its own connection, so one instance can be shared by
+    the GUI and worker threads; separate processes simply open the same
+    file.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(default_cache_dir(), CACHE_FILENAME)
+        self.path = path
+        self._local = threading.local()
+        # create the database eagerly so configuration errors surface here
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection (other threads keep theirs)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------
+    # Content hashing (size + mtime fast path, then SHA-256)
+    # ------------------------------------------------------
+    def file_digest(self, pdf_path):
+        """Return the content digest of `pdf_path`.
+
+        The file is only read when its size or mtime differ from the last
+        time it was seen.
+        """
+        st = os.stat(pdf_path)
+        key = os.path.abspath(pdf_path)
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?",
+            (key,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+
+        digest = file_sha256(pdf_path)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) "
+                "VALUES (?, ?, ?, ?)",
+                (key, st.st_size, st.st_mtime_ns, digest))
+        return digest
+
+    # ------------------------------------------------------
+    # Payload storage
+    # ------------------------------------------------------
+    def get(self, digest, kind):
+        """Return the cached payload or ``None``."""
+        row = self._connect().execute(
+            "SELECT payload FROM extracts WHERE digest = ? AND kind = ?",
+            (digest, kind)).fetchone()
+        return row[0] if row else None
+
+    def put(self, digest, kind, payload):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extracts (digest, kind, payload, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, kind, payload, time.time()))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM extracts")
+            conn.execute("DELETE FROM files")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Return the process-wide cache, or ``None`` when caching is disabled
+    or the cache directory is not usable."""
+    global _default_cache
+    if os.getenv("LCO_DISABLE_CACHE", "").strip() not in ("", "0"):
+        return None
+    path = os.path.join(default_cache_dir(), CACHE_FILENAME)
+    with _default_cache_lock:
+        if _default_cache is None or _default_cache.path != path:
+            try:
+                _default_cache = ExtractionCache(path)
+            except (OSError, sqlite3.Error):
+                _default_cache = None
+        return _default_cache
+
+
+def cached_extract(pdf_path, kind, extract, cache=None):
+    """Return ``extract(pdf_path)`` through the cache.
+
+    `extract` must return text. A broken cache never breaks extraction; it
+    just falls through to `extract`.
+    """
+    cache = cache if cache is not None else get_default_cache()
+    if cache is None:
+        return extract(pdf_path)
+
+    try:
+        digest = cache.file_digest(pdf_path)
+        payload = cache.get(digest, kind)
+    except sqlite3.Error:
+        return extract(pdf_path)
+    if payload is not None:
+        return payload
+
+    payload = extract(pdf_path)
+    try:
+        cache.put(digest, kind, payload)
+    except sqlite3.Error:
+        pass
+    return payload
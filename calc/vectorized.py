@@ -0,0 +1,114 @@
+"""Vectorized element/quality scoring for many charts at once.
+
+Charts are encoded as an ``(N, 8)`` int8 matrix of sign indexes (columns in
+`PLANET_NAMES` order, -1 for a missing placement) and scored in one NumPy
+pass using the sign -> element / quality / ruler tables from
+`calc.element_calculator`. Results are identical to `calculate_elements`,
+which scores one chart with the same tables.
+
+Example:
+    charts = encode_charts(planet_dicts)
+    result = score_charts(charts)
+    result.element_percentages[:, ELEMENTS.index("Fire")].mean()
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from calc.element_calculator import (
+    ASC_INDEX,
+    ELEMENTS,
+    PERCENT_TABLE,
+    PLANET_NAMES,
+    POINT_WEIGHTS,
+    QUALITIES,
+    QUALITY_PLANETS,
+    RULER_BONUS,
+    SIGN_ELEMENT,
+    SIGN_QUALITY,
+    SIGN_RULER,
+    encode_placements,
+)
+
+ChartScores = namedtuple(
+    "ChartScores",
+    ["element_scores", "element_percentages", "quality_scores", "quality_percentages"])
+
+# One-hot lookups with an extra all-zero row at the end, so a -1 (missing)
+# sign index contributes nothing without any masking.
+_ELEMENT_ONEHOT = np.zeros((len(SIGN_ELEMENT) + 1, len(ELEMENTS)), dtype=np.int16)
+_ELEMENT_ONEHOT[np.arange(len(SIGN_ELEMENT)), SIGN_ELEMENT] = 1
+_QUALITY_ONEHOT = np.zeros((len(SIGN_QUALITY) + 1, len(QUALITIES)), dtype=np.int16)
+_QUALITY_ONEHOT[np.arange(len(SIGN_QUALITY)), SIGN_QUALITY] = 1
+# Ruler column per Asc sign; a missing Asc points at a column we mask out.
+_RULER_COLUMN = np.array(SIGN_RULER + (ASC_INDEX,), dtype=np.intp)
+_WEIGHTS = np.array(POINT_WEIGHTS, dtype=np.int16)
+_QUALITY_COLUMNS = np.array(QUALITY_PLANETS, dtype=np.intp)
+
+# Percentage lookup indexed by [total, score]; the same table the per-chart
+# path uses, so results are bit-for-bit identical.
+_PERCENT = np.array(PERCENT_TABLE, dtype=np.float64)
+
+
+def encode_charts(charts):
+    """Encode an iterable of planets dicts as an ``(N, 8)`` int8 matrix."""
+    rows = [encode_placements(planets) for planets in charts]
+    if not rows:
+        return np.empty((0, len(PLANET_NAMES)), dtype=np.int8)
+    return np.array(rows, dtype=np.int8)
+
+
+def _percentages(scores):
+    totals = scores.sum(axis=1)
+    return _PERCENT[totals[:, None], scores]
+
+
+def score_charts(charts):
+    """Score an ``(N, 8)`` matrix of sign indexes in one vectorized pass.
+
+    Returns a `ChartScores` of arrays: integer scores of shape ``(N, 4)``
+    (ELEMENTS order) and ``(N, 3)`` (QUALITIES order), plus float
+    percentages of the same shapes (0 where a chart has no points).
+    """
+    charts = np.asarray(charts, dtype=np.intp)
+    if charts.ndim != 2 or charts.shape[1] != len(PLANET_NAMES):
+        raise ValueError(
+            f"expected an (N, {len(PLANET_NAMES)}) matrix, got shape {charts.shape}")
+
+    # weighted element points for every placement: (N, 8, 4) -> (N, 4)
+    element_scores = np.einsum(
+        "npe,p->ne", _ELEMENT_ONEHOT[charts], _WEIGHTS).astype(np.int64)
+
+    # ruler of the Ascendant: +2 to the element of the ruler's sign
+    rows = np.arange(len(charts))
+    asc = charts[:, ASC_INDEX]
+    ruler_sign = charts[rows, _RULER_COLUMN[asc]]
+    ruler_sign = np.where(asc >= 0, ruler_sign, -1)
+    element_scores += RULER_BONUS * _ELEMENT_ONEHOT[ruler_sign]
+
+    quality_scores = _QUALITY_ONEHOT[charts[:, _QUALITY_COLUMNS]].sum(
+        axis=1, dtype=np.int64)
+
+    return ChartScores(
+        element_scores,
+        _percentages(element_scores),
+        quality_scores,
+        _percentages(quality_scores),
+    )
+
+
+def chart_dicts(result, i):
+    """Return chart `i` of a `ChartScores` in the `calculate_elements`
+    format: ``(element_scores, element_percentages, quality_scores,
+    quality_percentages)`` dicts."""
+    def pct(names, values, scores):
+        # calculate_elements reports an int 0 when a chart has no points
+        if not scores.any():
+            return dict.fromkeys(names, 0)
+        return dict(zip(names, values.tolist()))
+
+    return (dict(zip(ELEMENTS, result.element_scores[i].tolist())),
+            pct(ELEMENTS, result.element_percentages[i], result.element_scores[i]),
+            dict(zip(QUALITIES, result.quality_scores[i].tolist())),
+            pct(QUALITIES, result.quality_percentages[i], result.quality_scores[i]))
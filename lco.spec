@@ -9,6 +9,8 @@ a = Analysis(
     datas=[
         ('images', 'images'),
         ('ui/widgets/*.html', 'ui/widgets'),
+        ('ui/widgets/report.css', 'ui/widgets'),
+        ('ai/content', 'ai/content'),
         ('template', 'template'),
     ],
     hiddenimports=[
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+# Make the project packages (calc, ai, ui) importable from the tests
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+SAMPLE_CHART = {
+    "Sun": "Leo",
+    "Moon": "Cancer",
+    "Mercury": "Virgo",
+    "Venus": "Leo",
+    "Mars": "Gemini",
+    "Jupiter": "Pisces",
+    "Saturn": "Capricorn",
+    "Asc.": "Libra",
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep on-disk caches out of the user's home directory."""
+    monkeypatch.setenv("LCO_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+
+
+@pytest.fixture
+def make_kepler_pdf(tmp_path):
+    """Factory building small Kepler-like PDFs with the positions table.
+
+    The table is written as one row per planet (name, degrees, sign) on
+    `positions_page` (0-based, page 3 by default).
+    """
+    pymupdf = pytest.importorskip("pymupdf")
+
+    def _make(name="chart.pdf", chart=None, pages=3, positions_page=2):
+        chart = SAMPLE_CHART if chart is None else chart
+        doc = pymupdf.open()
+        for i in range(pages):
+            page = doc.new_page()
+            if i != positions_page:
+                page.insert_text((72, 72), f"Interpretation text, page {i + 1}")
+                continue
+            y = 72
+            for planet, sign in chart.items():
+                page.insert_text((72, y), planet)
+                page.insert_text((200, y), "15 deg. 23 min. of")
+                page.insert_text((350, y), sign)
+                y += 16
+        path = tmp_path / name
+        doc.save(str(path))
+        doc.close()
+        return str(path)
+
+    return _make
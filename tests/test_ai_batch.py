@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("ai.complete_report")
+pytest.importorskip("docx")
+
+from ai import batch, complete_report  # noqa: E402
+from ai.backends import Backend  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ROUTINE = {"Morning": {"Diet": "07:00 oats"}, "Midday": {"Diet": "12:30 soup"},
+           "Evening": {"Diet": "18:30 rice"}, "Weekly_Addition": "Sauna"}
+
+
+class _FakeBackend(Backend):
+    model_name = "fake"
+    api_key_env = "GEMINI_API_KEY"
+    calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        return json.dumps(ROUTINE)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LCO_DISABLE_CACHE", "1")
+    backend = _FakeBackend()
+    monkeypatch.setattr(complete_report, "_backend", lambda: backend)
+    return backend
+
+
+def _write_jsonl(path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    return str(path)
+
+
+VALUES = {"fire": 20, "earth": 30, "air": 25, "water": 25,
+          "cardinal": 40, "fixed": 30, "mutable": 30}
+
+
+def test_does_not_import_pyqt():
+    code = "import sys, ai.batch; print('PyQt6' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout.strip()
+    assert out == "False"
+
+
+def test_reads_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "clients.csv"
+    csv_path.write_text("id,name,fire,earth,air,water,cardinal,fixed,mutable\n"
+                        "c1,Ann,20,30,25,25,40,30,30\n", encoding="utf-8")
+    rows = batch.read_clients(str(csv_path))
+    personal, user_input = batch.client_inputs(rows[0])
+    assert personal["name"] == "Ann"
+    assert user_input["earth"] == 30.0
+
+    jsonl = _write_jsonl(tmp_path / "clients.jsonl", [{"name": "Bo Li", **VALUES}])
+    assert batch.client_id(batch.read_clients(jsonl)[0], 7) == "00007-bo-li"
+
+
+def test_missing_values_are_rejected():
+    with pytest.raises(ValueError, match="water"):
+        batch.client_inputs({"fire": 1, "earth": 1, "air": 1,
+                             "cardinal": 1, "fixed": 1, "mutable": 1})
+
+
+def test_batch_writes_outputs_manifest_and_resumes(tmp_path, fake_model, make_kepler_pdf):
+    pdf = make_kepler_pdf()
+    clients = _write_jsonl(tmp_path / "clients.jsonl", [
+        {"id": "a", "name": "Ann", **VALUES},
+        {"id": "b", "name": "Bo", "pdf": pdf},
+        {"id": "bad", "name": "Broken", "fire": 10},
+    ])
+    out = tmp_path / "reports"
+    argv = [clients, "--out", str(out), "-j", "1", "--formats", "html,docx"]
+
+    assert batch.main(argv) == 1
+    summary = json.loads((out / batch.SUMMARY_NAME).read_text())
+    assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (2, 1, 0)
+    assert summary["failures"][0]["id"] == "bad"
+    assert set(summary["stage_mean_s"]) == {"inputs_s", "generate_s", "render_s", "export_s"}
+    for cid in ("a", "b"):
+        assert (out / f"{cid}.docx").exists()
+        assert "Ann" in (out / "a.html").read_text(encoding="utf-8")
+    assert batch.load_manifest(str(out)) == {"a", "b"}
+    calls = fake_model.calls
+
+    # second run: completed clients are skipped, the broken one is retried
+    assert batch.main(argv) == 1
+    summary = json.loads((out / batch.SUMMARY_NAME).read_text())
+    assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (0, 1, 2)
+    assert fake_model.calls == calls
+
+
+def test_routine_errors_fail_the_client(tmp_path, fake_model, monkeypatch):
+    async def broken(user_input, semaphore=None, on_section=None):
+        return {"__parse_error": True, "raw": "oops"}
+    monkeypatch.setattr(complete_report, "generate_daily_routine_async", broken)
+
+    summary = asyncio.run(batch.run_batch([{"id": "x", **VALUES}], str(tmp_path),
+                                          jobs=1, formats=("html",)))
+    assert summary["failed"] == 1
+    assert "daily routine" in summary["failures"][0]["error"]
+    assert batch.load_manifest(str(tmp_path)) == set()
+
+
+def test_a_failed_format_does_not_stop_the_others(tmp_path, fake_model, monkeypatch):
+    def broken_pdf(html, path):
+        raise OSError("cannot load library 'libpango'")
+    monkeypatch.setattr(batch, "write_report_pdf", broken_pdf)
+
+    summary = asyncio.run(batch.run_batch([{"id": "x", **VALUES}], str(tmp_path),
+                                          jobs=1, formats=("pdf", "docx")))
+    assert summary["failed"] == 1
+    failure = summary["failures"][0]
+    assert list(failure["format_errors"]) == ["pdf"]
+    assert "libpango" in failure["format_errors"]["pdf"]
+    assert failure["files"] == {"docx": str(tmp_path / "x.docx")}
+    assert (tmp_path / "x.docx").exists()
+    assert batch.load_manifest(str(tmp_path)) == set()
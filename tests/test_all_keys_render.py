@@ -2,11 +2,12 @@ import sys
 import os
 import json
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from ui.utils.report_renderer import report_template  # noqa: E402
+
 def test_all_keys_rendered():
     print("Testing that all JSON keys are rendered in HTML...")
     
@@ -45,10 +46,7 @@ def test_all_keys_rendered():
     
     # Render
     try:
-        tpl_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../ui/widgets'))
-        env = Environment(loader=FileSystemLoader(tpl_dir),
-                          autoescape=select_autoescape(['html', 'xml']))
-        template = env.get_template('report.html')
+        template = report_template()
         
         output_html = template.render(**data)
         
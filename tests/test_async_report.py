@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+complete_report = pytest.importorskip("ai.complete_report")
+from ai.backends import Backend  # noqa: E402
+
+ROUTINE = {"Morning": {"Diet": "07:00 oats"}, "Midday": {}, "Evening": {},
+           "Weekly_Addition": "Sauna"}
+
+
+class _FakeBackend(Backend):
+    """Backend that records concurrency and fails the first `failures` calls."""
+
+    model_name = "fake"
+    api_key_env = "GEMINI_API_KEY"
+
+    def __init__(self, failures=0, delay=0.01):
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    def generate(self, prompt):
+        return json.dumps(ROUTINE)
+
+    async def agenerate(self, prompt):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("503 unavailable")
+            return "```json\n" + json.dumps(ROUTINE) + "\n```"
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("LCO_DISABLE_CACHE", "1")
+    monkeypatch.setattr(complete_report, "_retry_delay", lambda attempt: 0)
+    backend = _FakeBackend()
+    monkeypatch.setattr(complete_report, "_backend", lambda: backend)
+    return backend
+
+
+def _inputs(n):
+    """`n` inputs with distinct element statuses, i.e. distinct prompts."""
+    levels = (10, 25, 40)
+    combos = [(f, e, a) for f in levels for e in levels for a in levels]
+    return [{"fire": f, "earth": e, "air": a, "water": 25,
+             "cardinal": 3, "fixed": 2, "mutable": 2} for f, e, a in combos[:n]]
+
+
+def test_async_output_matches_sync_layout(fake_model):
+    user_input = _inputs(1)[0]
+
+    sync = complete_report.generate_complete_output(user_input)
+    result = asyncio.run(complete_report.generate_complete_output_async(user_input))
+
+    assert result["Daily_Routine"] == sync["Daily_Routine"] == ROUTINE
+    for key in ("Element_Descriptions", "Element_Percentages",
+                "Modality_Descriptions", "Modalities_Percentages"):
+        assert result[key] == sync[key]
+
+
+def test_batch_is_concurrent_but_bounded(fake_model):
+    results = asyncio.run(complete_report.generate_complete_outputs_async(
+        _inputs(12), max_concurrency=3))
+
+    assert len(results) == 12
+    assert all(r["Daily_Routine"] == ROUTINE for r in results)
+    assert [r["Input"] for r in results] == _inputs(12)
+    assert fake_model.peak == 3
+
+
+def test_transient_errors_are_retried(fake_model):
+    fake_model.failures = 2
+    routine = asyncio.run(complete_report.generate_daily_routine_async(_inputs(1)[0]))
+    assert routine == ROUTINE
+    assert fake_model.calls == 3
+
+
+def test_exhausted_retries_return_error_dict(fake_model):
+    fake_model.failures = complete_report.ROUTINE_RETRIES
+    routine = asyncio.run(complete_report.generate_daily_routine_async(_inputs(1)[0]))
+    assert routine["__error"] is True
+    assert "503" in routine["error_message"]
+
+
+def test_missing_api_key_fails_every_report(fake_model, monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY")
+    results = asyncio.run(complete_report.generate_complete_outputs_async(_inputs(2)))
+    assert [r["__error"] for r in results] == [True, True]
+    assert fake_model.calls == 0
+
+
+def test_retry_delay_is_jittered():
+    delays = {round(complete_report._retry_delay(1), 6) for _ in range(20)}
+    assert len(delays) > 1
+    assert all(1.0 <= d <= 3.0 for d in delays)
+
+
+def test_identical_prompts_are_requested_once(fake_model):
+    before = complete_report.routine_flight_stats()
+    same_statuses = [dict(_inputs(1)[0], fire=fire) for fire in (5, 10, 15, 20)]
+    results = asyncio.run(complete_report.generate_complete_outputs_async(
+        same_statuses + _inputs(3)[1:]))
+
+    assert all(r["Daily_Routine"] == ROUTINE for r in results)
+    assert fake_model.calls == 3
+    stats = complete_report.routine_flight_stats()
+    assert stats["coalesced"] - before["coalesced"] == 3
+    assert stats["in_flight"] == 0
+    # coalesced callers get their own copy
+    routines = [r["Daily_Routine"] for r in results[:4]]
+    assert len({id(r) for r in routines}) == 4
+
+
+@pytest.mark.parametrize("value, expected", [("eight", "8"), ("0", "1"), ("3", "3")])
+def test_concurrency_setting_is_parsed_defensively(value, expected):
+    code = "import ai.complete_report as c; print(c.MAX_CONCURRENT_REQUESTS)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=str(Path(__file__).resolve().parents[1]),
+        env=dict(os.environ, LCO_MAX_CONCURRENT_REQUESTS=value))
+    assert result.stdout.strip() == expected
+
+
+def test_gui_gemini_key_is_not_sent_to_other_backends(fake_model, monkeypatch):
+    configured = []
+    fake_model.api_key_env = "OPENAI_API_KEY"
+    fake_model.configure = configured.append
+    monkeypatch.setenv("OPENAI_API_KEY", "openai-key")
+
+    result = asyncio.run(complete_report.generate_complete_output_async(
+        _inputs(1)[0], api_key="gui-gemini-key"))
+    assert "__error" not in result
+    assert configured == ["openai-key"]
@@ -0,0 +1,338 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ai import backends
+from ai.backends import (Backend, GeminiBackend, GeminiProvider, OpenAIBackend, StubBackend,
+                         get_backend, load_backend)
+
+
+# async clients used by _FakeModel.generate_content_async, in call order
+clients = []
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self._async_client = None
+
+    def generate_content(self, prompt):
+        return SimpleNamespace(text=f"{self.name}: {prompt}")
+
+    async def generate_content_async(self, prompt, stream=False):
+        clients.append(self._async_client)
+        if not stream:
+            return SimpleNamespace(text=f"async {self.name}: {prompt}")
+
+        async def chunks():
+            for part in ("async ", prompt):
+                yield SimpleNamespace(text=part)
+        return chunks()
+
+
+class _FakeAsyncClient:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+        self.transport = SimpleNamespace(close=self._close)
+
+    async def _close(self):
+        self.closed = True
+
+
+class _FakeSDK:
+    """Stands in for `google.generativeai`, recording configure calls."""
+
+    def __init__(self):
+        self.keys = []
+        self.client = SimpleNamespace(_client_manager=SimpleNamespace(
+            make_client=_FakeAsyncClient))
+
+    def configure(self, api_key=None):
+        self.keys.append(api_key)
+
+    def GenerativeModel(self, name):
+        return _FakeModel(name)
+
+
+@pytest.fixture
+def provider():
+    provider = GeminiProvider("test-model")
+    provider._genai = _FakeSDK()
+    provider._genai_client = provider._genai.client
+    provider._env_loaded = True
+    return provider
+
+
+# ----------------------------------------------------------
+# Gemini
+# ----------------------------------------------------------
+def test_nothing_happens_until_first_use():
+    provider = GeminiProvider()
+    assert provider._genai is None and provider._model is None
+    assert not provider._env_loaded
+
+
+def test_model_is_built_once_and_configured_from_env(provider, monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "env-key")
+    model = provider.model()
+    assert model.name == "test-model"
+    assert provider.model() is model
+    assert provider._genai.keys == ["env-key"]
+
+
+def test_configure_only_when_the_key_changes(provider):
+    provider.configure("key-a")
+    model = provider.model()
+    provider.configure("key-a")
+    assert provider.model() is model
+
+    provider.configure("key-b")
+    assert provider._genai.keys == ["key-a", "key-b"]
+    assert provider.model() is not model
+
+
+def test_async_models_are_per_event_loop(provider):
+    provider.configure("key")
+
+    async def two_lookups():
+        return provider.async_model(), provider.async_model()
+
+    first, again = asyncio.run(two_lookups())
+    second, _ = asyncio.run(two_lookups())
+    assert first is again
+    assert first is not second
+    assert first._async_client is not second._async_client
+
+
+def test_real_sdk_async_client_is_not_shared_across_loops(monkeypatch):
+    genai = pytest.importorskip("google.generativeai")
+    from google.generativeai import client as genai_client
+
+    monkeypatch.setattr(genai_client, "_client_manager", genai_client._ClientManager())
+    provider = GeminiProvider("gemini-test")
+    provider._env_loaded = True
+    provider.configure("test-key")
+
+    async def lookup():
+        model = provider.async_model()
+        assert isinstance(model, genai.GenerativeModel)
+        return model._async_client
+
+    first = asyncio.run(lookup())
+    second = asyncio.run(lookup())
+    # each loop talks through its own client, never the process-wide one
+    # (bound to the first loop that used it and broken once it closes)
+    shared = genai_client._client_manager.clients.get("generative_async")
+    assert first is not None and first is not second
+    assert shared is None or shared not in (first, second)
+
+
+def test_sdk_still_has_the_async_client_hooks():
+    # GeminiProvider.async_model relies on these private SDK attributes; this
+    # fails (instead of reports breaking) when an SDK upgrade removes them
+    genai = pytest.importorskip("google.generativeai")
+    from google.generativeai import client as genai_client
+
+    assert callable(getattr(genai_client._client_manager, "make_client", None))
+    assert hasattr(genai.GenerativeModel("gemini-test"), "_async_client")
+
+
+def test_missing_sdk_hooks_fail_clearly(provider):
+    provider.configure("key")
+    provider._genai_client = SimpleNamespace()
+
+    async def lookup():
+        return provider.async_model()
+
+    with pytest.raises(RuntimeError, match="make_client"):
+        asyncio.run(lookup())
+
+
+def test_aclose_closes_the_loops_client(provider):
+    provider.configure("key")
+
+    async def use_and_close():
+        model = provider.async_model()
+        await provider.aclose()
+        await provider.aclose()  # nothing left to close
+        return model, provider.async_model()
+
+    closed, fresh = asyncio.run(use_and_close())
+    assert closed._async_client.closed
+    assert fresh is not closed and not fresh._async_client.closed
+
+
+def test_real_sdk_async_client_can_be_closed(monkeypatch):
+    pytest.importorskip("google.generativeai")
+    from google.generativeai import client as genai_client
+
+    monkeypatch.setattr(genai_client, "_client_manager", genai_client._ClientManager())
+    backend = GeminiBackend(GeminiProvider("gemini-test"))
+    backend.provider._env_loaded = True
+    backend.configure("test-key")
+
+    async def use_and_close():
+        backend.provider.async_model()
+        await backend.aclose()
+        return len(backend.provider._async_models)
+
+    assert asyncio.run(use_and_close()) == 0
+
+
+def test_gemini_backend_uses_the_provider(provider):
+    backend = GeminiBackend(provider)
+    backend.configure("key")
+    assert backend.model_name == "test-model"
+    assert backend.generate("hi") == "test-model: hi"
+    assert asyncio.run(backend.agenerate("hi")) == "async test-model: hi"
+    assert provider._genai.keys == ["key"]
+
+
+def test_async_gemini_calls_use_the_loops_own_client(provider):
+    backend = GeminiBackend(provider)
+    backend.configure("key")
+    clients.clear()
+
+    async def both():
+        text = await backend.agenerate("a")
+        streamed = "".join([chunk async for chunk in backend.astream("b")])
+        return text, streamed
+
+    assert asyncio.run(both()) == ("async test-model: a", "async b")
+    asyncio.run(both())
+    first_loop, second_loop = clients[:2], clients[2:]
+    assert first_loop[0] is first_loop[1]
+    assert second_loop[0] is second_loop[1]
+    assert first_loop[0] is not second_loop[0]
+
+
+def test_reports_reuse_the_configured_key(provider, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    monkeypatch.setenv("GEMINI_API_KEY", "env-key")
+    monkeypatch.setattr(complete_report, "_backend", lambda: GeminiBackend(provider))
+    for _ in range(3):
+        assert complete_report._configure_api_key(" gui-key ") is None
+    assert provider._genai.keys == ["gui-key"]
+
+    for _ in range(3):
+        assert complete_report._configure_api_key(None) is None
+    assert provider._genai.keys == ["gui-key", "env-key"]
+
+
+# ----------------------------------------------------------
+# OpenAI-compatible
+# ----------------------------------------------------------
+class _FakeCompletions:
+    def __init__(self, calls):
+        self.calls = calls
+
+    def create(self, model, messages):
+        self.calls.append((model, messages))
+        return SimpleNamespace(choices=[SimpleNamespace(
+            message=SimpleNamespace(content="{}"))])
+
+
+def test_openai_backend_sends_chat_completions(monkeypatch):
+    monkeypatch.setenv("LCO_OPENAI_MODEL", "local-model")
+    backend = OpenAIBackend(base_url="http://localhost:8000/v1", api_key="k")
+    calls = []
+    client = SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions(calls)))
+    monkeypatch.setattr(backend, "client", lambda: client)
+
+    assert backend.generate("prompt") == "{}"
+    assert calls == [("local-model", [{"role": "user", "content": "prompt"}])]
+    assert backend._client_kwargs() == {"api_key": "k",
+                                        "base_url": "http://localhost:8000/v1"}
+
+
+def test_openai_aclose_closes_the_loops_client():
+    backend = OpenAIBackend(api_key="k")
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    async def use_and_close():
+        client = SimpleNamespace(close=close)
+        backend._async_clients[asyncio.get_running_loop()] = client
+        await backend.aclose()
+        return len(backend._async_clients)
+
+    assert asyncio.run(use_and_close()) == 0
+    assert closed == [True]
+
+
+# ----------------------------------------------------------
+# Stub
+# ----------------------------------------------------------
+def test_stub_is_deterministic_and_counts_calls():
+    stub = StubBackend(latency=0)
+    first = stub.generate("prompt a")
+    assert first == stub.generate("prompt a") != stub.generate("prompt b")
+    assert {"Morning", "Midday", "Evening"} <= set(json.loads(first))
+    assert stub.calls == 3
+
+
+def test_stub_templates_and_latency(tmp_path, monkeypatch):
+    template = tmp_path / "response.json"
+    template.write_text('{"id": "{tag}"}', encoding="utf-8")
+    monkeypatch.setenv("LCO_STUB_RESPONSE", str(template))
+    monkeypatch.setenv("LCO_STUB_LATENCY", "0.05")
+    stub = StubBackend()
+    assert len(json.loads(stub.generate("p"))["id"]) == 8
+
+    async def many():
+        return await asyncio.gather(*(stub.agenerate(str(i)) for i in range(20)))
+
+    start = time.perf_counter()
+    assert len(asyncio.run(many())) == 20
+    # async latency overlaps instead of adding up
+    assert time.perf_counter() - start < 0.5
+
+
+def test_default_agenerate_runs_generate():
+    class Echo(Backend):
+        def generate(self, prompt):
+            return prompt.upper()
+
+    assert asyncio.run(Echo().agenerate("hi")) == "HI"
+
+
+# ----------------------------------------------------------
+# Selection
+# ----------------------------------------------------------
+def test_load_backend_by_name_and_path():
+    assert isinstance(load_backend("stub"), StubBackend)
+    assert isinstance(load_backend("gemini"), GeminiBackend)
+    assert isinstance(load_backend("ai.backends:StubBackend"), StubBackend)
+    with pytest.raises(ValueError):
+        load_backend("nope")
+    with pytest.raises(ValueError):
+        load_backend("json:dumps")
+
+
+def test_env_selects_the_backend(monkeypatch):
+    monkeypatch.setattr(backends, "_default_backend", None)
+    monkeypatch.setenv("LCO_LLM_BACKEND", "stub")
+    stub = get_backend()
+    assert isinstance(stub, StubBackend) and get_backend() is stub
+    monkeypatch.delenv("LCO_LLM_BACKEND")
+    assert isinstance(get_backend(), GeminiBackend)
+
+
+def test_reports_run_offline_on_the_stub(monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    monkeypatch.setattr(backends, "_default_backend", None)
+    monkeypatch.setenv("LCO_LLM_BACKEND", "stub")
+    monkeypatch.setenv("LCO_DISABLE_CACHE", "1")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    user_input = {"fire": 10, "earth": 25, "air": 25, "water": 40,
+                  "cardinal": 3, "fixed": 2, "mutable": 3}
+    report = asyncio.run(complete_report.generate_complete_output_async(user_input))
+    assert "__error" not in report
+    assert set(report["Daily_Routine"]) >= {"Morning", "Midday", "Evening"}
@@ -0,0 +1,47 @@
+import json
+import random
+
+import pytest
+
+from benchmarks import run_benchmarks
+from benchmarks.synthetic import page3_text, random_chart, random_charts, write_pdf
+from calc.element_calculator import parse_planet_positions_robust, process_kepler_pdf
+
+
+def test_synthetic_rows_text_parses_back_to_chart():
+    rng = random.Random(3)
+    for chart in random_charts(50, seed=3):
+        text = page3_text(chart, rng, noise=0.5, filler_lines=10, layout="rows")
+        assert parse_planet_positions_robust(text) == chart
+
+
+def test_synthetic_text_is_deterministic_per_seed():
+    chart = random_chart(random.Random(1))
+    assert page3_text(chart, random.Random(7), noise=0.3) == \
+        page3_text(chart, random.Random(7), noise=0.3)
+
+
+def test_synthetic_pdf_round_trip(tmp_path):
+    pytest.importorskip("pymupdf")
+    chart = random_chart(random.Random(5))
+    path = write_pdf(str(tmp_path / "chart.pdf"), chart, filler_lines=5)
+    assert process_kepler_pdf(path, use_cache=False)[0] == chart
+
+
+def test_run_writes_results_and_compare_flags_regressions(tmp_path):
+    pytest.importorskip("pymupdf")
+    out = tmp_path / "results.json"
+    assert run_benchmarks.main(["run", "--sizes", "1,2", "--repeat", "1",
+                                "-o", str(out)]) == 0
+
+    current = json.loads(out.read_text())
+    assert set(current["results"]) == {
+        f"{name}/{n}" for name in run_benchmarks.BENCHMARKS for n in (1, 2)}
+    assert current["meta"]["params"]["repeat"] == 1
+
+    slower = json.loads(out.read_text())
+    for record in slower["results"].values():
+        record["best_s"] *= 2
+    rows, regressions = run_benchmarks.compare(current, slower, threshold=1.5)
+    assert len(rows) == len(current["results"])
+    assert sorted(regressions) == sorted(current["results"])
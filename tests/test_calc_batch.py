@@ -0,0 +1,57 @@
+import json
+
+from calc.batch import expand_inputs, iter_process_pdfs, main, process_one
+
+
+def test_process_one_reports_scores(make_kepler_pdf):
+    record = process_one(make_kepler_pdf())
+
+    assert record["ok"] is True
+    assert record["planets"]["Sun"] == "Leo"
+    assert record["planets"]["Asc"] == "Libra"
+    assert sum(record["element_scores"].values()) == 27
+    json.dumps(record)  # records must be JSONL-serialisable
+
+
+def test_process_one_reports_errors_instead_of_raising(make_kepler_pdf, tmp_path):
+    short = make_kepler_pdf("short.pdf", pages=2)
+    missing = str(tmp_path / "missing.pdf")
+
+    for path in (short, missing):
+        record = process_one(path)
+        assert record["ok"] is False
+        assert record["path"] == path
+        assert record["error"]
+
+
+def test_batch_streams_every_file_and_survives_failures(make_kepler_pdf):
+    good = [make_kepler_pdf(f"chart{i}.pdf") for i in range(6)]
+    bad = make_kepler_pdf("bad.pdf", pages=1)
+
+    records = list(iter_process_pdfs(good + [bad], max_workers=2, max_pending=3))
+
+    assert sorted(r["path"] for r in records) == sorted(good + [bad])
+    assert [r["path"] for r in records if not r["ok"]] == [bad]
+
+
+def test_expand_inputs_handles_dirs_globs_and_duplicates(make_kepler_pdf, tmp_path):
+    a = make_kepler_pdf("a.pdf")
+    b = make_kepler_pdf("b.pdf")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    paths = expand_inputs([str(tmp_path), str(tmp_path / "*.pdf"), a])
+
+    assert paths == [a, b]
+
+
+def test_cli_writes_jsonl(make_kepler_pdf, tmp_path):
+    make_kepler_pdf("a.pdf")
+    make_kepler_pdf("b.pdf")
+    out = tmp_path / "out.jsonl"
+
+    rc = main([str(tmp_path), "-j", "1", "-o", str(out)])
+
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert rc == 0
+    assert len(lines) == 2
+    assert all(json.loads(line)["ok"] for line in lines)
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from ai.content_pack import (DEFAULT_PACK_PATH, PACK_FORMAT, get_content_pack,
+                             load_content_pack, main)
+
+ROOT = Path(__file__).resolve().parents[1]
+PROMPTS = {"fire_low": "Low fire text", "routine_system": "System prompt"}
+DESCRIPTIONS = {"fire_low_fixed": {"fire": {"low": {"Physique": "Lean"}}}}
+
+
+def write_pack(path, **overrides):
+    data = {"format": PACK_FORMAT, "version": "test-1", "prompts": PROMPTS,
+            "descriptions": DESCRIPTIONS, **overrides}
+    raw = json.dumps(data).encode("utf-8")
+    if str(path).endswith(".gz"):
+        raw = gzip.compress(raw)
+    path.write_bytes(raw)
+    return str(path)
+
+
+def test_bundled_pack_is_valid():
+    pack = load_content_pack(DEFAULT_PACK_PATH)
+    assert pack.version
+    assert "routine_system" in pack.prompts
+    assert {"fire_low", "water_high"} <= set(pack.prompts)
+    assert {"fire_high_fixed", "mutable_description"} <= set(pack.descriptions)
+
+
+@pytest.mark.parametrize("name", ["pack.json", "pack.json.gz"])
+def test_plain_and_compressed_packs_load(tmp_path, name):
+    pack = load_content_pack(write_pack(tmp_path / name))
+    assert pack.version == "test-1"
+    assert pack.prompt("fire_low") == "Low fire text"
+    assert pack.description("fire_low_fixed") == DESCRIPTIONS["fire_low_fixed"]
+    with pytest.raises(KeyError, match="earth_low"):
+        pack.prompt("earth_low")
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"format": PACK_FORMAT + 1}, "format"),
+    ({"prompts": {"fire_low": 3}}, "prompts"),
+    ({"descriptions": {"fire_low_fixed": "not an object"}}, "fire_low_fixed"),
+])
+def test_invalid_packs_are_rejected(tmp_path, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        load_content_pack(write_pack(tmp_path / "pack.json", **overrides))
+
+
+def test_truncated_pack_is_rejected(tmp_path):
+    path = tmp_path / "pack.json"
+    path.write_text('{"format": 1, "prompts": {', encoding="utf-8")
+    with pytest.raises(ValueError, match="not valid JSON"):
+        load_content_pack(str(path))
+
+
+def test_env_override_switches_the_default_pack(tmp_path, monkeypatch):
+    bundled = get_content_pack()
+    assert get_content_pack() is bundled
+
+    monkeypatch.setenv("LCO_CONTENT_PACK", write_pack(tmp_path / "custom.json.gz"))
+    custom = get_content_pack()
+    assert custom.version == "test-1"
+    assert get_content_pack() is custom
+
+    monkeypatch.delenv("LCO_CONTENT_PACK")
+    assert get_content_pack().version == bundled.version
+
+
+def test_prompts_come_from_the_active_pack(tmp_path, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    prompts = dict(get_content_pack().prompts, routine_system="Custom system prompt")
+    monkeypatch.setenv("LCO_CONTENT_PACK", write_pack(
+        tmp_path / "pack.json", prompts=prompts,
+        descriptions=get_content_pack().descriptions))
+
+    prompt = complete_report.build_routine_prompt(
+        {"fire": 10, "earth": 25, "air": 25, "water": 40})
+    assert prompt.startswith("Custom system prompt")
+    assert prompts["fire_low"].strip() in prompt
+    assert prompts["water_high"].strip() in prompt
+    assert complete_report.ROUTINE_SYSTEM_PROMPT == "Custom system prompt"
+    with pytest.raises(AttributeError):
+        complete_report.no_such_prompt
+
+
+def test_import_does_not_read_the_pack(tmp_path):
+    # a broken pack must not break importing the module, only using it
+    pytest.importorskip("ai.complete_report")
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    code = ("import ai.content_pack as cp, ai.complete_report as cr; "
+            "assert cp._default_pack is None; "
+            "cr.build_routine_prompt({'fire': 10, 'earth': 25, 'air': 25, 'water': 25})")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=str(ROOT), env=dict(os.environ, LCO_CONTENT_PACK=str(broken)))
+    assert "AssertionError" not in result.stderr
+    assert result.returncode != 0
+    assert "not valid JSON" in result.stderr
+
+
+def test_cli_check_and_compress(tmp_path, capsys):
+    path = write_pack(tmp_path / "pack.json")
+    assert main(["check", path]) == 0
+    assert "version test-1" in capsys.readouterr().out
+
+    assert main(["compress", path]) == 0
+    assert load_content_pack(path + ".gz").prompts == PROMPTS
@@ -0,0 +1,70 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+complete_report = pytest.importorskip("ai.complete_report")
+
+LOW_FIRE = {"fire": 10, "earth": 25, "air": 25, "water": 40,
+            "cardinal": 3, "fixed": 2, "mutable": 3}
+
+
+def test_registry_is_parsed_once_and_read_only():
+    registry = complete_report.description_registry()
+    assert complete_report.description_registry() is registry
+    entry = registry["elements"][("Fire", "Low")]
+    with pytest.raises(TypeError):
+        entry["Status"] = "Low"
+    with pytest.raises(TypeError):
+        entry.update(Status="Low")
+    with pytest.raises(TypeError):
+        entry["fire"].pop("low")
+
+
+def test_callers_get_independent_copies():
+    first = complete_report.build_descriptions_json(LOW_FIRE)
+    first["Fire"]["Status"] = "tampered"
+    first["Fire"]["extra"] = 1
+
+    second = complete_report.build_descriptions_json(LOW_FIRE)
+    assert second["Fire"]["Status"] == "Low"
+    assert "extra" not in second["Fire"]
+    assert "Status" not in complete_report.description_registry()["elements"][("Fire", "Low")]
+    # nested content is shared, not re-parsed
+    assert first["Fire"]["fire"] is second["Fire"]["fire"]
+
+
+def test_output_matches_the_json_constants():
+    result = complete_report.build_descriptions_json(LOW_FIRE)
+    expected = json.loads(complete_report.fire_low_fixed)
+    expected.update(Status="Low", Percentage=10.0)
+    assert json.loads(json.dumps(result["Fire"])) == expected
+    assert result["Earth"] == {"Content": "Earth appears balanced based on the input.",
+                               "Status": "Balanced", "Percentage": 25.0}
+
+    modalities = complete_report.build_modality_descriptions(LOW_FIRE)
+    assert set(modalities) == {"Cardinal", "Mutable"}
+    assert modalities["Cardinal"] == json.loads(complete_report.cardinal_description)
+
+
+def test_frozen_entries_copy_and_pickle():
+    entry = complete_report.description_registry()["modalities"]["Fixed"]
+    assert type(copy.copy(entry)) is dict
+    deep = copy.deepcopy(entry)
+    deep["Fixed_Energy"] = None  # deep copies are fully mutable
+    restored = pickle.loads(pickle.dumps(entry))
+    assert restored == entry and isinstance(restored, complete_report.FrozenDict)
+
+
+def test_missing_description_fails_loudly(tmp_path, monkeypatch):
+    from ai.content_pack import get_content_pack
+
+    pack = get_content_pack()
+    descriptions = {k: v for k, v in pack.descriptions.items() if k != "air_low_fixed"}
+    path = tmp_path / "pack.json"
+    path.write_text(json.dumps({"format": 1, "version": "test", "prompts": pack.prompts,
+                                "descriptions": descriptions}), encoding="utf-8")
+    monkeypatch.setenv("LCO_CONTENT_PACK", str(path))
+    with pytest.raises(ValueError, match="air_low_fixed"):
+        complete_report.build_descriptions_json(LOW_FIRE)
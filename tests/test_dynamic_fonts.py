@@ -1,10 +1,11 @@
 import sys
 import os
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from ui.utils.report_renderer import report_template  # noqa: E402
+
 def test_dynamic_fonts():
     print("Testing dynamic font rendering...")
     
@@ -24,10 +25,7 @@ def test_dynamic_fonts():
     
     # Render
     try:
-        tpl_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../ui/widgets'))
-        env = Environment(loader=FileSystemLoader(tpl_dir),
-                          autoescape=select_autoescape(['html', 'xml']))
-        template = env.get_template('report.html')
+        template = report_template()
         
         output_html = template.render(**data)
         
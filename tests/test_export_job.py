@@ -0,0 +1,122 @@
+import concurrent.futures
+
+import pytest
+
+pytest.importorskip("PyQt6.QtCore")
+
+from PyQt6.QtCore import QCoreApplication, QThreadPool  # noqa: E402
+
+from ui.utils.pdf_service import PHASES, ExportCancelled  # noqa: E402
+from ui.widgets import export_job  # noqa: E402
+from ui.widgets.export_job import ExportJob  # noqa: E402
+
+
+class _FakePdfService:
+    """Runs `submit_report` inline, honouring progress and cancel."""
+
+    def __init__(self, cancel_at=None):
+        self.cancel_at = cancel_at
+
+    def submit_report(self, data, pdf_path, progress=None, cancel=None):
+        future = concurrent.futures.Future()
+        future.set_running_or_notify_cancel()
+        try:
+            for phase in PHASES:
+                if phase == self.cancel_at:
+                    cancel.set()
+                if cancel.is_set():
+                    raise ExportCancelled(phase)
+                progress(phase)
+            with open(pdf_path, "wb") as f:
+                f.write(b"%PDF")
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(pdf_path)
+        return future
+
+
+def _record(job):
+    events = []
+    job.signals.progress.connect(lambda fmt, phase: events.append(("progress", fmt, phase)))
+    job.signals.file_ready.connect(lambda fmt, path: events.append(("ready", fmt)))
+    job.signals.failed.connect(lambda fmt, error: events.append(("failed", fmt)))
+    job.signals.cancelled.connect(lambda: events.append(("cancelled",)))
+    job.signals.finished.connect(lambda: events.append(("finished",)))
+    return events
+
+
+@pytest.fixture
+def pdf_service(monkeypatch):
+    service = _FakePdfService()
+    monkeypatch.setattr(export_job, "get_pdf_service", lambda: service)
+    return service
+
+
+@pytest.fixture
+def docx_calls(monkeypatch):
+    calls = []
+
+    def write(data, path):
+        calls.append(path)
+        open(path, "wb").close()
+        return path
+    monkeypatch.setattr(export_job, "write_report_docx", write)
+    return calls
+
+
+def test_phases_are_reported_and_files_announced_in_order(pdf_service, docx_calls, tmp_path):
+    job = ExportJob({}, {"pdf": str(tmp_path / "r.pdf"), "docx": str(tmp_path / "r.docx")})
+    events = _record(job)
+    job.run()
+    assert events == [("progress", "pdf", "render"), ("progress", "pdf", "layout"),
+                      ("progress", "pdf", "write"), ("ready", "pdf"),
+                      ("progress", "docx", "write"), ("ready", "docx"), ("finished",)]
+
+
+def test_cancel_stops_between_phases(pdf_service, docx_calls, tmp_path):
+    pdf_service.cancel_at = "write"
+    job = ExportJob({}, {"pdf": str(tmp_path / "r.pdf"), "docx": str(tmp_path / "r.docx")})
+    events = _record(job)
+    job.run()
+    assert events[-2:] == [("cancelled",), ("finished",)]
+    assert ("ready", "pdf") not in events
+    assert not (tmp_path / "r.pdf").exists() and docx_calls == []
+
+
+def test_a_failed_format_does_not_stop_the_others(pdf_service, docx_calls, tmp_path):
+    job = ExportJob({}, {"pdf": str(tmp_path / "missing" / "r.pdf"),
+                         "docx": str(tmp_path / "r.docx")})
+    events = _record(job)
+    job.run()
+    assert ("failed", "pdf") in events and ("ready", "docx") in events
+
+
+def test_signals_reach_the_gui_thread_from_the_pool(pdf_service, docx_calls, tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    job = ExportJob({}, {"docx": str(tmp_path / "r.docx")})
+    events = _record(job)
+    job.start()
+    assert QThreadPool.globalInstance().waitForDone(5000)
+    app.processEvents()
+    assert events[-2:] == [("ready", "docx"), ("finished",)]
+
+
+def test_html_fallback_is_rendered_only_when_the_pdf_fails(pdf_service, monkeypatch, tmp_path):
+    renders = []
+    monkeypatch.setattr(export_job, "render_report_html",
+                        lambda data: renders.append(data) or "<html>report</html>")
+    fallbacks = []
+
+    job = ExportJob({"n": 1}, {"pdf": str(tmp_path / "r.pdf")}, html_fallback=True)
+    job.signals.html_fallback.connect(lambda error, html: fallbacks.append(html))
+    job.run()
+    assert renders == [] and fallbacks == []
+
+    job = ExportJob({"n": 2}, {"pdf": str(tmp_path / "missing" / "r.pdf")},
+                    html_fallback=True)
+    job.signals.html_fallback.connect(lambda error, html: fallbacks.append(html))
+    events = _record(job)
+    job.run()
+    assert renders == [{"n": 2}] and fallbacks == ["<html>report</html>"]
+    assert ("failed", "pdf") in events
@@ -0,0 +1,47 @@
+"""Startup guard: importing the report modules must stay cheap.
+
+Runs ``python -X importtime`` in a fresh interpreter and fails when a heavy
+dependency (the Gemini SDK and its gRPC/protobuf stack) is imported eagerly
+again, or when the import blows through a generous time budget.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+# modules that must only be imported when a report is actually generated
+DEFERRED_MODULES = ("google.generativeai", "grpc", "google.protobuf", "google.api_core",
+                    "dotenv")
+IMPORT_BUDGET_US = int(os.getenv("LCO_IMPORT_BUDGET_US", "500000"))
+
+
+def import_times(module):
+    """``{module: cumulative microseconds}`` for a fresh ``import module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=str(ROOT), check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # the header line
+    return times
+
+
+@pytest.mark.parametrize("module", ["ai.complete_report", "ai.batch"])
+def test_import_defers_heavy_dependencies(module):
+    times = import_times(module)
+    assert module in times
+    eager = sorted(name for name in times
+                   if any(name == m or name.startswith(m + ".") for m in DEFERRED_MODULES))
+    assert not eager, f"importing {module} pulled in {eager}"
+    assert times[module] < IMPORT_BUDGET_US, (
+        f"importing {module} took {times[module] / 1000:.1f} ms")
@@ -0,0 +1,80 @@
+import io
+import json
+
+import pytest
+
+from calc.ingest import iter_charts, iter_records, main
+
+
+def chart_text(client, sun, asc):
+    return (f"Client: {client}\n"
+            f"Sun position is 17 deg. 12 min. of {sun}\n"
+            f"Asc. position is 18 deg. 10 min. of {asc}\n")
+
+
+class CountingReader(io.StringIO):
+    """StringIO that records the largest read request."""
+    max_request = 0
+
+    def read(self, size=-1):
+        self.max_request = max(self.max_request, size)
+        return super().read(size)
+
+
+def test_records_split_across_chunk_boundaries():
+    text = "one\n<<END>>\ntwo\n<<END>>\nthree"
+    for chunk_size in (1, 2, 3, 5, 64):
+        records = list(iter_records(io.StringIO(text), "<<END>>", chunk_size=chunk_size))
+        assert [r.strip() for r in records] == ["one", "two", "three"]
+
+
+def test_many_records_per_chunk_match_a_plain_split():
+    text = "<<END>>".join(f"record {i}" for i in range(500))
+    for chunk_size in (4, 7, 100, 1 << 16):
+        records = list(iter_records(io.StringIO(text), "<<END>>", chunk_size=chunk_size))
+        assert records == text.split("<<END>>")
+
+
+def test_blank_records_are_skipped():
+    assert list(iter_records(io.StringIO("\fa\f\f  \fb\f"))) == ["a", "b"]
+
+
+def test_iter_charts_yields_ids_and_scores():
+    dump = "\f".join([chart_text("C-001", "Leo", "Aries"),
+                      chart_text("C-002", "Pisces", "Cancer")])
+    results = list(iter_charts(io.StringIO(dump), id_pattern=r"Client: (\S+)"))
+
+    assert [r[0] for r in results] == ["C-001", "C-002"]
+    assert results[0][1]["Sun"] == "Leo"
+    assert results[1][1]["Asc"] == "Cancer"
+    assert results[0][2]["Fire"] == 8  # Sun + Asc in fire signs
+
+
+def test_iter_charts_reads_in_bounded_chunks():
+    dump = "\f".join(chart_text(i, "Leo", "Aries") for i in range(200))
+    reader = CountingReader(dump)
+
+    results = iter_charts(reader, chunk_size=256)
+    assert next(results)[0] == 1
+    assert reader.tell() < 1024  # first chart yielded long before the end
+    assert sum(1 for _ in results) == 199
+    assert reader.max_request == 256
+
+
+def test_runaway_record_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_records(io.StringIO("x" * 1000), "\f", chunk_size=100,
+                          max_record_chars=500))
+
+
+def test_cli_writes_jsonl(tmp_path):
+    dump = tmp_path / "dump.txt"
+    dump.write_text("\n=====\n".join(chart_text(i, "Virgo", "Leo") for i in range(3)),
+                    encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+
+    assert main([str(dump), "-d", "\\n=====\\n", "-o", str(out)]) == 0
+
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["record_id"] for r in rows] == [1, 2, 3]
+    assert rows[0]["planets"]["Sun"] == "Virgo"
@@ -0,0 +1,64 @@
+import json
+import random
+
+from ai.json_stream import StreamingObjectParser
+
+ROUTINE = {
+    "Morning": {"Diet": "Warm oats, \"slowly\"", "Exercise": ["walk", 20]},
+    "Midday": {"Diet": "Soup", "Rest": None},
+    "Evening": {"Diet": "Tea", "Sleep": 22.5, "Screens": False},
+    "Weekly_Addition": "Sauna",
+}
+
+
+def _feed_in_chunks(text, size):
+    parser = StreamingObjectParser()
+    completed = []
+    for i in range(0, len(text), size):
+        completed += parser.feed(text[i:i + size])
+    return parser, completed
+
+
+def test_sections_are_reported_in_order_as_they_complete():
+    text = "```json\n" + json.dumps(ROUTINE, indent=2) + "\n```"
+    for size in (1, 7, 64, len(text)):
+        parser, completed = _feed_in_chunks(text, size)
+        assert completed == list(ROUTINE.items())
+        assert parser.done and parser.value() == ROUTINE
+
+
+def test_random_chunking_matches_json_loads():
+    rng = random.Random(0)
+    text = json.dumps(ROUTINE)
+    for _ in range(50):
+        parser = StreamingObjectParser()
+        pos, completed = 0, []
+        while pos < len(text):
+            step = rng.randint(1, 12)
+            completed += parser.feed(text[pos:pos + step])
+            pos += step
+        assert dict(completed) == ROUTINE
+
+
+def test_section_is_not_reported_before_it_closes():
+    parser = StreamingObjectParser()
+    assert parser.feed('{"Morning": {"Diet": "Oats"') == []
+    assert parser.feed('}, "Midday"') == [("Morning", {"Diet": "Oats"})]
+
+
+def test_every_truncation_repairs_to_an_object():
+    text = json.dumps(ROUTINE)
+    for end in range(1, len(text)):
+        parser = StreamingObjectParser()
+        parser.feed(text[:end])
+        repaired = parser.repair()
+        assert isinstance(repaired, dict)
+        for key, value in parser.members.items():
+            assert repaired[key] == value
+
+
+def test_repair_keeps_a_cut_off_section():
+    parser = StreamingObjectParser()
+    parser.feed('{"Morning": {"Diet": "Oats"}, "Midday": {"Diet": "So')
+    assert parser.repair() == {"Morning": {"Diet": "Oats"}, "Midday": {"Diet": "So"}}
+    assert StreamingObjectParser().repair() is None
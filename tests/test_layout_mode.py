@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from calc.element_calculator import (
+    cluster_rows,
+    parse_planet_positions_layout,
+    process_kepler_pdf,
+)
+
+DOCS_KEPLER = os.path.join(os.path.dirname(__file__), '..', 'docs', 'kepler.pdf')
+
+
+def word(x, y, text, h=12.0):
+    return (x, y, x + 8 * len(text), y + h, text)
+
+
+def test_cluster_rows_groups_by_baseline_and_sorts_columns():
+    words = [word(300, 100.5, "Leo"), word(50, 100, "Sun"),
+             word(50, 114, "Moon"), word(300, 113.6, "Cancer")]
+    rows = cluster_rows(words)
+    assert [[w[4] for w in row] for row in rows] == [["Sun", "Leo"], ["Moon", "Cancer"]]
+
+
+def test_layout_parser_reads_sign_from_the_planet_row_only():
+    words = [
+        word(50, 100, "Sun"), word(120, 100, "position"), word(300, 100, "Virgo"),
+        word(50, 114, "Moon"), word(120, 114, "position"),  # sign missing
+        word(50, 128, "Asc."), word(300, 128, "Cancer"),
+        word(50, 142, "Uranus"), word(300, 142, "Aries"),
+    ]
+    planets = parse_planet_positions_layout(words)
+    assert planets["Sun"] == "Virgo"
+    assert planets["Asc"] == "Cancer"
+    # no nearest-line guessing: Moon's row has no sign
+    assert planets["Moon"] is None
+
+
+def test_layout_mode_on_synthetic_pdf(make_kepler_pdf):
+    planets, scores, *_ = process_kepler_pdf(make_kepler_pdf(), mode="layout")
+    assert planets == {"Sun": "Leo", "Moon": "Cancer", "Asc": "Libra", "Mercury": "Virgo",
+                       "Venus": "Leo", "Mars": "Gemini", "Jupiter": "Pisces",
+                       "Saturn": "Capricorn"}
+    assert sum(scores.values()) == 27
+
+
+def test_layout_mode_reads_kepler_fixture():
+    pytest.importorskip("pymupdf")
+    planets, *_ = process_kepler_pdf(DOCS_KEPLER, mode="layout")
+    assert planets == {"Sun": "Virgo", "Moon": "Pisces", "Asc": "Cancer", "Mercury": "Virgo",
+                       "Venus": "Virgo", "Mars": "Pisces", "Jupiter": "Virgo",
+                       "Saturn": "Cancer"}
+
+
+def test_unknown_mode_is_rejected(make_kepler_pdf):
+    with pytest.raises(ValueError):
+        process_kepler_pdf(make_kepler_pdf(), mode="ocr")
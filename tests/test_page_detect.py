@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from calc import page_detect
+from calc.element_calculator import process_kepler_pdf
+from calc.page_detect import cached_detect_positions_page, detect_positions_page
+from calc.pdf_cache import ExtractionCache
+
+from conftest import SAMPLE_CHART
+
+EXPECTED = {planet.rstrip("."): sign for planet, sign in SAMPLE_CHART.items()}
+KEPLER_PDF = os.path.join(os.path.dirname(__file__), "..", "docs", "kepler.pdf")
+
+
+def test_detects_table_on_later_page(make_kepler_pdf):
+    pdf = make_kepler_pdf(pages=6, positions_page=4)
+
+    detected = detect_positions_page(pdf)
+
+    assert detected.page_index == 4
+    planets = process_kepler_pdf(pdf, mode="detect", use_cache=False)[0]
+    assert planets == EXPECTED
+
+
+def test_page3_fast_path_skips_other_pages(make_kepler_pdf, monkeypatch):
+    pdf = make_kepler_pdf(pages=5)
+    calls = []
+    monkeypatch.setattr(page_detect, "_count_anchors",
+                        _counting(page_detect._count_anchors, calls))
+
+    assert detect_positions_page(pdf).page_index == 2
+    assert len(calls) == 1
+
+
+def test_no_candidate_page_raises(make_kepler_pdf):
+    pdf = make_kepler_pdf(pages=2, positions_page=None)
+    with pytest.raises(ValueError):
+        detect_positions_page(pdf)
+
+
+def test_parallel_extraction_matches_serial(make_kepler_pdf):
+    pdf = make_kepler_pdf(pages=6, positions_page=5)
+
+    serial = detect_positions_page(pdf, max_workers=1)
+    parallel = detect_positions_page(pdf, max_workers=2, parallel_threshold=1)
+
+    assert parallel == serial
+    assert parallel.page_index == 5
+
+
+def test_cached_detection_runs_once(make_kepler_pdf, tmp_path, monkeypatch):
+    pdf = make_kepler_pdf(pages=4, positions_page=3)
+    cache = ExtractionCache(str(tmp_path / "extracts.sqlite3"))
+    calls = []
+    monkeypatch.setattr(page_detect, "detect_positions_page",
+                        _counting(page_detect.detect_positions_page, calls))
+
+    first = cached_detect_positions_page(pdf, cache=cache)
+    second = cached_detect_positions_page(pdf, cache=cache)
+
+    assert first == second
+    assert first.page_index == 3
+    assert len(calls) == 1
+
+
+@pytest.mark.skipif(not os.path.exists(KEPLER_PDF), reason="sample PDF missing")
+def test_kepler_sample_positions_page():
+    pytest.importorskip("pymupdf")
+    assert detect_positions_page(KEPLER_PDF).page_index == 2
+
+
+def _counting(func, calls):
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return func(*args, **kwargs)
+    return wrapper
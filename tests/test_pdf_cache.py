@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import pytest
+
+import calc.element_calculator as ec
+from calc.pdf_cache import ExtractionCache, file_sha256, get_default_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ExtractionCache(str(tmp_path / "cache.sqlite3"))
+    yield c
+    c.close()
+
+
+@pytest.fixture
+def count_extractions(monkeypatch):
+    calls = []
+    real = ec.extract_page3_text
+
+    def counting(pdf_path):
+        calls.append(pdf_path)
+        return real(pdf_path)
+
+    monkeypatch.setattr(ec, "extract_page3_text", counting)
+    return calls
+
+
+def test_extract_page3_text_rejects_short_pdf(make_kepler_pdf):
+    with pytest.raises(ValueError):
+        ec.extract_page3_text(make_kepler_pdf(pages=2))
+
+
+def test_cache_serves_repeat_extraction_without_pymupdf(make_kepler_pdf, cache,
+                                                         count_extractions):
+    path = make_kepler_pdf()
+
+    first = ec.cached_extract_page3_text(path, cache=cache)
+    second = ec.cached_extract_page3_text(path, cache=cache)
+
+    assert first == second
+    assert "Leo" in first
+    assert count_extractions == [path]
+
+
+def test_cache_is_keyed_by_content_not_path(make_kepler_pdf, cache,
+                                            count_extractions, tmp_path):
+    path = make_kepler_pdf()
+    copy = str(tmp_path / "re-uploaded.pdf")
+    shutil.copyfile(path, copy)
+
+    ec.cached_extract_page3_text(path, cache=cache)
+    ec.cached_extract_page3_text(copy, cache=cache)
+
+    assert count_extractions == [path]
+    assert cache.file_digest(copy) == file_sha256(path)
+
+
+def test_changed_file_is_rehashed(make_kepler_pdf, cache, count_extractions):
+    path = make_kepler_pdf(chart={"Sun": "Leo"})
+    ec.cached_extract_page3_text(path, cache=cache)
+
+    # overwrite with a different chart and bump mtime
+    make_kepler_pdf(chart={"Sun": "Aries"})
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert "Aries" in ec.cached_extract_page3_text(path, cache=cache)
+    assert len(count_extractions) == 2
+
+
+def test_extraction_errors_are_not_cached(make_kepler_pdf, cache):
+    path = make_kepler_pdf(pages=1)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            ec.cached_extract_page3_text(path, cache=cache)
+    assert cache.get(cache.file_digest(path), "page3") is None
+
+
+def test_default_cache_can_be_disabled(monkeypatch):
+    assert get_default_cache() is not None
+    monkeypatch.setenv("LCO_DISABLE_CACHE", "1")
+    assert get_default_cache() is None
@@ -0,0 +1,106 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ui.utils.pdf_service import PdfRenderService
+
+
+class _FakeWeasyPrint:
+    """Stands in for `weasyprint`, recording what the service asks of it."""
+
+    def __init__(self):
+        self.parsed = []
+        self.rendered = []
+        self.threads = set()
+
+    def CSS(self, filename, font_config, url_fetcher):
+        self.parsed.append(filename)
+        return SimpleNamespace(filename=filename)
+
+    def HTML(self, string, base_url, url_fetcher):
+        fake = self
+
+        class _Document:
+            def render(self, stylesheets, font_config):
+                fake.threads.add(threading.get_ident())
+                fake.rendered.append((string, stylesheets, font_config))
+                return SimpleNamespace(write_pdf=lambda path: open(path, "wb").write(b"%PDF"))
+        return _Document()
+
+
+class _Service(PdfRenderService):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loads = 0
+
+    def _load(self):
+        if self._weasyprint is None:
+            self.loads += 1
+            self._weasyprint = _FakeWeasyPrint()
+            self._font_config = object()
+
+
+@pytest.fixture
+def service(tmp_path):
+    css = tmp_path / "report.css"
+    css.write_text("body { color: black; }", encoding="utf-8")
+    service = _Service(css)
+    yield service
+    service.shutdown()
+
+
+def test_weasyprint_and_stylesheet_are_loaded_once(service, tmp_path):
+    assert service.warm_up().result(timeout=5)
+    paths = [service.submit("<p>report</p>", str(tmp_path / f"{i}.pdf")) for i in range(3)]
+    assert [f.result(timeout=5) for f in paths] == [str(tmp_path / f"{i}.pdf") for i in range(3)]
+
+    fake = service._weasyprint
+    assert service.loads == 1
+    assert fake.parsed == [service.stylesheet_path]
+    assert len(fake.threads) == 1 and threading.get_ident() not in fake.threads
+    # the shared stylesheet and font configuration go to every render
+    assert {id(r[1][0]) for r in fake.rendered} == {id(service._stylesheet)}
+    assert {id(r[2]) for r in fake.rendered} == {id(service._font_config)}
+
+
+def test_inline_styles_are_not_doubled(service, tmp_path):
+    service.submit("<style>p {}</style><p>x</p>", str(tmp_path / "a.pdf")).result(timeout=5)
+    assert service._weasyprint.rendered[0][1] == []
+
+
+def test_stylesheet_is_reparsed_when_it_changes(service, tmp_path):
+    service.warm_up().result(timeout=5)
+    css = tmp_path / "report.css"
+    css.write_text("body { color: red; }", encoding="utf-8")
+    st = css.stat()
+    os.utime(css, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    service.submit("<p>x</p>", str(tmp_path / "a.pdf")).result(timeout=5)
+    assert len(service._weasyprint.parsed) == 2
+
+
+def test_reports_are_rendered_on_the_worker(service, tmp_path):
+    pdf = service.submit_report({"Element_Percentages": {"Fire": 37}}, str(tmp_path / "r.pdf"))
+    assert pdf.result(timeout=5) == str(tmp_path / "r.pdf")
+    html, stylesheets, _ = service._weasyprint.rendered[0]
+    assert "37%" in html and "<style" not in html
+    assert stylesheets == [service._stylesheet]
+
+
+def test_errors_reach_the_caller_and_the_worker_keeps_going(service, tmp_path):
+    bad = service.submit("<p>x</p>", str(tmp_path / "missing" / "a.pdf"))
+    with pytest.raises(OSError):
+        bad.result(timeout=5)
+    assert service.submit("<p>x</p>", str(tmp_path / "b.pdf")).result(timeout=5)
+
+
+def test_missing_weasyprint_fails_the_job_not_the_service(tmp_path):
+    class Broken(PdfRenderService):
+        def _load(self):
+            raise OSError("cannot load library 'libpango'")
+
+    service = Broken(tmp_path / "report.css")
+    with pytest.raises(OSError):
+        service.warm_up().result(timeout=5)
+    service.shutdown()
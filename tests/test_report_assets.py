@@ -0,0 +1,131 @@
+import base64
+import os
+
+import pytest
+
+from ui.utils import report_assets
+from ui.utils.report_assets import AssetCache, asset_url_fetcher, report_image_sources
+from ui.utils.report_renderer import render_report_html
+
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    """A private images directory (./images) and asset cache."""
+    (tmp_path / "images").mkdir()
+    for name in report_assets.REPORT_IMAGES.values():
+        (tmp_path / "images" / name).write_bytes(b"\x89PNG" + name.encode())
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(report_assets, "PACKAGE_IMAGE_DIR", tmp_path / "no-images")
+    monkeypatch.setattr(report_assets, "asset_cache", AssetCache())
+    monkeypatch.setenv("LCO_PRINT_DPI", "0")  # these are not real images
+    return tmp_path / "images"
+
+
+def test_each_image_is_read_once(images):
+    for _ in range(3):
+        sources = report_image_sources("inline")
+    assert report_assets.asset_cache.reads == 3
+    assert sources["logo_src"] == "data:image/png;base64," + base64.b64encode(
+        b"\x89PNGlogo.png").decode()
+
+
+def test_changed_images_are_reloaded(images):
+    cache = report_assets.asset_cache
+    logo = images / "logo.png"
+    assert cache.read(logo) == b"\x89PNGlogo.png"
+    logo.write_bytes(b"new logo")
+    st = logo.stat()
+    os.utime(logo, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.read(logo) == b"new logo"
+    assert cache.reads == 2
+
+
+def test_file_and_fetch_modes_reference_the_images(images):
+    files = report_image_sources("file")
+    assert files["human_src"] == (images / "human.png").resolve().as_uri()
+
+    fetched = report_image_sources("fetch")
+    assert fetched["human_src"] == "lco-asset:human.png"
+    response = asset_url_fetcher(fetched["human_src"])
+    assert response["string"] == b"\x89PNGhuman.png"
+    assert response["mime_type"] == "image/png"
+
+    with pytest.raises(ValueError):
+        report_image_sources("bogus")
+
+
+def test_missing_images_are_left_out(images):
+    (images / "logo.png").unlink()
+    assert report_image_sources("fetch")["logo_src"] is None
+
+
+def test_referenced_images_shrink_the_html():
+    inline = render_report_html({})
+    fetched = render_report_html({}, assets="fetch")
+    assert "data:image/png;base64," in inline
+    assert "lco-asset:human.png" in fetched and "base64," not in fetched
+    assert len(fetched) * 10 < len(inline)
+
+
+# ----------------------------------------------------------
+# Print derivatives
+# ----------------------------------------------------------
+@pytest.fixture
+def photos(tmp_path, monkeypatch):
+    """Real (noisy, so compressible only by resizing) source images."""
+    Image = pytest.importorskip("PIL.Image")
+    images = tmp_path / "images"
+    images.mkdir()
+    Image.effect_noise((1800, 300), 64).convert("RGBA").save(images / "coverimage.png")
+    logo = Image.effect_noise((400, 100), 64).convert("RGBA")
+    logo.putalpha(Image.new("L", logo.size, 128))
+    logo.save(images / "logo.png")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(report_assets, "PACKAGE_IMAGE_DIR", tmp_path / "no-images")
+    monkeypatch.setattr(report_assets, "derivatives", report_assets.DerivativeBuilder())
+    monkeypatch.delenv("LCO_PRINT_DPI", raising=False)
+    return images
+
+
+def test_derivatives_are_print_sized_and_content_addressed(photos):
+    from PIL import Image
+
+    cover = report_assets.resolve_image("coverimage.png")
+    assert cover.suffix == ".jpg" and cover.parent.name == "assets"
+    assert cover.stat().st_size < (photos / "coverimage.png").stat().st_size
+    with Image.open(cover) as im:
+        assert im.width == round(550 * 300 / 96)
+
+    # transparency is kept
+    logo = report_assets.resolve_image("logo.png")
+    assert logo.suffix == ".png"
+    with Image.open(logo) as im:
+        assert im.mode == "RGBA" and im.width == round(120 * 300 / 96)
+
+    # a new process finds the build instead of re-encoding it
+    report_assets.derivatives.clear()
+    mtime = cover.stat().st_mtime_ns
+    assert report_assets.resolve_image("coverimage.png") == cover
+    assert cover.stat().st_mtime_ns == mtime
+
+
+def test_derivatives_follow_source_and_settings(photos, monkeypatch):
+    from PIL import Image
+
+    first = report_assets.resolve_image("coverimage.png")
+    monkeypatch.setenv("LCO_PRINT_DPI", "150")
+    assert report_assets.resolve_image("coverimage.png") != first
+
+    Image.effect_noise((1760, 300), 32).convert("RGB").save(photos / "coverimage.png")
+    st = (photos / "coverimage.png").stat()
+    os.utime(photos / "coverimage.png", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert report_assets.resolve_image("coverimage.png") != first
+
+    monkeypatch.setenv("LCO_PRINT_DPI", "0")
+    assert report_assets.resolve_image("coverimage.png") == (photos / "coverimage.png").resolve()
+
+
+def test_fetched_derivatives_have_their_own_type(photos):
+    response = asset_url_fetcher(report_image_sources("fetch")["cover_image_src"])
+    assert response["mime_type"] == "image/jpeg"
+    assert response["string"][:2] == b"\xff\xd8"
@@ -1,12 +1,8 @@
-import os
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from ui.utils.report_renderer import report_template
 
 
 def load_template():
-    tpl_dir = os.path.join(os.path.dirname(__file__), '..', 'ui', 'widgets')
-    env = Environment(loader=FileSystemLoader(tpl_dir),
-                      autoescape=select_autoescape(['html', 'xml']))
-    return env.get_template('report.html')
+    return report_template()
 
 
 def sample_payload():
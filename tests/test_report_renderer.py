@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from ui.utils import report_renderer
+from ui.utils.report_renderer import report_environment, report_template, reset_report_environment
+
+
+@pytest.fixture
+def fresh_environment():
+    reset_report_environment()
+    yield
+    reset_report_environment()
+
+
+def test_environment_and_template_are_shared(fresh_environment):
+    assert report_environment() is report_environment()
+    assert report_template() is report_template()
+
+
+def test_compiled_template_is_cached_on_disk(fresh_environment, monkeypatch, tmp_path):
+    monkeypatch.setenv("LCO_CACHE_DIR", str(tmp_path))
+    report_template()
+    assert os.listdir(tmp_path / "jinja")
+
+    # a new process (here: a new environment) loads the bytecode instead of compiling
+    reset_report_environment()
+    compiled = []
+    env = report_environment()
+    monkeypatch.setattr(env, "compile", lambda *a, **k: compiled.append(a))
+    assert report_template() is not None
+    assert compiled == []
+
+
+def test_auto_reload_only_in_dev_mode(fresh_environment, monkeypatch):
+    monkeypatch.delenv("LCO_DEV", raising=False)
+    assert report_environment().auto_reload is False
+    reset_report_environment()
+    monkeypatch.setenv("LCO_DEV", "1")
+    assert report_environment().auto_reload is True
+
+
+def test_cache_can_be_disabled(fresh_environment, monkeypatch):
+    monkeypatch.setenv("LCO_DISABLE_CACHE", "1")
+    assert report_environment().bytecode_cache is None
+    assert "<html" in report_renderer.render_report_html({}).lower()
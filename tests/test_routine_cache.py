@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from ai.backends import StubBackend
+from ai.routine_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL, RoutineCache, routine_key
+
+ROUTINE = {"Morning": {"Diet": "Warm oats at 7:00"}, "Weekly_Addition": "Sauna"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RoutineCache(str(tmp_path / "routines.sqlite3"), ttl=3600, max_entries=3)
+
+
+def test_key_depends_on_model_and_prompt():
+    assert routine_key("m1", "p") == routine_key("m1", "p")
+    assert routine_key("m1", "p") != routine_key("m2", "p")
+    assert routine_key("m1", "p") != routine_key("m1", "q")
+
+
+def test_malformed_settings_fall_back_to_the_defaults(tmp_path, monkeypatch):
+    monkeypatch.setenv("LCO_ROUTINE_CACHE_TTL", "a month")
+    monkeypatch.setenv("LCO_ROUTINE_CACHE_SIZE", "1.5k")
+    cache = RoutineCache(str(tmp_path / "routines.sqlite3"))
+    assert (cache.ttl, cache.max_entries) == (DEFAULT_TTL, DEFAULT_MAX_ENTRIES)
+
+
+def test_round_trip_and_hit_counters(cache):
+    assert cache.get("model", "prompt") is None
+    cache.put("model", "prompt", ROUTINE)
+
+    assert cache.get("model", "prompt") == ROUTINE
+    assert cache.get("model", "prompt") == ROUTINE
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["stored_hits"] == 2
+
+
+def test_expired_entries_are_dropped(cache, monkeypatch):
+    import ai.routine_cache as rc
+
+    cache.put("model", "prompt", ROUTINE)
+    now = rc.time.time()
+    monkeypatch.setattr(rc.time, "time", lambda: now + cache.ttl + 1)
+
+    assert cache.get("model", "prompt") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(cache, monkeypatch):
+    import ai.routine_cache as rc
+
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(rc.time, "time", lambda: next(clock))
+    for prompt in ("a", "b", "c"):
+        cache.put("model", prompt, {"prompt": prompt})
+    cache.get("model", "a")  # "b" is now the least recently used
+    cache.put("model", "d", {"prompt": "d"})
+
+    assert cache.stats()["entries"] == 3
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == {"prompt": "a"}
+
+
+VALUES = {"fire": 10, "earth": 40, "air": 25, "water": 25}
+
+
+def test_generate_daily_routine_skips_model_on_hit(cache, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    model = StubBackend("```json\n" + json.dumps(ROUTINE) + "\n```", latency=0)
+    monkeypatch.setattr(complete_report, "_backend", lambda: model)
+
+    assert complete_report.generate_daily_routine(VALUES, cache=cache) == ROUTINE
+    # same statuses (low fire, high earth) -> same prompt -> cache hit
+    other = {"fire": 5, "earth": 35, "air": 24, "water": 26}
+    assert complete_report.generate_daily_routine(other, cache=cache) == ROUTINE
+    assert model.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_parse_failures_are_not_cached(cache, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    model = StubBackend("not json", latency=0)
+    monkeypatch.setattr(complete_report, "_backend", lambda: model)
+
+    for _ in range(2):
+        result = complete_report.generate_daily_routine(VALUES, cache=cache)
+        assert result["__parse_error"] is True
+    assert model.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_streamed_sections_arrive_in_order(cache, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    model = StubBackend(json.dumps(ROUTINE), latency=0, chunk_size=5)
+    monkeypatch.setattr(complete_report, "_backend", lambda: model)
+
+    seen = []
+    result = complete_report.generate_daily_routine(
+        VALUES, cache=cache, on_section=lambda k, v: seen.append((k, v)))
+    assert result == ROUTINE
+    assert seen == list(ROUTINE.items())
+
+    # a cache hit replays the sections without a model call
+    seen.clear()
+    complete_report.generate_daily_routine(
+        VALUES, cache=cache, on_section=lambda k, v: seen.append((k, v)))
+    assert seen == list(ROUTINE.items())
+    assert model.calls == 1
+
+
+def test_truncated_routine_is_repaired_but_not_cached(cache, monkeypatch):
+    complete_report = pytest.importorskip("ai.complete_report")
+    text = json.dumps({"Morning": {"Diet": "Oats"}, "Midday": {"Diet": "Soup"}})[:-12]
+    model = StubBackend(text, latency=0, chunk_size=8)
+    monkeypatch.setattr(complete_report, "_backend", lambda: model)
+
+    result = complete_report.generate_daily_routine(VALUES, cache=cache)
+    assert result["Morning"] == {"Diet": "Oats"}
+    assert "__parse_error" not in result
+    assert cache.stats()["entries"] == 0
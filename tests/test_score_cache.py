@@ -0,0 +1,62 @@
+import pytest
+
+import calc.element_calculator as ec
+
+CHART = {"Sun": "Leo", "Moon": "Cancer", "Asc": "Libra", "Mercury": "Virgo",
+         "Venus": "Leo", "Mars": "Gemini", "Jupiter": "Pisces", "Saturn": "Capricorn"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    ec.configure_score_cache(128)
+    yield
+    ec.configure_score_cache(ec.DEFAULT_SCORE_CACHE_SIZE)
+    ec.clear_score_cache()
+
+
+def test_repeat_scoring_is_a_cache_hit():
+    first = ec.calculate_elements(CHART)
+    second = ec.calculate_elements(dict(CHART))
+
+    assert first == second
+    info = ec.score_cache_info()
+    assert (info["hits"], info["misses"], info["maxsize"]) == (1, 1, 128)
+
+
+def test_cached_results_cannot_be_corrupted_by_callers():
+    scores, *_ = ec.calculate_elements(CHART)
+    scores["Fire"] = -1
+    assert ec.calculate_elements(CHART)[0]["Fire"] == 9
+
+
+def test_score_chart_matches_calculate_elements():
+    placements = ec.placements_of(CHART)
+    assert placements == ("Leo", "Cancer", "Libra", "Virgo", "Leo", "Gemini",
+                          "Pisces", "Capricorn")
+    assert ec.score_chart(placements) == ec.calculate_elements(CHART)
+    assert ec.calculate_qualities(CHART) == ec.score_chart(placements)[2:]
+
+
+def test_lru_is_bounded():
+    ec.configure_score_cache(2)
+    for sign in ("Aries", "Taurus", "Gemini", "Cancer"):
+        ec.calculate_elements({"Sun": sign})
+    assert ec.score_cache_info()["currsize"] == 2
+
+
+def test_preloaded_charts_skip_the_lru():
+    common = [ec.placements_of(CHART), ("Aries",) * 8, (None,) * 8]
+    assert ec.preload_scores(common) == 3
+
+    assert ec.score_chart(("Aries",) * 8) == ec._score_uncached(("Aries",) * 8)
+    assert ec.score_chart((None,) * 8)[1] == {"Fire": 0, "Water": 0, "Earth": 0, "Air": 0}
+    info = ec.score_cache_info()
+    assert info["precomputed_hits"] == 2
+    assert info["misses"] == 0
+    assert info["precomputed_size"] == 3
+
+
+@pytest.mark.parametrize("value, expected", [("lots", 4096), ("-5", 0), ("64", 64)])
+def test_cache_size_setting_is_parsed_defensively(monkeypatch, value, expected):
+    monkeypatch.setenv("LCO_SCORE_CACHE_SIZE", value)
+    assert ec._score_cache_size() == expected
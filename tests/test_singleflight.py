@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return {"value": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", work)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait()
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 5
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_and_later_calls_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.do("a", lambda: 3) == 3
+    assert flight.stats()["leaders"] == 3
+
+
+def test_followers_get_copies():
+    flight = SingleFlight(copy_result=dict)
+
+    async def main():
+        async def work():
+            await asyncio.sleep(0.05)
+            return {"shared": True}
+        return await asyncio.gather(*(flight.ado("k", work) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert results == [{"shared": True}] * 3
+    assert len({id(r) for r in results}) == 3
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def main():
+        async def fail():
+            await asyncio.sleep(0.05)
+            raise RuntimeError("boom")
+        return await asyncio.gather(*(flight.ado("k", fail) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(r) for r in results] == [RuntimeError] * 3
+    assert flight.stats() == {"leaders": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_threads_and_event_loops_mix():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def sync_work():
+        calls.append("sync")
+        release.wait(2)
+        return "done"
+
+    leader = threading.Thread(target=flight.do, args=("k", sync_work))
+    leader.start()
+    while not calls:
+        time.sleep(0.001)
+
+    async def follower():
+        async def never():
+            raise AssertionError("follower must not run the call")
+        return await flight.ado("k", never)
+
+    results = []
+    loops = [threading.Thread(target=lambda: results.append(asyncio.run(follower())))
+             for _ in range(2)]
+    for t in loops:
+        t.start()
+    while flight.stats()["coalesced"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *loops]:
+        t.join()
+
+    assert results == ["done", "done"]
+    assert calls == ["sync"]
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    flight = SingleFlight()
+
+    async def main():
+        async def work():
+            await asyncio.sleep(0.05)
+            return "ok"
+        leader = asyncio.create_task(flight.ado("k", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.ado("k", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "ok"
+    assert flight.stats()["leaders"] == 2
+
+
+def test_cancelled_follower_does_not_cancel_the_leader():
+    flight = SingleFlight()
+
+    async def main():
+        async def work():
+            await asyncio.sleep(0.05)
+            return "ok"
+        leader = asyncio.create_task(flight.ado("k", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.ado("k", work))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(main()) == "ok"
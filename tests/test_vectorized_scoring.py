@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from calc.element_calculator import (  # noqa: E402
+    PLANET_NAMES,
+    SIGN_ELEMENT,
+    SIGN_QUALITY,
+    SIGN_RULER,
+    ZODIAC_SIGNS,
+    ELEMENTS,
+    QUALITIES,
+    calculate_elements,
+    get_element,
+    get_quality,
+    get_ruler_of_asc,
+)
+from calc.vectorized import chart_dicts, encode_charts, score_charts  # noqa: E402
+
+
+def reference_calculate_elements(planets):
+    """The original per-chart implementation, kept as an oracle."""
+    element_scores = {"Fire": 0, "Water": 0, "Earth": 0, "Air": 0}
+    planet_points = {"Sun": 4, "Moon": 4, "Asc": 4, "Mercury": 3, "Venus": 3,
+                     "Mars": 3, "Jupiter": 2, "Saturn": 2}
+    for planet, sign in planets.items():
+        if sign:
+            element = get_element(sign)
+            if element:
+                element_scores[element] += planet_points.get(planet, 0)
+    asc_sign = planets.get("Asc")
+    if asc_sign:
+        ruler_sign = planets.get(get_ruler_of_asc(asc_sign))
+        if ruler_sign and get_element(ruler_sign):
+            element_scores[get_element(ruler_sign)] += 2
+    total = sum(element_scores.values())
+    element_pct = {k: round((v / total) * 100, 2) if total > 0 else 0
+                   for k, v in element_scores.items()}
+
+    qualities = {"Cardinal": 0, "Fixed": 0, "Mutable": 0}
+    for planet in ["Sun", "Moon", "Mercury", "Venus", "Mars", "Jupiter", "Saturn"]:
+        sign = planets.get(planet)
+        if sign and get_quality(sign):
+            qualities[get_quality(sign)] += 1
+    qtotal = sum(qualities.values())
+    quality_pct = {k: round((v / qtotal) * 100, 2) if qtotal else 0
+                   for k, v in qualities.items()}
+    return element_scores, element_pct, qualities, quality_pct
+
+
+def random_chart(rng):
+    choices = list(ZODIAC_SIGNS) + [None, "", "Ophiuchus"]
+    return {p: rng.choice(choices) for p in PLANET_NAMES if rng.random() > 0.05}
+
+
+@pytest.fixture(scope="module")
+def charts():
+    rng = random.Random(42)
+    return [random_chart(rng) for _ in range(3000)] + [{}, {"Asc": "Leo"}]
+
+
+def test_lookup_tables_match_sign_functions():
+    for i, sign in enumerate(ZODIAC_SIGNS):
+        assert ELEMENTS[SIGN_ELEMENT[i]] == get_element(sign)
+        assert QUALITIES[SIGN_QUALITY[i]] == get_quality(sign)
+        assert PLANET_NAMES[SIGN_RULER[i]] == get_ruler_of_asc(sign)
+
+
+def test_per_chart_wrapper_matches_original(charts):
+    for planets in charts:
+        assert calculate_elements(planets) == reference_calculate_elements(planets)
+
+
+def test_vectorized_kernel_matches_per_chart(charts):
+    matrix = encode_charts(charts)
+    assert matrix.dtype == np.int8 and matrix.shape == (len(charts), 8)
+
+    result = score_charts(matrix)
+    for i, planets in enumerate(charts):
+        assert chart_dicts(result, i) == calculate_elements(planets)
+
+
+def test_score_charts_rejects_wrong_shape():
+    with pytest.raises(ValueError):
+        score_charts(np.zeros((3, 7), dtype=np.int8))
+
+
+def test_empty_batch():
+    result = score_charts(encode_charts([]))
+    assert result.element_scores.shape == (0, 4)
+    assert result.quality_percentages.shape == (0, 3)
+
+
+def test_sign_enum_indexes_metadata_tables():
+    from calc.element_calculator import Sign, sign_from_name
+
+    assert len(Sign) == len(ZODIAC_SIGNS) == 12
+    assert ZODIAC_SIGNS[Sign.SAGITTARIUS] == "Sagittarius"
+    assert sign_from_name("Capricorn") is Sign.CAPRICORN
+    assert sign_from_name("capricorn") is None
+    assert ELEMENTS[SIGN_ELEMENT[Sign.SCORPIO]] == "Water"
+    assert PLANET_NAMES[SIGN_RULER[Sign.AQUARIUS]] == "Saturn"
+
+
+def test_empty_chart_reports_int_zero_percentages():
+    _, element_pct, _, quality_pct = calculate_elements({})
+    assert all(type(v) is int and v == 0 for v in element_pct.values())
+    assert all(type(v) is int and v == 0 for v in quality_pct.values())
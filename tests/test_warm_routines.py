@@ -0,0 +1,123 @@
+import json
+import random
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("ai.complete_report")
+
+from ai import complete_report, warm_routines  # noqa: E402
+from ai.backends import Backend, StubBackend  # noqa: E402
+from ai.routine_cache import RoutineCache  # noqa: E402
+
+MODEL = complete_report.GEMINI_MODEL_NAME
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RoutineCache(str(tmp_path / "routines.sqlite3"), rng=random.Random(0))
+
+
+def test_enumerates_every_status_combination():
+    combos = list(warm_routines.status_combinations())
+    assert len(combos) == 4 ** 4
+    statuses = {tuple(complete_report._element_status(c[k]) for k in warm_routines.ELEMENT_KEYS)
+                for c in combos if 0 not in c.values()}
+    assert len(statuses) == 3 ** 4
+    # empty and balanced elements add nothing to the prompt
+    assert len(warm_routines.distinct_prompts()) == 3 ** 4
+
+
+def test_warm_fills_cache_and_reports_hit(cache, monkeypatch):
+    summary = warm_routines.warm_routines(warm_routines.stub_backend, MODEL, cache)
+    assert summary == {"prompts": 81, "generated": 81, "skipped": 0, "failed": 0}
+
+    class Offline(Backend):
+        model_name = MODEL
+
+        def generate(self, prompt):
+            raise AssertionError("model must not be called after warming")
+    monkeypatch.setattr(complete_report, "_backend", Offline)
+    routine = complete_report.generate_daily_routine(
+        {"fire": 12, "earth": 31, "air": 0, "water": 26}, cache=cache)
+    assert set(warm_routines.ROUTINE_SECTIONS) <= set(routine)
+
+
+def test_variants_are_kept_and_picked_at_random(cache):
+    counter = iter(range(1000))
+    lock = threading.Lock()
+
+    def numbered(prompt):
+        with lock:
+            n = next(counter)
+        routine = json.loads(warm_routines.stub_backend(prompt))
+        routine["Weekly_Addition"] = f"variant {n}"
+        return json.dumps(routine)
+
+    warm_routines.warm_routines(numbered, MODEL, cache, variants=3)
+    prompt = next(iter(warm_routines.distinct_prompts()))
+    assert cache.variant_count(MODEL, prompt) == 3
+    seen = {cache.get(MODEL, prompt)["Weekly_Addition"] for _ in range(30)}
+    assert len(seen) == 3
+
+    # a second run only tops up missing variants
+    again = warm_routines.warm_routines(numbered, MODEL, cache, variants=4)
+    assert (again["generated"], again["skipped"]) == (81, 243)
+
+
+def test_invalid_responses_are_retried_then_reported(cache):
+    calls = []
+
+    def flaky(prompt):
+        calls.append(prompt)
+        return "not json" if len(calls) % 2 else warm_routines.stub_backend(prompt)
+
+    summary = warm_routines.warm_routines(flaky, MODEL, cache, max_workers=1,
+                                          retries=2, backoff=0)
+    assert summary["generated"] == 81 and summary["failed"] == 0
+
+    summary = warm_routines.warm_routines(lambda p: '{"Morning": {}}', "other-model", cache,
+                                          retries=1, backoff=0)
+    assert summary["failed"] == 81
+    assert cache.stats()["entries"] == 81
+
+
+def test_concurrency_is_bounded(cache):
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow(prompt):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.001)
+        with lock:
+            active.pop()
+        return warm_routines.stub_backend(prompt)
+
+    warm_routines.warm_routines(slow, MODEL, cache, max_workers=3)
+    assert max(peak) <= 3
+
+
+def test_cli_with_stub_backend(tmp_path, capsys):
+    db = tmp_path / "cli.sqlite3"
+    assert warm_routines.main(["--backend", "stub", "--cache", str(db), "-j", "2"]) == 0
+    assert "81 generated" in capsys.readouterr().err
+    cache = RoutineCache(str(db))
+    assert cache.stats()["entries"] == 81
+    # stored under the stub's model name, never under Gemini's
+    prompt = next(iter(warm_routines.distinct_prompts()))
+    assert cache.variant_count("stub", prompt) == 1
+    assert cache.variant_count(MODEL, prompt) == 0
+
+
+def test_load_backend():
+    assert isinstance(warm_routines.load_backend("stub"), StubBackend)
+    assert isinstance(warm_routines.load_backend("ai.backends:StubBackend"), StubBackend)
+    assert warm_routines.load_backend("json:dumps") is json.dumps
+    with pytest.raises(ValueError):
+        warm_routines.load_backend("nope")
+    with pytest.raises(ValueError, match="neither"):
+        warm_routines.load_backend("ai.backends:BACKENDS")
@@ -1,7 +1,10 @@
 
 import sys
 import os
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ui.utils.report_renderer import report_template  # noqa: E402
 
 # Mock data matching the template structure
 data = {
@@ -22,10 +25,7 @@ data = {
 }
 
 def verify():
-    tpl_dir = "/home/akash/projects/lco/ui/widgets"
-    env = Environment(loader=FileSystemLoader(tpl_dir),
-                      autoescape=select_autoescape(['html', 'xml']))
-    template = env.get_template('report.html')
+    template = report_template()
     
     html = template.render(**data)
     
@@ -1,13 +1,13 @@
 import sys
 import os
-import base64
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from ui.utils.report_assets import report_image_sources  # noqa: E402
+from ui.utils.report_renderer import report_template  # noqa: E402
+
 def test_pdf_template_rendering():
     print("Testing PDF template rendering...")
     
@@ -68,29 +68,13 @@ def test_pdf_template_rendering():
         "Disclaimer": "Test Disclaimer"
     }
     
-    # Load images
-    def load_image_b64(filename):
-        try:
-            img_path = Path(os.getcwd()) / 'images' / filename
-            if img_path.exists():
-                with open(img_path, "rb") as img_file:
-                    return base64.b64encode(img_file.read()).decode('utf-8')
-        except Exception as e:
-            print(f"Error loading image {filename}: {e}")
-        return None
-
     ctx = data.copy()
     ctx['report_date'] = datetime.date.today().strftime("%B %d, %Y")
-    ctx['logo_png'] = load_image_b64('logo.png')
-    ctx['cover_image_png'] = load_image_b64('coverimage.png')
-    ctx['human_png'] = load_image_b64('human.png')
+    ctx.update(report_image_sources())
     
     # Render
     try:
-        tpl_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../ui/widgets'))
-        env = Environment(loader=FileSystemLoader(tpl_dir),
-                          autoescape=select_autoescape(['html', 'xml']))
-        template = env.get_template('report.html')
+        template = report_template()
         
         output_html = template.render(**ctx)
         
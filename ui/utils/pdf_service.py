@@ -0,0 +1,163 @@
+"""Long-lived WeasyPrint render service.
+
+WeasyPrint is slow to start: the import pulls in Pango/fontconfig, font
+discovery runs on first use and `report.css` is a large stylesheet. The
+service does all of that once, on a dedicated worker thread, and then
+renders PDF jobs from a queue. Callers get a `concurrent.futures.Future`
+back immediately, so the GUI can submit an export and carry on; the batch
+generator (`ai.batch`) simply waits for the result in each worker process.
+
+The shared stylesheet is parsed with a `FontConfiguration`, which registers
+the bundled `fonts/` from its ``@font-face`` rules once for every export.
+It is re-parsed only when `report.css` changes on disk.
+
+Jobs report their phases (`PHASES`: template render, layout, write) to an
+optional ``progress(phase)`` callback, called on the worker thread, and
+stop before the next phase once their ``cancel`` event is set.
+"""
+
+import concurrent.futures
+import os
+import queue
+import threading
+
+from ui.utils.report_assets import asset_url_fetcher
+from ui.utils.report_renderer import CSS_PATH, TEMPLATE_DIR, render_report_html
+
+PHASES = ("render", "layout", "write")
+
+
+class ExportCancelled(Exception):
+    """Raised by a job whose cancel event was set before it finished."""
+
+
+def _checkpoint(phase, progress, cancel):
+    if cancel is not None and cancel.is_set():
+        raise ExportCancelled(f"export cancelled before {phase}")
+    if progress is not None:
+        progress(phase)
+
+
+class PdfRenderService:
+    """One worker thread that owns WeasyPrint, its font configuration and
+    the parsed report stylesheet.
+
+    `submit` queues already rendered HTML; `submit_report` also renders
+    the template from a report context on the worker. Both return a
+    `concurrent.futures.Future` resolving to the PDF path; cancelling the
+    future before the job starts skips it, and setting the job's `cancel`
+    event stops it between phases (the future then raises
+    `ExportCancelled` and no file is written).
+    """
+
+    def __init__(self, stylesheet_path=CSS_PATH):
+        self.stylesheet_path = str(stylesheet_path)
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._weasyprint = None
+        self._font_config = None
+        self._stylesheet = None
+        self._stylesheet_stamp = None
+        self.jobs_done = 0
+
+    # -- worker -----------------------------------------------------------
+    def _load(self):
+        """Import WeasyPrint and create the font configuration (once)."""
+        if self._weasyprint is None:
+            import weasyprint
+            from weasyprint.text.fonts import FontConfiguration
+            self._font_config = FontConfiguration()
+            self._weasyprint = weasyprint
+
+    def stylesheet(self):
+        """The parsed report stylesheet (worker thread only)."""
+        self._load()
+        st = os.stat(self.stylesheet_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stylesheet_stamp:
+            self._stylesheet = self._weasyprint.CSS(
+                filename=self.stylesheet_path, font_config=self._font_config,
+                url_fetcher=asset_url_fetcher)
+            self._stylesheet_stamp = stamp
+        return self._stylesheet
+
+    def _write(self, html, pdf_path, progress=None, cancel=None):
+        _checkpoint("layout", progress, cancel)
+        stylesheet = self.stylesheet()
+        # HTML that carries its own <style> block is rendered as it is
+        stylesheets = [] if '<style' in html else [stylesheet]
+        document = self._weasyprint.HTML(
+            string=html, base_url=str(TEMPLATE_DIR), url_fetcher=asset_url_fetcher)
+        layout = document.render(stylesheets=stylesheets, font_config=self._font_config)
+        _checkpoint("write", progress, cancel)
+        layout.write_pdf(pdf_path)
+        return pdf_path
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, func = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            finally:
+                self.jobs_done += 1
+
+    # -- client API -------------------------------------------------------
+    def _submit(self, func):
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="lco-pdf-render", daemon=True)
+                self._thread.start()
+            self._jobs.put((future, func))
+        return future
+
+    def warm_up(self):
+        """Load WeasyPrint, the fonts and the stylesheet ahead of the first
+        export; the future fails if WeasyPrint cannot be loaded."""
+        return self._submit(lambda: self.stylesheet() is not None)
+
+    def submit(self, html, pdf_path, progress=None, cancel=None):
+        """Queue rendered report HTML (see `render_report_html` with
+        ``inline_css=False``) to be written to `pdf_path`."""
+        return self._submit(lambda: self._write(html, pdf_path, progress, cancel))
+
+    def submit_report(self, data, pdf_path, progress=None, cancel=None):
+        """Queue a report context: render the template and write the PDF."""
+        def job():
+            _checkpoint("render", progress, cancel)
+            html = render_report_html(data, assets='fetch', inline_css=False)
+            return self._write(html, pdf_path, progress, cancel)
+        return self._submit(job)
+
+    def shutdown(self, wait=True):
+        """Stop the worker after the jobs already queued."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._jobs.put(None)
+        if thread is not None and wait:
+            thread.join()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_pdf_service():
+    """The process-wide render service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PdfRenderService()
+        return _service
@@ -0,0 +1,295 @@
+"""Process-wide cache of the images embedded in the report.
+
+Each image is read (and base64-encoded, when inlined) once per process,
+keyed by its path, modification time and size, so editing an image is
+picked up without a restart. `report_image_sources` returns the
+``*_src`` values for `report.html` in one of three modes:
+
+``inline``
+    ``data:`` URIs. The HTML is self-contained (HTML exports, previews)
+    but carries a few MB of base64 that WeasyPrint has to parse.
+``file``
+    ``file://`` URLs of the image files. Small HTML that still shows its
+    images when opened locally.
+``fetch``
+    ``lco-asset:`` URLs, resolved from this cache by `asset_url_fetcher`
+    (which the PDF service, `ui.utils.pdf_service`, passes to WeasyPrint). Small HTML and no
+    disk reads per export; only meaningful to WeasyPrint.
+
+In every mode the report uses print-resolution derivatives of the source
+images when Pillow is available: each image is scaled down to
+``LCO_PRINT_DPI`` (default 300) at the width `report.html` displays it,
+opaque images become JPEGs and PNGs are recompressed. Derivatives are
+built once into ``LCO_CACHE_DIR/assets`` under names that include a hash
+of the source content and the build settings, so they are rebuilt only
+when an image or the settings change (``python -m ui.utils.report_assets
+build`` builds them ahead of time). ``LCO_DISABLE_CACHE=1`` or
+``LCO_PRINT_DPI=0`` uses the source images as they are.
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import sys
+import threading
+from pathlib import Path
+
+from calc.pdf_cache import default_cache_dir
+
+PACKAGE_IMAGE_DIR = Path(__file__).resolve().parents[2] / 'images'
+REPORT_IMAGES = {
+    'logo_src': 'logo.png',
+    'cover_image_src': 'coverimage.png',
+    'human_src': 'human.png',
+}
+ASSET_SCHEME = 'lco-asset:'
+ASSET_MODES = ('inline', 'file', 'fetch')
+
+# CSS width (px, 1/96 in) each image is displayed at in report.html
+PRINT_WIDTHS = {
+    'logo.png': 120,
+    'coverimage.png': 550,
+    'human.png': 300,
+}
+DEFAULT_PRINT_DPI = 300
+JPEG_QUALITY = 85
+# bump when the derivative pipeline changes so old builds are not reused
+DERIVATIVE_VERSION = 1
+
+
+def find_image(filename):
+    """Path of an image in the images directory, or None."""
+    # ./images first (as the app always has), then next to the package
+    for directory in (Path(os.getcwd()) / 'images', PACKAGE_IMAGE_DIR):
+        img_path = directory / filename
+        if img_path.is_file():
+            return img_path.resolve()
+    return None
+
+
+class AssetCache:
+    """Image bytes and base64 text keyed by ``(path, mtime, size)``.
+
+    Thread-safe; an entry is replaced when the file changes on disk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # path -> (stamp, bytes, base64 or None)
+        self.reads = 0
+
+    def _entry(self, path):
+        path = str(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                return path, entry
+        with open(path, 'rb') as f:
+            data = f.read()
+        with self._lock:
+            self.reads += 1
+            entry = self._entries[path] = (stamp, data, None)
+        return path, entry
+
+    def read(self, path):
+        """The file's bytes."""
+        return self._entry(path)[1][1]
+
+    def b64(self, path):
+        """The file's content, base64-encoded."""
+        path, (stamp, data, encoded) = self._entry(path)
+        if encoded is None:
+            encoded = base64.b64encode(data).decode('ascii')
+            with self._lock:
+                if self._entries.get(path, (None,))[0] == stamp:
+                    self._entries[path] = (stamp, data, encoded)
+        return encoded
+
+    def data_uri(self, path):
+        mime = mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+        return f"data:{mime};base64,{self.b64(path)}"
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+asset_cache = AssetCache()
+
+
+# ----------------------------------------------------------
+# Print-resolution derivatives
+# ----------------------------------------------------------
+def print_dpi():
+    """Target resolution of the derivatives; 0 disables them."""
+    try:
+        return max(0, int(os.getenv("LCO_PRINT_DPI", DEFAULT_PRINT_DPI)))
+    except ValueError:
+        return DEFAULT_PRINT_DPI
+
+
+def derivative_dir():
+    """Build directory of the derivatives, or None when caching is off."""
+    if os.getenv("LCO_DISABLE_CACHE", "").strip() not in ("", "0"):
+        return None
+    return Path(default_cache_dir()) / 'assets'
+
+
+def _encode_derivative(data, max_width):
+    """Return ``(bytes, extension)`` of the print version of an image."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as im:
+        im.load()
+        if max_width and im.width > max_width:
+            height = max(1, round(im.height * max_width / im.width))
+            im = im.resize((max_width, height), Image.Resampling.LANCZOS)
+        opaque = im.mode in ('RGB', 'L') or (
+            im.mode in ('RGBA', 'LA') and im.getextrema()[-1][0] == 255)
+        out = io.BytesIO()
+        if opaque:
+            im.convert('RGB').save(out, 'JPEG', quality=JPEG_QUALITY,
+                                   optimize=True, progressive=True)
+            return out.getvalue(), '.jpg'
+        im.save(out, 'PNG', optimize=True)
+        return out.getvalue(), '.png'
+
+
+class DerivativeBuilder:
+    """Builds and remembers the print derivative of each source image.
+
+    Lookups are keyed by the source's ``(path, mtime, size)``; on disk a
+    derivative is named ``<stem>-<hash>.<ext>``, where the hash covers
+    the source bytes, the target width and DPI and `DERIVATIVE_VERSION`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths = {}  # (source path, stamp, dpi, build dir) -> derivative path
+
+    def _build(self, source, width, dpi, directory):
+        data = asset_cache.read(source)
+        digest = hashlib.sha256(data)
+        digest.update(f"{width}@{dpi}/v{DERIVATIVE_VERSION}".encode())
+        name = f"{source.stem}-{digest.hexdigest()[:16]}"
+        for ext in ('.jpg', '.png'):
+            if (directory / (name + ext)).is_file():
+                return directory / (name + ext)
+        encoded, ext = _encode_derivative(data, round(width * dpi / 96))
+        if len(encoded) >= len(data):
+            return source  # nothing to gain over the original
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / (name + ext)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(encoded)
+        os.replace(tmp, target)  # atomic, so concurrent builders never see partial files
+        return target
+
+    def get(self, source):
+        """Path of the derivative for `source`, or `source` itself when
+        there is none (unknown image, derivatives disabled, no Pillow)."""
+        width = PRINT_WIDTHS.get(source.name)
+        dpi = print_dpi()
+        directory = derivative_dir()
+        if not width or not dpi or directory is None:
+            return source
+        st = source.stat()
+        key = (str(source), st.st_mtime_ns, st.st_size, dpi, str(directory))
+        with self._lock:
+            path = self._paths.get(key)
+            if path is None:
+                try:
+                    path = self._build(source, width, dpi, directory)
+                except ImportError:
+                    path = source
+                except Exception as e:
+                    print(f"Could not build print version of {source.name}: {e}")
+                    path = source
+                self._paths[key] = path
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+
+
+derivatives = DerivativeBuilder()
+
+
+def resolve_image(filename):
+    """The file the report should use for an image: its print derivative
+    when one can be built, else the source; None if the image is missing."""
+    path = find_image(filename)
+    if path is None:
+        return None
+    return derivatives.get(path)
+
+
+# ----------------------------------------------------------
+# Template sources
+# ----------------------------------------------------------
+def image_source(filename, mode='inline'):
+    """The ``src`` for one image in the given mode, or None if missing."""
+    if mode not in ASSET_MODES:
+        raise ValueError(f"unknown asset mode {mode!r} (expected one of {ASSET_MODES})")
+    path = resolve_image(filename)
+    if path is None:
+        return None
+    try:
+        if mode == 'inline':
+            return asset_cache.data_uri(path)
+        if mode == 'file':
+            return path.as_uri()
+        asset_cache.read(path)  # warm the cache (and fail here if unreadable)
+        return ASSET_SCHEME + filename
+    except OSError as e:
+        print(f"Error loading image {filename}: {e}")
+        return None
+
+
+def report_image_sources(mode='inline'):
+    """``{template variable: src}`` for the report images."""
+    return {key: image_source(filename, mode) for key, filename in REPORT_IMAGES.items()}
+
+
+def asset_url_fetcher(url, *args, **kwargs):
+    """WeasyPrint ``url_fetcher`` serving ``lco-asset:`` URLs from the cache
+    and everything else through WeasyPrint's default fetcher."""
+    if url.startswith(ASSET_SCHEME):
+        filename = url[len(ASSET_SCHEME):]
+        path = resolve_image(filename)
+        if path is None:
+            raise ValueError(f"report asset not found: {filename}")
+        return {'string': asset_cache.read(path),
+                'mime_type': mimetypes.guess_type(str(path))[0] or 'application/octet-stream',
+                'redirected_url': url}
+    from weasyprint import default_url_fetcher
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ui.utils.report_assets",
+        description="Build the print-resolution report images.")
+    parser.add_argument("command", choices=("build",))
+    parser.parse_args(argv)
+
+    status = 0
+    for filename in REPORT_IMAGES.values():
+        source = find_image(filename)
+        if source is None:
+            print(f"{filename}: not found", file=sys.stderr)
+            status = 1
+            continue
+        path = derivatives.get(source)
+        print(f"{filename}: {source.stat().st_size} -> {path.stat().st_size} bytes ({path})")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
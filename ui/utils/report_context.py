@@ -0,0 +1,152 @@
+"""Map `generate_complete_output` results onto the report template context.
+
+Shared by the GUI (`AccountCreationWidget`) and the headless batch
+generator (`ai.batch`); it must not import PyQt.
+"""
+
+
+def build_report_context(full_report, personal, fire, earth, air, water,
+                         cardinal, fixed, mutable):
+    """Return the combined dict consumed by `report.html`, the assessment
+    form and `DocxReportGenerator`.
+
+    `full_report` is the `generate_complete_output` result; the element and
+    quality values are the inputs it was generated from (used for the
+    fallback context when generation failed).
+    """
+    # if error returned, log minimal feedback and fall back to an empty report
+    if not isinstance(full_report, dict) or full_report.get("__error"):
+        print("Report generation failed:", full_report.get(
+            "error_message") if isinstance(full_report, dict) else full_report)
+        # still show assessment page with fallback message
+        combined = {
+            "Elemental_Analysis": {},
+            "Daily_Guideline": {},
+            "Modalities": {},
+            "Element_Percentages": {"Fire": fire, "Earth": earth, "Air": air, "Water": water},
+            "Modalities_Percentages": {"Cardinal": cardinal, "Fixed": fixed, "Mutable": mutable},
+            "Personal": personal,
+            "Summary": "Report generation failed. Please try again later."
+        }
+        combined["Element_Descriptions"] = full_report.get(
+            "Element_Descriptions", {}) if isinstance(full_report, dict) else {}
+        combined["Daily_Routine"] = full_report.get(
+            "Daily_Routine", {}) if isinstance(full_report, dict) else {}
+        combined["Modality_Descriptions"] = full_report.get(
+            "Modality_Descriptions", {}) if isinstance(full_report, dict) else {}
+        return combined
+
+    # Map AI output keys into the structure expected by the UI/template
+    # New JSON structure from ai/complete_report.py:
+    # "Element_Descriptions": {
+    #   "Fire": { "Title": "...", "Content": {...}, "Status": "...", "Percentage": ... },
+    #   ...
+    # }
+    elemental_src = full_report.get("Element_Descriptions", {}) or {}
+    elemental_map = {}
+
+    for ename, ed in elemental_src.items():
+        # ed is expected to be a dict with Title, Content, Status, Percentage
+        if not isinstance(ed, dict):
+            continue
+
+        content_data = ed.get("Content")
+        # Content might be a JSON string, a dict, or a plain string
+        description = ""
+        scientific = ""
+        imbalance = ""
+        remedies = {}
+
+        if isinstance(content_data, dict):
+            # It's already a parsed dict (e.g. from fire_high_fixed JSON)
+            # We need to map keys from the JSON prompts to UI fields
+            # Example keys in JSON: "The Fire Element", "Physique", "Temperament", "Diet", "Lifestyle and Exercise"
+
+            # Heuristic mapping
+            description = content_data.get("The Fire Element") or content_data.get("The Earth Element") or \
+                content_data.get("The Air Element") or content_data.get("The Water Element") or \
+                content_data.get("Description") or ""
+
+            # Not present in all, but good to have
+            scientific = content_data.get(
+                "Scientific Correlation") or ""
+
+            # Combine some fields for "Imbalance Effects" if not explicitly present
+            imbalance_parts = []
+            if content_data.get("What Low Fire Feels Like—and How It Holds You Back"):
+                imbalance_parts.append(content_data.get(
+                    "What Low Fire Feels Like—and How It Holds You Back"))
+            if content_data.get("What Excess Fire Feels Like—and Why You Need to Rein It In"):
+                imbalance_parts.append(content_data.get(
+                    "What Excess Fire Feels Like—and Why You Need to Rein It In"))
+            # ... add other element specific keys if needed, or generic "Imbalance"
+            if content_data.get("Imbalance Effects"):
+                imbalance_parts.append(
+                    content_data.get("Imbalance Effects"))
+
+            imbalance = "\n\n".join(imbalance_parts)
+
+            # Remedies
+            remedies = {
+                "Diet": content_data.get("Diet", ""),
+                "Lifestyle_and_Exercise": content_data.get("Lifestyle and Exercise", ""),
+                "Herbal_or_Energy_Support": content_data.get("Gems, Flower Remedies, and Aromas") or
+                content_data.get("Herbs") or
+                content_data.get(
+                    "Crystals, Gems, and Herbal Remedies") or ""
+            }
+        elif isinstance(content_data, str):
+            description = content_data
+
+        elemental_map[ename] = {
+            "Classification": ed.get("Title", ""),
+            "Description": description,
+            "Scientific_Correlation": scientific,
+            "Imbalance_Effects": imbalance,
+            "Remedies": remedies,
+            "Status": ed.get("Status", ""),
+            "Percentage": ed.get("Percentage", 0)
+        }
+
+    daily_src = full_report.get("Daily_Routine", {}) or {}
+
+    # Modalities
+    modalities_src = full_report.get("Modality_Descriptions", {}) or {}
+    modalities_map = {}
+
+    for mname, mcontent in modalities_src.items():
+        # mcontent is expected to be a dict (parsed JSON) or string
+        # Structure: "Cardinal": { "Cardinal_Energy": { "Cardinal Energy": "...", ... } } OR just the inner dict
+
+        content_dict = {}
+        if isinstance(mcontent, dict):
+            # Check if it's nested like {"Cardinal_Energy": {...}}
+            if len(mcontent) == 1 and isinstance(list(mcontent.values())[0], dict):
+                content_dict = list(mcontent.values())[0]
+            else:
+                content_dict = mcontent
+
+        modalities_map[mname] = {
+            "Content": content_dict,  # Pass the whole dict for rendering
+            "Percentage": full_report.get("Modalities_Percentages", {}).get(mname, 0)
+        }
+
+    combined = {
+        "Elemental_Analysis": elemental_map,
+        "Daily_Guideline": daily_src,
+        "Modalities": modalities_map,
+        "Element_Percentages": full_report.get("Element_Percentages", {}),
+        "Modalities_Percentages": full_report.get("Modalities_Percentages", {}),
+        "Personal": personal,
+        "Summary": full_report.get("Summary", "AI generated assessment"),
+        "Disclaimer": full_report.get("Disclaimer", "")
+    }
+
+    # Keep raw data too just in case
+    combined["Element_Descriptions"] = full_report.get(
+        "Element_Descriptions", {})
+    combined["Daily_Routine"] = full_report.get("Daily_Routine", {})
+    combined["Modality_Descriptions"] = full_report.get(
+        "Modality_Descriptions", {})
+
+    return combined
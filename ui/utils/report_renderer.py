@@ -0,0 +1,127 @@
+"""Render report contexts to HTML, PDF and Word without any Qt dependency.
+
+Used by the assessment form (HTML for the preview), the main widget (PDF
+export), the headless batch generator (`ai.batch`) and the template tests.
+
+All of them share one Jinja environment (`report_environment`), so
+`report.html` is parsed and compiled once per process. Compiled templates
+are also stored in a bytecode cache under ``LCO_CACHE_DIR/jinja`` so new
+processes (batch workers, the next app start) skip compilation too. The
+template file is only re-checked for changes when ``LCO_DEV=1``.
+
+Images come from the process-wide `ui.utils.report_assets` cache; pass
+``assets='file'`` or ``'fetch'`` to reference them instead of inlining
+megabytes of base64 into the HTML. The styles live in `report.css`; they
+are inlined into HTML output, while PDFs are written by the long-lived
+`ui.utils.pdf_service` worker, which parses the stylesheet once.
+"""
+
+import datetime
+import os
+import threading
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from calc.pdf_cache import default_cache_dir
+from ui.utils.report_assets import asset_cache, find_image, report_image_sources
+
+TEMPLATE_DIR = Path(__file__).resolve().parents[1] / 'widgets'
+TEMPLATE_NAME = 'report.html'
+CSS_PATH = TEMPLATE_DIR / 'report.css'
+
+
+def load_image_b64(filename):
+    """Base64 of an image from the images directory, or None (cached)."""
+    path = find_image(filename)
+    if path is None:
+        return None
+    try:
+        return asset_cache.b64(path)
+    except OSError as e:
+        print(f"Error loading image {filename}: {e}")
+        return None
+
+
+def _env_flag(name):
+    return os.getenv(name, "").strip() not in ("", "0")
+
+
+def _bytecode_cache():
+    """On-disk cache of compiled templates, or None when caching is off."""
+    if _env_flag("LCO_DISABLE_CACHE"):
+        return None
+    directory = os.path.join(default_cache_dir(), "jinja")
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        print(f"Template cache disabled ({directory}): {e}")
+        return None
+    return FileSystemBytecodeCache(directory)
+
+
+_environment = None
+_environment_lock = threading.Lock()
+
+
+def report_environment():
+    """The process-wide Jinja environment for the report templates."""
+    global _environment
+    with _environment_lock:
+        if _environment is None:
+            _environment = Environment(
+                loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                autoescape=select_autoescape(['html', 'xml']),
+                bytecode_cache=_bytecode_cache(),
+                auto_reload=_env_flag("LCO_DEV"))
+        return _environment
+
+
+def reset_report_environment():
+    """Forget the shared environment (e.g. after changing ``LCO_DEV``)."""
+    global _environment
+    with _environment_lock:
+        _environment = None
+
+
+def report_template(name=TEMPLATE_NAME):
+    """The compiled report template, from the shared environment."""
+    return report_environment().get_template(name)
+
+
+def report_css():
+    """Text of `report.css` (read once, re-read when it changes)."""
+    return asset_cache.read(CSS_PATH).decode('utf-8')
+
+
+def render_report_html(data, assets='inline', inline_css=True):
+    """Render `report.html` for a report context (see `build_report_context`).
+
+    `assets` selects how images are referenced: ``'inline'`` (data URIs,
+    self-contained HTML), ``'file'`` (file:// URLs, only for HTML that is
+    never saved or shared, as the paths are local) or ``'fetch'`` (only
+    for `write_report_pdf`); see `ui.utils.report_assets`. With
+    ``inline_css=False`` the styles are left out for the PDF service to
+    apply from its pre-parsed copy.
+    """
+    template = report_template()
+
+    ctx = dict(data or {})
+    ctx.setdefault('report_date', datetime.date.today().strftime("%B %d, %Y"))
+    ctx.update(report_image_sources(assets))
+    ctx['report_css'] = report_css() if inline_css else None
+    return template.render(**ctx)
+
+
+def write_report_pdf(html, pdf_path):
+    """Write rendered report HTML to `pdf_path` on the PDF render service
+    and wait for it."""
+    from ui.utils.pdf_service import get_pdf_service
+    return get_pdf_service().submit(html, pdf_path).result()
+
+
+def write_report_docx(data, docx_path):
+    """Write a report context to a Word document."""
+    from ui.utils.docx_generator import DocxReportGenerator
+    DocxReportGenerator(docx_path).generate(data)
+    return docx_path
@@ -7,7 +7,12 @@ from ui.widgets.custom_input import CustomInput, PhoneInput, HelpIcon
 from ui.widgets.personal_details_form import PersonalDetailsForm
 from ui.widgets.elemental_assessment_result_form import ElementalAssessmentResultForm
 from ui.widgets.pdf_preview_widget import PdfPreviewWidget
-from ai.complete_report import generate_complete_output
+from ui.utils.report_context import build_report_context
+from ui.utils.pdf_service import get_pdf_service
+from ui.widgets.export_job import PHASE_LABELS, ExportJob
+from ai.complete_report import close_backend_clients, generate_complete_output_async
+import asyncio
+import copy
 import tempfile
 import os
 
@@ -15,15 +20,28 @@ import os
 class ReportWorker(QThread):
     """Background worker that runs the slow generate_complete_output call."""
     result_ready = pyqtSignal(dict)
+    # daily routine sections (Morning, Midday, ...) as they stream in
+    section_ready = pyqtSignal(str, object)
 
     def __init__(self, user_input, api_key=None):
         super().__init__()
         self.user_input = user_input
         self.api_key = api_key
 
+    async def _generate(self):
+        try:
+            return await generate_complete_output_async(
+                self.user_input, self.api_key, on_section=self.section_ready.emit)
+        finally:
+            # the loop ends with this report; close its model clients first
+            await close_backend_clients()
+
     def run(self):
         try:
-            result = generate_complete_output(self.user_input, self.api_key)
+            # same async path as headless batch generation, on this thread's own
+            # loop; the Gemini backend gives every loop its own async client
+            # (the SDK's default one is shared process-wide and bound to one loop)
+            result = asyncio.run(self._generate())
             #print(result)
         except Exception as e:
             result = {"__error": True, "error_message": str(e)}
@@ -174,17 +192,54 @@ class AccountCreationWidget(QWidget):
         layout = QVBoxLayout(overlay)
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         label = QLabel("Please wait report is generating")
+        label.setObjectName("loading_title")
         label.setStyleSheet("color: white; font-size: 18px; font-weight: 600;")
         layout.addWidget(label)
+        progress = QLabel("")
+        progress.setObjectName("loading_progress")
+        progress.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        progress.setStyleSheet("color: white; font-size: 14px;")
+        layout.addWidget(progress)
+        cancel = QPushButton("Cancel")
+        cancel.setObjectName("loading_cancel")
+        cancel.setFixedWidth(120)
+        cancel.setVisible(False)
+        layout.addWidget(cancel, alignment=Qt.AlignmentFlag.AlignCenter)
         overlay.setVisible(False)
         return overlay
 
-    def _show_loading(self):
+    def _show_loading(self, title="Please wait report is generating", on_cancel=None):
         if not hasattr(self, '_loading_overlay'):
             self._loading_overlay = self._create_loading_overlay()
+        self._loading_sections = []
+        self._loading_overlay.findChild(QLabel, "loading_title").setText(title)
+        self._set_loading_progress("")
+        cancel = self._loading_overlay.findChild(QPushButton, "loading_cancel")
+        try:
+            cancel.clicked.disconnect()
+        except TypeError:
+            pass  # nothing connected yet
+        if on_cancel is not None:
+            cancel.clicked.connect(on_cancel)
+        cancel.setEnabled(True)
+        cancel.setVisible(on_cancel is not None)
         self._loading_overlay.setGeometry(self.rect())
         self._loading_overlay.setVisible(True)
 
+    def _set_loading_progress(self, text):
+        label = self._loading_overlay.findChild(QLabel, "loading_progress")
+        if label is not None:
+            label.setText(text)
+
+    def _on_routine_section(self, name, value):
+        """Show which daily routine sections have already arrived."""
+        if not hasattr(self, '_loading_overlay') or name.startswith("__"):
+            return
+        if name not in self._loading_sections:
+            self._loading_sections.append(name)
+        ready = ", ".join(s.replace("_", " ") for s in self._loading_sections)
+        self._set_loading_progress(f"Daily routine ready: {ready}")
+
     def _hide_loading(self):
         if hasattr(self, '_loading_overlay'):
             self._loading_overlay.setVisible(False)
@@ -199,143 +254,8 @@ class AccountCreationWidget(QWidget):
             except Exception:
                 pass
 
-            # if error returned, show minimal feedback and abort
-            if not isinstance(full_report, dict) or full_report.get("__error"):
-                print("Report generation failed:", full_report.get(
-                    "error_message") if isinstance(full_report, dict) else full_report)
-                # still show assessment page with fallback message
-                combined = {
-                    "Elemental_Analysis": {},
-                    "Daily_Guideline": {},
-                    "Modalities": {},
-                    "Element_Percentages": {"Fire": fire, "Earth": earth, "Air": air, "Water": water},
-                    "Modalities_Percentages": {"Cardinal": cardinal, "Fixed": fixed, "Mutable": mutable},
-                    "Personal": personal,
-                    "Summary": "Report generation failed. Please try again later."
-                }
-                combined["Element_Descriptions"] = full_report.get(
-                    "Element_Descriptions", {}) if isinstance(full_report, dict) else {}
-                combined["Daily_Routine"] = full_report.get(
-                    "Daily_Routine", {}) if isinstance(full_report, dict) else {}
-                combined["Modality_Descriptions"] = full_report.get(
-                    "Modality_Descriptions", {}) if isinstance(full_report, dict) else {}
-                self.elemental_assessment_form.load_assessment_data(combined)
-                self.show_assessment_result()
-                return
-
-            # Map AI output keys into the structure expected by the UI/template
-            # New JSON structure from ai/complete_report.py:
-            # "Element_Descriptions": {
-            #   "Fire": { "Title": "...", "Content": {...}, "Status": "...", "Percentage": ... },
-            #   ...
-            # }
-            elemental_src = full_report.get("Element_Descriptions", {}) or {}
-            elemental_map = {}
-
-            for ename, ed in elemental_src.items():
-                # ed is expected to be a dict with Title, Content, Status, Percentage
-                if not isinstance(ed, dict):
-                    continue
-
-                content_data = ed.get("Content")
-                # Content might be a JSON string, a dict, or a plain string
-                description = ""
-                scientific = ""
-                imbalance = ""
-                remedies = {}
-
-                if isinstance(content_data, dict):
-                    # It's already a parsed dict (e.g. from fire_high_fixed JSON)
-                    # We need to map keys from the JSON prompts to UI fields
-                    # Example keys in JSON: "The Fire Element", "Physique", "Temperament", "Diet", "Lifestyle and Exercise"
-
-                    # Heuristic mapping
-                    description = content_data.get("The Fire Element") or content_data.get("The Earth Element") or \
-                        content_data.get("The Air Element") or content_data.get("The Water Element") or \
-                        content_data.get("Description") or ""
-
-                    # Not present in all, but good to have
-                    scientific = content_data.get(
-                        "Scientific Correlation") or ""
-
-                    # Combine some fields for "Imbalance Effects" if not explicitly present
-                    imbalance_parts = []
-                    if content_data.get("What Low Fire Feels Like—and How It Holds You Back"):
-                        imbalance_parts.append(content_data.get(
-                            "What Low Fire Feels Like—and How It Holds You Back"))
-                    if content_data.get("What Excess Fire Feels Like—and Why You Need to Rein It In"):
-                        imbalance_parts.append(content_data.get(
-                            "What Excess Fire Feels Like—and Why You Need to Rein It In"))
-                    # ... add other element specific keys if needed, or generic "Imbalance"
-                    if content_data.get("Imbalance Effects"):
-                        imbalance_parts.append(
-                            content_data.get("Imbalance Effects"))
-
-                    imbalance = "\n\n".join(imbalance_parts)
-
-                    # Remedies
-                    remedies = {
-                        "Diet": content_data.get("Diet", ""),
-                        "Lifestyle_and_Exercise": content_data.get("Lifestyle and Exercise", ""),
-                        "Herbal_or_Energy_Support": content_data.get("Gems, Flower Remedies, and Aromas") or
-                        content_data.get("Herbs") or
-                        content_data.get(
-                            "Crystals, Gems, and Herbal Remedies") or ""
-                    }
-                elif isinstance(content_data, str):
-                    description = content_data
-
-                elemental_map[ename] = {
-                    "Classification": ed.get("Title", ""),
-                    "Description": description,
-                    "Scientific_Correlation": scientific,
-                    "Imbalance_Effects": imbalance,
-                    "Remedies": remedies,
-                    "Status": ed.get("Status", ""),
-                    "Percentage": ed.get("Percentage", 0)
-                }
-
-            daily_src = full_report.get("Daily_Routine", {}) or {}
-
-            # Modalities
-            modalities_src = full_report.get("Modality_Descriptions", {}) or {}
-            modalities_map = {}
-
-            for mname, mcontent in modalities_src.items():
-                # mcontent is expected to be a dict (parsed JSON) or string
-                # Structure: "Cardinal": { "Cardinal_Energy": { "Cardinal Energy": "...", ... } } OR just the inner dict
-
-                content_dict = {}
-                if isinstance(mcontent, dict):
-                    # Check if it's nested like {"Cardinal_Energy": {...}}
-                    if len(mcontent) == 1 and isinstance(list(mcontent.values())[0], dict):
-                        content_dict = list(mcontent.values())[0]
-                    else:
-                        content_dict = mcontent
-
-                modalities_map[mname] = {
-                    "Content": content_dict,  # Pass the whole dict for rendering
-                    "Percentage": full_report.get("Modalities_Percentages", {}).get(mname, 0)
-                }
-
-            combined = {
-                "Elemental_Analysis": elemental_map,
-                "Daily_Guideline": daily_src,
-                "Modalities": modalities_map,
-                "Element_Percentages": full_report.get("Element_Percentages", {}),
-                "Modalities_Percentages": full_report.get("Modalities_Percentages", {}),
-                "Personal": personal,
-                "Summary": full_report.get("Summary", "AI generated assessment"),
-                "Disclaimer": full_report.get("Disclaimer", "")
-            }
-
-            # Keep raw data too just in case
-            combined["Element_Descriptions"] = full_report.get(
-                "Element_Descriptions", {})
-            combined["Daily_Routine"] = full_report.get("Daily_Routine", {})
-            combined["Modality_Descriptions"] = full_report.get(
-                "Modality_Descriptions", {})
-
+            combined = build_report_context(
+                full_report, personal, fire, earth, air, water, cardinal, fixed, mutable)
             self.elemental_assessment_form.load_assessment_data(combined)
             self.show_assessment_result()
 
@@ -399,8 +319,11 @@ class AccountCreationWidget(QWidget):
         self._worker = ReportWorker(user_input, api_key)
         self._worker.result_ready.connect(lambda result: self._on_generation_finished(
             result, personal, fire, earth, air, water, cardinal, fixed, mutable))
+        self._worker.section_ready.connect(self._on_routine_section)
         self._worker.finished.connect(lambda: None)
         self._worker.start()
+        # load WeasyPrint, fonts and the report stylesheet while the report is generated
+        get_pdf_service().warm_up()
 
     def on_assessment_next(self):
         """Handle next button on assessment form"""
@@ -412,34 +335,76 @@ class AccountCreationWidget(QWidget):
         except Exception as e:
             print(f"Error while exporting from assessment next: {e}")
 
-    def on_export_requested(self, html: str, assessment_data: dict):
-        """Handle export request from the assessment form: generate PDF and show preview."""
-        pdf_path = None
-        # Try to generate a PDF using WeasyPrint
+    def on_export_requested(self, assessment_data: dict):
+        """Handle export request from the assessment form: write the PDF in the
+        background and show the preview as soon as it is ready. The template
+        is rendered off the GUI thread: the PDF by the render service, the
+        HTML fallback by the job, only when the PDF fails."""
+        tf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
+        tf.close()
+        # the job reads the data on a pool thread; give it its own copy
+        data = copy.deepcopy(assessment_data)
+        job = ExportJob(data, {"pdf": tf.name}, html_fallback=True)
+        self._export_job = job
+        job.signals.progress.connect(self._on_export_progress)
+        job.signals.file_ready.connect(
+            lambda fmt, path: self._show_pdf_preview(path, data=data))
+        job.signals.html_fallback.connect(
+            lambda error, html: self._on_export_failed(tf.name, html, error))
+        job.signals.cancelled.connect(lambda: self._on_export_cancelled(tf.name))
+        job.signals.finished.connect(self._on_export_finished)
+        self._show_loading("Exporting PDF", on_cancel=self._cancel_export)
+        job.start()
+
+    def _on_export_progress(self, fmt, phase):
+        self._set_loading_progress(PHASE_LABELS.get(phase, phase) + "...")
+
+    def _cancel_export(self):
+        job = getattr(self, '_export_job', None)
+        if job is not None:
+            job.cancel()
+            self._set_loading_progress("Cancelling...")
+            self._loading_overlay.findChild(QPushButton, "loading_cancel").setEnabled(False)
+
+    @staticmethod
+    def _remove_export_file(path):
+        """Delete the temporary PDF of an export that did not complete."""
         try:
-            from weasyprint import HTML
-            tf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-            tf.close()
-            HTML(string=html).write_pdf(tf.name)
-            pdf_path = tf.name
-        except Exception as e:
-            # Fallback: write HTML to a temp file (no PDF)
-            try:
-                tf = tempfile.NamedTemporaryFile(
-                    delete=False, suffix='.html', mode='w', encoding='utf-8')
-                tf.write(html)
-                tf.close()
-                pdf_path = None
-            except Exception as e2:
-                print(f"Failed to generate PDF or HTML preview: {e} / {e2}")
-                pdf_path = None
-
-        # Show preview page (pass pdf path and html)
-        self.pdf_preview.load_preview(pdf_path, html)
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _on_export_failed(self, pdf_path, html, error):
+        self._remove_export_file(pdf_path)
+        self._show_html_preview(html, error)
+
+    def _on_export_cancelled(self, pdf_path):
+        self._remove_export_file(pdf_path)
+        self._hide_loading()
+
+    def _on_export_finished(self):
+        self._export_job = None
+        self._hide_loading()
+
+    def _show_pdf_preview(self, pdf_path, html=None, data=None):
+        self._hide_loading()
+        # Show preview page (pass pdf path and html, or the data to render it from)
+        self.pdf_preview.load_preview(pdf_path, html, data)
         # switch to preview page (index 2)
         self.stacked_widget.setCurrentWidget(self.pdf_preview)
         self.step_indicator.set_active_step(3)
 
+    def _show_html_preview(self, html, error):
+        """PDF export failed: preview (and offer to save) the HTML instead."""
+        try:
+            tf = tempfile.NamedTemporaryFile(
+                delete=False, suffix='.html', mode='w', encoding='utf-8')
+            tf.write(html)
+            tf.close()
+        except Exception as e2:
+            print(f"Failed to generate PDF or HTML preview: {error} / {e2}")
+        self._show_pdf_preview(None, html)
+
     def create_right_panel(self):
         panel = QWidget()
         panel.setStyleSheet("background-color: white;")
@@ -2,20 +2,17 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QScrollArea, QTextEdit, QFrame,
                              QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt, pyqtSignal
+import copy
 import json
-import os
-from pathlib import Path
-import datetime
 
-# Template rendering
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from ui.widgets.export_job import PHASE_LABELS, ExportJob
 
 
 class ElementalAssessmentResultForm(QWidget):
     next_clicked = pyqtSignal()
     back_clicked = pyqtSignal()
-    # Emitted when the user requests export; payload is HTML string and current assessment data
-    export_requested = pyqtSignal(str, dict)
+    # Emitted when the user requests export; payload is the current assessment data
+    export_requested = pyqtSignal(dict)
 
     def __init__(self):
         super().__init__()
@@ -711,48 +708,14 @@ class ElementalAssessmentResultForm(QWidget):
                 pass
 
     def export_pdf(self):
-        """Export the currently rendered report to PDF (or HTML fallback)."""
-        # Prefer rendering the Jinja2 template (report.html) using assessment_data
+        """Export the report to PDF in the background (or HTML fallback)."""
+        # the template is rendered off the GUI thread: the PDF by the render
+        # service, the HTML fallback by the export job if the PDF fails
         try:
-            tpl_path = Path(__file__).parent / 'report.html'
-            tpl_dir = str(tpl_path.parent)
-            env = Environment(loader=FileSystemLoader(tpl_dir),
-                              autoescape=select_autoescape(['html', 'xml']))
-            template = env.get_template('report.html')
-
-            # Prepare context
-            ctx = dict(self.assessment_data or {})
-            ctx.setdefault(
-                'report_date', datetime.date.today().strftime("%B %d, %Y"))
-
-            # Load images as base64
-            import base64
-
-            def load_image_b64(filename):
-                try:
-                    img_path = Path(os.getcwd()) / 'images' / filename
-                    if img_path.exists():
-                        with open(img_path, "rb") as img_file:
-                            return base64.b64encode(img_file.read()).decode('utf-8')
-                except Exception as e:
-                    print(f"Error loading image {filename}: {e}")
-                return None
-
-            ctx['logo_png'] = load_image_b64('logo.png')
-            ctx['cover_image_png'] = load_image_b64('coverimage.png')
-            ctx['human_png'] = load_image_b64('human.png')
-
-            full_html = template.render(**ctx)
-
-            # Emit HTML to parent for PDF generation/preview
-            try:
-                self.export_requested.emit(
-                    full_html, self.assessment_data or {})
-                return
-            except Exception:
-                pass
+            self.export_requested.emit(self.assessment_data or {})
+            return
         except Exception as e:
-            print(f"Template render failed: {e}")
+            print(f"Export request failed: {e}")
             import traceback
             traceback.print_exc()
 
@@ -787,31 +750,50 @@ class ElementalAssessmentResultForm(QWidget):
                                  f'Could not save HTML: {e}')
 
     def export_word(self):
-        """Export the report to a Word document (.docx)."""
+        """Export the report to a Word document (.docx) in the background.
+
+        While the export runs the button cancels it.
+        """
+        job = getattr(self, '_word_job', None)
+        if job is not None:
+            job.cancel()
+            self.export_word_btn.setEnabled(False)
+            return
+
         fname, _ = QFileDialog.getSaveFileName(
             self, "Export Report Word", "", "Word Files (*.docx)")
         if not fname:
             return
 
-        try:
-            from ui.utils.docx_generator import DocxReportGenerator
-            generator = DocxReportGenerator(fname)
-            # Use current assessment data, potentially with edits
-            data = self.assessment_data or {}
-            # If in edit mode, try to capture latest edits
-            if getattr(self, '_editing_mode', False):
-                try:
-                    edited = self.get_edited_assessment_data()
-                    data.update(edited)
-                except Exception:
-                    pass
+        # Use current assessment data, potentially with edits; the job reads
+        # it on a pool thread, so it gets its own copy
+        data = copy.deepcopy(self.assessment_data or {})
+        # If in edit mode, try to capture latest edits
+        if getattr(self, '_editing_mode', False):
+            try:
+                edited = self.get_edited_assessment_data()
+                data.update(copy.deepcopy(edited))
+            except Exception:
+                pass
 
-            generator.generate(data)
-            QMessageBox.information(
-                self, 'Exported', f'Report saved to {fname}')
-        except Exception as e:
-            QMessageBox.critical(self, 'Export Failed',
-                                 f'Could not save Word document: {e}')
+        job = self._word_job = ExportJob(data, {"docx": fname})
+        job.signals.progress.connect(
+            lambda fmt, phase: self.export_word_btn.setToolTip(PHASE_LABELS.get(phase, phase)))
+        job.signals.file_ready.connect(
+            lambda fmt, path: QMessageBox.information(
+                self, 'Exported', f'Report saved to {path}'))
+        job.signals.failed.connect(
+            lambda fmt, error: QMessageBox.critical(
+                self, 'Export Failed', f'Could not save Word document: {error}'))
+        job.signals.finished.connect(self._on_word_export_finished)
+        self.export_word_btn.setText("Cancel Export")
+        job.start()
+
+    def _on_word_export_finished(self):
+        self._word_job = None
+        self.export_word_btn.setText("Export Word")
+        self.export_word_btn.setToolTip("")
+        self.export_word_btn.setEnabled(True)
 
     def get_edited_assessment_data(self):
         """Retrieve all edited data"""
@@ -0,0 +1,112 @@
+"""Background report export (PDF and Word) for the GUI.
+
+`ExportJob` is a `QRunnable` for `QThreadPool`: the PDF is written by the
+long-lived render service (`ui.utils.pdf_service`) and the Word document
+on the pool thread, so the window stays responsive. Progress, results and
+errors arrive as Qt signals on the GUI thread; `cancel()` stops the job
+before its next phase. With ``html_fallback=True`` a failed PDF also
+renders the self-contained report HTML on the pool thread, so the GUI can
+offer that instead without rendering the template itself.
+"""
+
+import concurrent.futures
+import os
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from ui.utils.pdf_service import ExportCancelled, get_pdf_service
+from ui.utils.report_renderer import render_report_html, write_report_docx
+
+PHASE_LABELS = {
+    "render": "Preparing the report",
+    "layout": "Laying out pages",
+    "write": "Writing the file",
+}
+
+
+class ExportSignals(QObject):
+    progress = pyqtSignal(str, str)     # (format, phase: render / layout / write)
+    file_ready = pyqtSignal(str, str)   # (format, path), as soon as each file is written
+    failed = pyqtSignal(str, str)       # (format, error message)
+    html_fallback = pyqtSignal(str, str)  # (error, report HTML or ""), before `failed` for a PDF
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()             # after the last format (also on cancel)
+
+
+class ExportJob(QRunnable):
+    """Export one report context to ``{"pdf": path, "docx": path}``
+    (either or both), in that order."""
+
+    def __init__(self, data, targets, html_fallback=False):
+        super().__init__()
+        # the widget keeps the job to cancel it; Qt must not delete it
+        self.setAutoDelete(False)
+        self.data = data
+        self.targets = dict(targets)
+        self.html_fallback = html_fallback
+        self.signals = ExportSignals()
+        self._cancel = threading.Event()
+        self._future = None
+
+    def start(self, pool=None):
+        (pool or QThreadPool.globalInstance()).start(self)
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+        future = self._future
+        if future is not None:
+            future.cancel()  # only takes effect while still queued
+
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def _export(self, fmt, path):
+        if fmt == "pdf":
+            self._future = get_pdf_service().submit_report(
+                self.data, path, cancel=self._cancel,
+                progress=lambda phase: self.signals.progress.emit("pdf", phase))
+            return self._future.result()
+        if fmt == "docx":
+            # python-docx builds and saves the document in one step
+            self.signals.progress.emit("docx", "write")
+            return write_report_docx(self.data, path)
+        raise ValueError(f"unknown export format {fmt!r}")
+
+    def _fallback_html(self, error):
+        try:
+            html = render_report_html(self.data)  # inline images: safe to save anywhere
+        except Exception as e:
+            print(f"Failed to render the HTML fallback: {e}")
+            html = ""
+        self.signals.html_fallback.emit(error, html)
+
+    def run(self):
+        try:
+            for fmt, path in self.targets.items():
+                if self._cancel.is_set():
+                    self.signals.cancelled.emit()
+                    return
+                try:
+                    written = self._export(fmt, path)
+                except (ExportCancelled, concurrent.futures.CancelledError):
+                    self.signals.cancelled.emit()
+                    return
+                except Exception as e:
+                    if fmt == "pdf" and self.html_fallback:
+                        self._fallback_html(str(e))
+                    self.signals.failed.emit(fmt, str(e))
+                    continue
+                if self._cancel.is_set():
+                    # too late to stop the write; do not leave the file behind
+                    try:
+                        os.remove(written)
+                    except OSError:
+                        pass
+                    self.signals.cancelled.emit()
+                    return
+                self.signals.file_ready.emit(fmt, written)
+        finally:
+            self.signals.finished.emit()
@@ -3,6 +3,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, QUrl
 from PyQt6.QtGui import QDesktopServices
 
+from ui.utils.report_renderer import render_report_html
+
 
 class PdfPreviewWidget(QWidget):
     """Simple PDF preview page that shows the generated file path and offers Save As / Open / Close."""
@@ -13,6 +15,7 @@ class PdfPreviewWidget(QWidget):
         super().__init__()
         self._pdf_path = None
         self._html = None
+        self._report_data = None
         self.init_ui()
 
     def init_ui(self):
@@ -46,14 +49,17 @@ class PdfPreviewWidget(QWidget):
 
         layout.addLayout(btns)
 
-    def load_preview(self, pdf_path: str = None, html: str = None):
+    def load_preview(self, pdf_path: str = None, html: str = None, data: dict = None):
         """Load generated PDF (path) and HTML snapshot.
 
         The preview displays a short message with a link to the file. Opening
         will attempt to launch the system default application for PDFs.
+        Without `html`, the report context `data` is rendered to HTML only
+        if it is needed (saving HTML when copying the PDF fails).
         """
         self._pdf_path = pdf_path
         self._html = html or ''
+        self._report_data = data
         if pdf_path:
             # show a clickable link
             self.info.setHtml(
@@ -85,10 +91,11 @@ class PdfPreviewWidget(QWidget):
                 copyfile(self._pdf_path, dest)
             except Exception as e:
                 # fallback: save HTML
-                if self._html:
+                html = self._report_html()
+                if html:
                     try:
                         with open(dest + '.html', 'w', encoding='utf-8') as f:
-                            f.write(self._html)
+                            f.write(html)
                     except Exception:
                         pass
         else:
@@ -102,5 +109,15 @@ class PdfPreviewWidget(QWidget):
             except Exception:
                 pass
 
+    def _report_html(self):
+        """The HTML snapshot, rendered (self-contained) from the report data
+        on first use when none was given."""
+        if not self._html and self._report_data is not None:
+            try:
+                self._html = render_report_html(self._report_data)
+            except Exception as e:
+                print(f"Failed to render report HTML: {e}")
+        return self._html
+
     def _on_close(self):
         self.closed.emit()